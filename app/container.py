@@ -0,0 +1,73 @@
+"""アプリ全体で1つのオブジェクト（リポジトリとユースケース）の置き場所。
+
+lifespan で保存先を開いたときに一度だけ組み立て、app.state.container に置く。
+リクエストごとにはユースケースを作らず、app/deps.py の依存性で取り出して使う。
+リポジトリを包むキャッシュなどの状態も、ここを通じてリクエスト間で共有される。
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from app.usecases.memo_event_publisher import MemoEventPublisher
+from app.usecases.memo_repository import MemoRepository
+from app.usecases.memo_use_cases import (
+    BulkCreateMemosUseCase,
+    BulkDeleteMemosUseCase,
+    CreateMemoUseCase,
+    DeleteMemoUseCase,
+    ExportMemosUseCase,
+    GetMemoCollectionVersionUseCase,
+    GetMemosUseCase,
+    GetMemoUseCase,
+    GetMemoVersionUseCase,
+    ListMemoChangesUseCase,
+    ListMemoSummariesUseCase,
+    ListMemosUseCase,
+    SearchMemosUseCase,
+    UpdateMemoUseCase,
+)
+
+
+@dataclass(frozen=True)
+class Container:
+    """組み立て済みのメモリポジトリ（計測・キャッシュなどで包んだもの）と、それを使うユースケース。"""
+
+    memo_repository: MemoRepository
+    create_memo: CreateMemoUseCase
+    bulk_create_memos: BulkCreateMemosUseCase
+    list_memos: ListMemosUseCase
+    list_memo_summaries: ListMemoSummariesUseCase
+    list_memo_changes: ListMemoChangesUseCase
+    export_memos: ExportMemosUseCase
+    search_memos: SearchMemosUseCase
+    get_memo: GetMemoUseCase
+    get_memos: GetMemosUseCase
+    get_memo_version: GetMemoVersionUseCase
+    get_memo_collection_version: GetMemoCollectionVersionUseCase
+    update_memo: UpdateMemoUseCase
+    delete_memo: DeleteMemoUseCase
+    bulk_delete_memos: BulkDeleteMemosUseCase
+
+    @classmethod
+    def build(
+        cls, memo_repository: MemoRepository, events: Optional[MemoEventPublisher] = None
+    ) -> "Container":
+        """リポジトリをユースケースに注入して組み立てる。events があれば書き込み系に渡す。"""
+        repo = memo_repository
+        return cls(
+            memo_repository=repo,
+            create_memo=CreateMemoUseCase(repo, events),
+            bulk_create_memos=BulkCreateMemosUseCase(repo, events),
+            list_memos=ListMemosUseCase(repo),
+            list_memo_summaries=ListMemoSummariesUseCase(repo),
+            list_memo_changes=ListMemoChangesUseCase(repo),
+            export_memos=ExportMemosUseCase(repo),
+            search_memos=SearchMemosUseCase(repo),
+            get_memo=GetMemoUseCase(repo),
+            get_memos=GetMemosUseCase(repo),
+            get_memo_version=GetMemoVersionUseCase(repo),
+            get_memo_collection_version=GetMemoCollectionVersionUseCase(repo),
+            update_memo=UpdateMemoUseCase(repo, events),
+            delete_memo=DeleteMemoUseCase(repo, events),
+            bulk_delete_memos=BulkDeleteMemosUseCase(repo, events),
+        )
@@ -1,8 +1,179 @@
-"""FastAPI の依存性（DB 取得など）。"""
+"""FastAPI の依存性（DB 取得など）。
 
-from fastapi import Request
+ユースケースは lifespan で組み立てた Container から取り出すだけにし、リクエストごとには作らない。
+同期関数の依存性はスレッドプールで実行されるため、リクエストごとに呼ばれるものは async にする。
+"""
+
+import asyncio
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.container import Container
+from app.infrastructure.memo_event_bus import MemoEventBus
+from app.infrastructure.metrics import MetricsRegistry
+from app.infrastructure.prisma_client import PrismaPoolMonitor
+from app.interfaces.readiness import ReadinessGate
+from app.settings import Settings
+from app.startup_profile import StartupProfile
+from app.usecases.memo_repository import MemoRepository
+from app.usecases.memo_use_cases import (
+    BulkCreateMemosUseCase,
+    BulkDeleteMemosUseCase,
+    CreateMemoUseCase,
+    DeleteMemoUseCase,
+    ExportMemosUseCase,
+    GetMemoCollectionVersionUseCase,
+    GetMemosUseCase,
+    GetMemoUseCase,
+    GetMemoVersionUseCase,
+    ListMemoChangesUseCase,
+    ListMemoSummariesUseCase,
+    ListMemosUseCase,
+    SearchMemosUseCase,
+    UpdateMemoUseCase,
+)
 
 
 def get_db(request: Request):
-    """リクエストから Prisma クライアントを取得する。"""
+    """リクエストから Prisma クライアントを取得する。DB を使わない構成では None。"""
     return request.app.state.db
+
+
+async def get_container(request: Request) -> Container:
+    """起動時に組み立てた Container を取得する（キャッシュ等の状態をリクエスト間で共有する）。
+
+    保存先を裏で開いている最中なら、開き終わるまで startup_wait_timeout_seconds だけ待つ。
+    間に合わなければ 503 を返す。
+    """
+    state = request.app.state
+    container = state.container
+    if container is not None:
+        return container
+    if state.opening is not None:
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(state.opening), state.settings.startup_wait_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="起動中です",
+                headers={"Retry-After": "1"},
+            ) from None
+    return state.container
+
+
+async def get_memo_repository(container: Container = Depends(get_container)) -> MemoRepository:
+    """組み立て済みのメモリポジトリを取得する。"""
+    return container.memo_repository
+
+
+async def get_create_memo_use_case(
+    container: Container = Depends(get_container),
+) -> CreateMemoUseCase:
+    return container.create_memo
+
+
+async def get_bulk_create_memos_use_case(
+    container: Container = Depends(get_container),
+) -> BulkCreateMemosUseCase:
+    return container.bulk_create_memos
+
+
+async def get_list_memos_use_case(
+    container: Container = Depends(get_container),
+) -> ListMemosUseCase:
+    return container.list_memos
+
+
+async def get_list_memo_summaries_use_case(
+    container: Container = Depends(get_container),
+) -> ListMemoSummariesUseCase:
+    return container.list_memo_summaries
+
+
+async def get_list_memo_changes_use_case(
+    container: Container = Depends(get_container),
+) -> ListMemoChangesUseCase:
+    return container.list_memo_changes
+
+
+async def get_export_memos_use_case(
+    container: Container = Depends(get_container),
+) -> ExportMemosUseCase:
+    return container.export_memos
+
+
+async def get_search_memos_use_case(
+    container: Container = Depends(get_container),
+) -> SearchMemosUseCase:
+    return container.search_memos
+
+
+async def get_memo_use_case(container: Container = Depends(get_container)) -> GetMemoUseCase:
+    return container.get_memo
+
+
+async def get_memos_use_case(container: Container = Depends(get_container)) -> GetMemosUseCase:
+    return container.get_memos
+
+
+async def get_memo_version_use_case(
+    container: Container = Depends(get_container),
+) -> GetMemoVersionUseCase:
+    return container.get_memo_version
+
+
+async def get_memo_collection_version_use_case(
+    container: Container = Depends(get_container),
+) -> GetMemoCollectionVersionUseCase:
+    return container.get_memo_collection_version
+
+
+async def get_update_memo_use_case(
+    container: Container = Depends(get_container),
+) -> UpdateMemoUseCase:
+    return container.update_memo
+
+
+async def get_delete_memo_use_case(
+    container: Container = Depends(get_container),
+) -> DeleteMemoUseCase:
+    return container.delete_memo
+
+
+async def get_bulk_delete_memos_use_case(
+    container: Container = Depends(get_container),
+) -> BulkDeleteMemosUseCase:
+    return container.bulk_delete_memos
+
+
+async def get_memo_event_bus(request: Request) -> Optional[MemoEventBus]:
+    """変更イベントの配送先を取得する。変更通知を無効にしている場合は None。"""
+    return request.app.state.memo_events
+
+
+def get_pool_monitor(request: Request) -> Optional[PrismaPoolMonitor]:
+    """起動時に組み立てた接続プールの監視オブジェクトを取得する。DB を使わない構成では None。"""
+    return request.app.state.pool_monitor
+
+
+def get_settings(request: Request) -> Settings:
+    """アプリケーション設定を取得する。"""
+    return request.app.state.settings
+
+
+def get_readiness_gate(request: Request) -> ReadinessGate:
+    """起動完了を表すゲートを取得する。"""
+    return request.app.state.readiness
+
+
+def get_startup_profile(request: Request) -> StartupProfile:
+    """起動のフェーズごとの所要時間を取得する。"""
+    return request.app.state.startup
+
+
+def get_metrics_registry(request: Request) -> MetricsRegistry:
+    """メトリクスの登録先を取得する。"""
+    return request.app.state.metrics_registry
@@ -1,3 +1,43 @@
-from app.domain.memo import Memo
+from app.domain.memo import (
+    MEMO_PREVIEW_LENGTH,
+    Memo,
+    MemoDraft,
+    MemoSummary,
+    MemoVersionConflictError,
+)
+from app.domain.memo_event import MemoEvent, MemoEventKind
+from app.domain.memo_page import (
+    InvalidMemoCursorError,
+    MemoCollectionVersion,
+    MemoCursor,
+    MemoPage,
+    MemoSummaryPage,
+)
+from app.domain.memo_search import MemoSearchHit, MemoSearchPage
+from app.domain.memo_sync import (
+    InvalidSyncTokenError,
+    MemoChanges,
+    MemoSyncToken,
+    MemoTombstone,
+)
 
-__all__ = ["Memo"]
+__all__ = [
+    "Memo",
+    "MemoDraft",
+    "MemoVersionConflictError",
+    "MemoSummary",
+    "MEMO_PREVIEW_LENGTH",
+    "MemoEvent",
+    "MemoEventKind",
+    "MemoCursor",
+    "MemoPage",
+    "MemoSummaryPage",
+    "InvalidMemoCursorError",
+    "MemoCollectionVersion",
+    "MemoSearchHit",
+    "MemoSearchPage",
+    "MemoSyncToken",
+    "MemoTombstone",
+    "MemoChanges",
+    "InvalidSyncTokenError",
+]
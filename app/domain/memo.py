@@ -3,6 +3,21 @@
 from dataclasses import dataclass
 from datetime import datetime
 
+# 一覧の要約に載せる本文の先頭の文字数（Postgres の生成列 content_preview の定義と揃える）
+MEMO_PREVIEW_LENGTH = 120
+
+
+class MemoVersionConflictError(Exception):
+    """更新時に指定したバージョン（updated_at）が現在のメモと一致しない場合に送出する。"""
+
+
+@dataclass(frozen=True)
+class MemoDraft:
+    """作成前のメモ。ID・日時は永続化時に採番される。"""
+
+    title: str
+    content: str
+
 
 @dataclass(frozen=True)
 class Memo:
@@ -33,3 +48,27 @@ class Memo:
             created_at=self.created_at,
             updated_at=self.updated_at,
         )
+
+
+@dataclass(frozen=True)
+class MemoSummary:
+    """一覧表示用のメモの要約。本文の代わりに、本文の文字数と先頭部分だけを持つ。"""
+
+    id: str
+    title: str
+    content_length: int
+    preview: str
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def of(cls, memo: Memo) -> "MemoSummary":
+        """メモから要約を作る。"""
+        return cls(
+            id=memo.id,
+            title=memo.title,
+            content_length=len(memo.content),
+            preview=memo.content[:MEMO_PREVIEW_LENGTH],
+            created_at=memo.created_at,
+            updated_at=memo.updated_at,
+        )
@@ -0,0 +1,33 @@
+"""メモの変更イベント（作成・更新・削除）。"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Literal
+
+from app.domain.memo import Memo
+
+MemoEventKind = Literal["created", "updated", "deleted"]
+
+
+@dataclass(frozen=True)
+class MemoEvent:
+    """メモが変わったことを表すイベント。本文は持たない（必要なら ID で取り直す）。
+
+    occurred_at は作成・更新ならメモの updated_at、削除なら削除した時刻。
+    """
+
+    kind: MemoEventKind
+    memo_id: str
+    occurred_at: datetime
+
+    @classmethod
+    def created(cls, memo: Memo) -> "MemoEvent":
+        return cls(kind="created", memo_id=memo.id, occurred_at=memo.updated_at)
+
+    @classmethod
+    def updated(cls, memo: Memo) -> "MemoEvent":
+        return cls(kind="updated", memo_id=memo.id, occurred_at=memo.updated_at)
+
+    @classmethod
+    def deleted(cls, memo_id: str) -> "MemoEvent":
+        return cls(kind="deleted", memo_id=memo_id, occurred_at=datetime.now(timezone.utc))
@@ -0,0 +1,75 @@
+"""メモ一覧のページング（キーセット方式）に関する値オブジェクト。"""
+
+import base64
+import binascii
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Union
+
+from app.domain.memo import Memo, MemoSummary
+
+
+class InvalidMemoCursorError(ValueError):
+    """カーソル文字列が不正な場合に送出する。"""
+
+
+@dataclass(frozen=True)
+class MemoCursor:
+    """一覧の並び順 (created_at, id) 上の位置。この位置より後ろを次ページとして返す。"""
+
+    created_at: datetime
+    id: str
+
+    @classmethod
+    def after(cls, memo: Union[Memo, MemoSummary]) -> "MemoCursor":
+        """指定したメモの直後を指すカーソルを返す。"""
+        return cls(created_at=memo.created_at, id=memo.id)
+
+    def encode(self) -> str:
+        """クライアントに渡す不透明なカーソル文字列に変換する。"""
+        raw = f"{self.created_at.isoformat()}|{self.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "MemoCursor":
+        """encode したカーソル文字列を復元する。不正な場合は InvalidMemoCursorError。"""
+        # 末尾の "=" は encode 時に落としているので補ってからデコードする
+        padded = value + "=" * (-len(value) % 4)
+        try:
+            raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode()
+            created_at, memo_id = raw.split("|", 1)
+            cursor = cls(created_at=datetime.fromisoformat(created_at), id=memo_id)
+        except (UnicodeError, binascii.Error, ValueError) as e:
+            raise InvalidMemoCursorError(value) from e
+        # encode はタイムゾーン付きの日時しか出さない。無いものは並び順のキーと比べられない
+        if cursor.created_at.tzinfo is None:
+            raise InvalidMemoCursorError(value)
+        return cursor
+
+
+@dataclass(frozen=True)
+class MemoPage:
+    """メモ一覧の1ページ。次ページが無ければ next_cursor は None。"""
+
+    items: Sequence[Memo]
+    next_cursor: Optional[MemoCursor]
+
+
+@dataclass(frozen=True)
+class MemoSummaryPage:
+    """要約一覧の1ページ。次ページが無ければ next_cursor は None。"""
+
+    items: Sequence[MemoSummary]
+    next_cursor: Optional[MemoCursor]
+
+
+@dataclass(frozen=True)
+class MemoCollectionVersion:
+    """メモ全体の版。作成・更新・削除のいずれかがあれば値が変わる。
+
+    件数と最終更新日時だけから作るため、本文を読まずに求められる。
+    """
+
+    count: int
+    last_updated_at: Optional[datetime]
@@ -0,0 +1,23 @@
+"""メモ全文検索の結果を表す値オブジェクト。"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Optional
+
+from app.domain.memo import Memo
+
+
+@dataclass(frozen=True)
+class MemoSearchHit:
+    """検索にヒットしたメモ1件。rank が大きいほど関連度が高い。"""
+
+    memo: Memo
+    rank: float
+
+
+@dataclass(frozen=True)
+class MemoSearchPage:
+    """検索結果の1ページ。次ページが無ければ next_offset は None。"""
+
+    hits: Sequence[MemoSearchHit]
+    next_offset: Optional[int]
@@ -0,0 +1,78 @@
+"""差分同期（前回の同期以降に変わったメモと、削除の記録）に関する値オブジェクト。"""
+
+import base64
+import binascii
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from app.domain.memo import Memo
+
+
+class InvalidSyncTokenError(ValueError):
+    """同期トークンの文字列が不正な場合に送出する。"""
+
+
+@dataclass(frozen=True)
+class MemoSyncToken:
+    """差分同期の位置。クライアントには不透明な文字列として渡し、次の同期で送り返してもらう。
+
+    watermark より後の変更を返す。値の意味は保存先による（Postgres ではトランザクション ID、
+    インメモリでは変更の連番）で、同じ保存先の中では減らない。1回の同期が複数ページに
+    分かれる間は、返し終えた変更の連番 after と、同期し終えた後に使う next_watermark を持ち回る。
+    watermark が 0 なら初回の同期で、削除の記録は返さない。
+    """
+
+    watermark: int = 0
+    after: int = 0
+    next_watermark: Optional[int] = None
+
+    @property
+    def is_initial(self) -> bool:
+        return self.watermark == 0
+
+    def encode(self) -> str:
+        """クライアントに渡す不透明なトークン文字列に変換する。"""
+        next_watermark = "" if self.next_watermark is None else str(self.next_watermark)
+        raw = f"{self.watermark}|{self.after}|{next_watermark}".encode()
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "MemoSyncToken":
+        """encode したトークン文字列を復元する。不正な場合は InvalidSyncTokenError。"""
+        padded = value + "=" * (-len(value) % 4)
+        try:
+            raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode()
+            watermark, after, next_watermark = raw.split("|")
+            token = cls(
+                watermark=int(watermark),
+                after=int(after),
+                next_watermark=int(next_watermark) if next_watermark else None,
+            )
+        except (UnicodeError, binascii.Error, ValueError) as e:
+            raise InvalidSyncTokenError(value) from e
+        if token.watermark < 0 or token.after < 0:
+            raise InvalidSyncTokenError(value)
+        return token
+
+
+@dataclass(frozen=True)
+class MemoTombstone:
+    """削除されたメモの記録。"""
+
+    id: str
+    deleted_at: datetime
+
+
+@dataclass(frozen=True)
+class MemoChanges:
+    """前回の同期以降の変更1ページ。changed は作成・更新されたメモ（変更の古い順）。
+
+    has_more なら next_token で続きをすぐ取得する。無ければ next_token を次回の同期まで保存する。
+    """
+
+    changed: Sequence[Memo]
+    deleted: Sequence[MemoTombstone]
+    next_token: MemoSyncToken
+    has_more: bool
@@ -1,3 +1,34 @@
+from app.infrastructure.batching_memo_repository import BatchingMemoRepository, BatchingStats
+from app.infrastructure.cached_memo_repository import CachedMemoRepository, CacheStats
+from app.infrastructure.coalescing_memo_repository import (
+    CoalescingMemoRepository,
+    CoalescingStats,
+)
+from app.infrastructure.create_batching_memo_repository import (
+    CreateBatchingMemoRepository,
+    CreateBatchingStats,
+)
+from app.infrastructure.in_memory_memo_repository import InMemoryMemoRepository
+from app.infrastructure.instrumented_memo_repository import InstrumentedMemoRepository
+from app.infrastructure.memo_cache import InMemoryLRUCache, MemoCacheBackend
+from app.infrastructure.memo_search_index import MemoSearchIndex
+from app.infrastructure.metrics import MetricsRegistry
 from app.infrastructure.prisma_memo_repository import PrismaMemoRepository
 
-__all__ = ["PrismaMemoRepository"]
+__all__ = [
+    "PrismaMemoRepository",
+    "InMemoryMemoRepository",
+    "BatchingMemoRepository",
+    "BatchingStats",
+    "CachedMemoRepository",
+    "CacheStats",
+    "CoalescingMemoRepository",
+    "CoalescingStats",
+    "CreateBatchingMemoRepository",
+    "CreateBatchingStats",
+    "MemoCacheBackend",
+    "InMemoryLRUCache",
+    "MemoSearchIndex",
+    "InstrumentedMemoRepository",
+    "MetricsRegistry",
+]
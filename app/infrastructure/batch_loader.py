@@ -0,0 +1,83 @@
+"""別々に来た1件取得をまとめて1回の一括取得にするローダー（DataLoader 方式）。"""
+
+import asyncio
+from collections.abc import Awaitable, Hashable, Mapping
+from typing import Callable, Generic, Optional, TypeVar
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+class BatchLoader(Generic[_K, _V]):
+    """同じイベントループの1周（window_seconds > 0 ならその間）に来た load() を集め、
+    load_many を1回だけ呼んで結果を配る。
+
+    load_many はキーの一覧を受け取り、見つかったキーだけを持つ対応表を返す。
+    見つからなかったキーの load() は None を返す。load_many の例外はそのバッチの
+    待ち手全員に伝わる。待ち手がキャンセルされても、同じバッチの他の待ち手には影響しない。
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[list[_K]], Awaitable[Mapping[_K, _V]]],
+        *,
+        window_seconds: float = 0.0,
+        max_batch_size: int = 100,
+    ) -> None:
+        self._load_many = load_many
+        self._window_seconds = window_seconds
+        self._max_batch_size = max(1, max_batch_size)
+        self._pending: dict[_K, list[asyncio.Future]] = {}
+        self._handle: Optional[asyncio.Handle] = None
+        # 実行中のバッチへの参照を保持し、完了前にガベージコレクトされないようにする
+        self._running: set[asyncio.Task] = set()
+        self.loads = 0
+        self.batches = 0
+
+    async def load(self, key: _K) -> Optional[_V]:
+        """key の値を返す。同じ周回に来た他の load() とまとめて取得する。"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        self.loads += 1
+        if len(self._pending) >= self._max_batch_size:
+            self._dispatch()
+        elif self._handle is None:
+            if self._window_seconds > 0:
+                self._handle = loop.call_later(self._window_seconds, self._dispatch)
+            else:
+                self._handle = loop.call_soon(self._dispatch)
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        self.batches += 1
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: dict[_K, list[asyncio.Future]]) -> None:
+        try:
+            values = await self._load_many(list(batch))
+        except asyncio.CancelledError:
+            for futures in batch.values():
+                for future in futures:
+                    future.cancel()
+            raise
+        except Exception as exc:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+        for key, futures in batch.items():
+            value = values.get(key)
+            for future in futures:
+                # キャンセル済みの待ち手には配らない
+                if not future.done():
+                    future.set_result(value)
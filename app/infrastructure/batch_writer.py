@@ -0,0 +1,100 @@
+"""別々に来た書き込みをまとめて1回の一括書き込みにするライター。"""
+
+import asyncio
+from collections.abc import Awaitable, Sequence
+from typing import Callable, Generic, Optional, TypeVar
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+class BatchWriter(Generic[_T, _R]):
+    """window_seconds の間（0 ならイベントループの1周）に来た submit() を集め、
+    write_many を1回だけ呼んで、それぞれの結果を返す。
+
+    write_many は項目の一覧を受け取り、入力と同じ順で結果を返す。例外はそのバッチの
+    待ち手全員に伝わる。max_batch_size 件たまったら期限を待たずに書き込む。
+    書き込みが終わっていない項目が max_pending 件に達すると、submit() は空くまで待つ
+    （DB が追いつかないときに、メモリ上に書き込み待ちを積み上げない）。
+    書き込み前に待ち手がキャンセルされた項目は書き込まない。
+    """
+
+    def __init__(
+        self,
+        write_many: Callable[[list[_T]], Awaitable[Sequence[_R]]],
+        *,
+        window_seconds: float = 0.0,
+        max_batch_size: int = 100,
+        max_pending: int = 1000,
+    ) -> None:
+        self._write_many = write_many
+        self._window_seconds = window_seconds
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_pending = max(1, max_pending)
+        # イベントループ上で作るため、最初の submit() まで遅らせる
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending: list[tuple[_T, asyncio.Future]] = []
+        self._handle: Optional[asyncio.Handle] = None
+        # 実行中のバッチへの参照を保持し、完了前にガベージコレクトされないようにする
+        self._running: set[asyncio.Task] = set()
+        self._closed = False
+        self.writes = 0
+        self.batches = 0
+
+    async def submit(self, item: _T) -> _R:
+        """item を書き込み、その結果を返す。同じ期間に来た他の submit() とまとめて書き込む。"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_pending)
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending.append((item, future))
+            self.writes += 1
+            if self._closed or len(self._pending) >= self._max_batch_size:
+                self._dispatch()
+            elif self._handle is None:
+                if self._window_seconds > 0:
+                    self._handle = loop.call_later(self._window_seconds, self._dispatch)
+                else:
+                    self._handle = loop.call_soon(self._dispatch)
+            return await future
+
+    async def close(self) -> None:
+        """たまっている分をすぐに書き込み、実行中の書き込みが終わるまで待つ。
+
+        これ以降の submit() は期限を待たずにすぐ書き込む。
+        """
+        self._closed = True
+        self._dispatch()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        batch = [(item, future) for item, future in self._pending if not future.done()]
+        self._pending = []
+        if not batch:
+            return
+        self.batches += 1
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: list[tuple[_T, asyncio.Future]]) -> None:
+        try:
+            results = await self._write_many([item for item, _ in batch])
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            # キャンセル済みの待ち手には配らない（書き込み自体は済んでいる）
+            if not future.done():
+                future.set_result(result)
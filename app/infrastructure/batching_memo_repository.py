@@ -0,0 +1,107 @@
+"""同時に来た1件取得を1回の IN 問い合わせにまとめる MemoRepository のデコレータ。"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from app.domain.memo import Memo, MemoDraft, MemoSummary
+from app.domain.memo_page import MemoCollectionVersion, MemoCursor
+from app.domain.memo_search import MemoSearchHit
+from app.domain.memo_sync import MemoChanges, MemoSyncToken
+from app.infrastructure.batch_loader import BatchLoader
+from app.usecases.memo_repository import MemoRepository
+
+
+@dataclass(frozen=True)
+class BatchingStats:
+    """1件取得の呼び出し数と、実際に発行した一括取得の回数。"""
+
+    loads: int
+    batches: int
+
+
+class BatchingMemoRepository(MemoRepository):
+    """別の MemoRepository を包み、find_by_id を BatchLoader 経由の find_by_ids にまとめる。
+
+    異なる ID を並行して取得するクライアントでも、同じ周回に来た分は1回の問い合わせで済む。
+    それ以外のメソッドはそのまま内側に渡す。
+    """
+
+    def __init__(
+        self,
+        inner: MemoRepository,
+        *,
+        window_seconds: float = 0.0,
+        max_batch_size: int = 100,
+    ) -> None:
+        self._inner = inner
+        self._loader: BatchLoader[str, Memo] = BatchLoader(
+            self._load_many, window_seconds=window_seconds, max_batch_size=max_batch_size
+        )
+
+    @property
+    def stats(self) -> BatchingStats:
+        return BatchingStats(loads=self._loader.loads, batches=self._loader.batches)
+
+    async def _load_many(self, memo_ids: list[str]) -> dict[str, Memo]:
+        return {memo.id: memo for memo in await self._inner.find_by_ids(memo_ids)}
+
+    async def create(self, title: str, content: str) -> Memo:
+        return await self._inner.create(title=title, content=content)
+
+    async def create_many(self, drafts: Sequence[MemoDraft]) -> Sequence[Memo]:
+        return await self._inner.create_many(drafts)
+
+    async def find_all(self) -> Sequence[Memo]:
+        return await self._inner.find_all()
+
+    async def find_page(self, limit: int, after: Optional[MemoCursor] = None) -> Sequence[Memo]:
+        return await self._inner.find_page(limit, after=after)
+
+    async def find_summary_page(
+        self, limit: int, after: Optional[MemoCursor] = None
+    ) -> Sequence[MemoSummary]:
+        return await self._inner.find_summary_page(limit, after=after)
+
+    async def find_by_id(self, memo_id: str) -> Optional[Memo]:
+        return await self._loader.load(memo_id)
+
+    async def find_by_ids(self, memo_ids: Sequence[str]) -> Sequence[Memo]:
+        return await self._inner.find_by_ids(memo_ids)
+
+    async def find_version(self, memo_id: str) -> Optional[datetime]:
+        return await self._inner.find_version(memo_id)
+
+    async def collection_version(self) -> MemoCollectionVersion:
+        return await self._inner.collection_version()
+
+    async def find_changes(self, since: MemoSyncToken, limit: int) -> MemoChanges:
+        return await self._inner.find_changes(since, limit)
+
+    async def search(self, query: str, limit: int, offset: int = 0) -> Sequence[MemoSearchHit]:
+        return await self._inner.search(query, limit, offset=offset)
+
+    async def update(self, memo: Memo) -> Memo:
+        return await self._inner.update(memo)
+
+    async def patch(
+        self,
+        memo_id: str,
+        *,
+        title: Optional[str] = None,
+        content: Optional[str] = None,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Memo]:
+        return await self._inner.patch(
+            memo_id,
+            title=title,
+            content=content,
+            expected_updated_at=expected_updated_at,
+        )
+
+    async def delete_by_id(self, memo_id: str) -> bool:
+        return await self._inner.delete_by_id(memo_id)
+
+    async def delete_many(self, memo_ids: Sequence[str]) -> set[str]:
+        return await self._inner.delete_many(memo_ids)
@@ -0,0 +1,187 @@
+"""find_by_id の結果をキャッシュする MemoRepository のデコレータ。"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from app.domain.memo import Memo, MemoDraft, MemoSummary
+from app.domain.memo_page import MemoCollectionVersion, MemoCursor
+from app.domain.memo_search import MemoSearchHit
+from app.domain.memo_sync import MemoChanges, MemoSyncToken
+from app.infrastructure.memo_cache import CachedMemo, MemoCacheBackend
+from app.usecases.memo_repository import MemoRepository
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """キャッシュのヒット・ミス・追い出し件数。"""
+
+    hits: int
+    misses: int
+    evictions: int
+
+
+class CachedMemoRepository(MemoRepository):
+    """別の MemoRepository を包み、1件取得をリードスルーでキャッシュする。
+
+    更新・削除の後は該当 ID のキャッシュを破棄する。存在しない ID も
+    negative_ttl_seconds の間キャッシュし、同じ ID への空振りクエリを抑える。
+    読み込み中に同じ ID が更新・削除された場合、その読み込み結果はキャッシュに載せない
+    （ID ごとの世代で見分ける）。破棄はこのプロセスのキャッシュにしか効かないため、
+    条件付きリクエストに使う find_version はキャッシュを使わず常に内側に問い合わせる。
+    """
+
+    def __init__(
+        self,
+        inner: MemoRepository,
+        backend: MemoCacheBackend,
+        *,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+    ) -> None:
+        self._inner = inner
+        self._backend = backend
+        self._ttl_seconds = ttl_seconds
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._hits = 0
+        self._misses = 0
+        # 読み込み中の ID ごとの件数と、その間に破棄された回数（世代）。読み込みが無くなれば消す
+        self._loading: dict[str, int] = {}
+        self._generations: dict[str, int] = {}
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self._hits, misses=self._misses, evictions=self._backend.evictions)
+
+    async def create(self, title: str, content: str) -> Memo:
+        return await self._inner.create(title=title, content=content)
+
+    async def create_many(self, drafts: Sequence[MemoDraft]) -> Sequence[Memo]:
+        return await self._inner.create_many(drafts)
+
+    async def find_all(self) -> Sequence[Memo]:
+        return await self._inner.find_all()
+
+    async def find_page(self, limit: int, after: Optional[MemoCursor] = None) -> Sequence[Memo]:
+        return await self._inner.find_page(limit, after=after)
+
+    async def find_summary_page(
+        self, limit: int, after: Optional[MemoCursor] = None
+    ) -> Sequence[MemoSummary]:
+        return await self._inner.find_summary_page(limit, after=after)
+
+    def _begin_load(self, memo_ids: Sequence[str]) -> dict[str, int]:
+        for memo_id in memo_ids:
+            self._loading[memo_id] = self._loading.get(memo_id, 0) + 1
+        return {memo_id: self._generations.get(memo_id, 0) for memo_id in memo_ids}
+
+    def _end_load(self, memo_ids: Sequence[str]) -> None:
+        for memo_id in memo_ids:
+            remaining = self._loading[memo_id] - 1
+            if remaining:
+                self._loading[memo_id] = remaining
+            else:
+                del self._loading[memo_id]
+                self._generations.pop(memo_id, None)
+
+    async def _fill(self, memo_id: str, memo: Optional[Memo], generation: int) -> None:
+        # 読み込みの間に破棄された ID は、古い内容かもしれないので載せない
+        if self._generations.get(memo_id, 0) != generation:
+            return
+        ttl = self._ttl_seconds if memo is not None else self._negative_ttl_seconds
+        if ttl > 0:
+            await self._backend.set(memo_id, CachedMemo(memo=memo), ttl)
+
+    async def _invalidate(self, memo_id: str) -> None:
+        if memo_id in self._loading:
+            self._generations[memo_id] = self._generations.get(memo_id, 0) + 1
+        await self._backend.delete(memo_id)
+
+    async def find_by_id(self, memo_id: str) -> Optional[Memo]:
+        cached = await self._backend.get(memo_id)
+        if cached is not None:
+            self._hits += 1
+            return cached.memo
+        self._misses += 1
+        generations = self._begin_load([memo_id])
+        try:
+            memo = await self._inner.find_by_id(memo_id)
+            await self._fill(memo_id, memo, generations[memo_id])
+        finally:
+            self._end_load([memo_id])
+        return memo
+
+    async def find_by_ids(self, memo_ids: Sequence[str]) -> Sequence[Memo]:
+        # キャッシュにあるものはそのまま使い、残りだけをまとめて問い合わせる
+        unique_ids = list(dict.fromkeys(memo_ids))
+        found: list[Memo] = []
+        missing: list[str] = []
+        for memo_id in unique_ids:
+            cached = await self._backend.get(memo_id)
+            if cached is None:
+                missing.append(memo_id)
+            elif cached.memo is not None:
+                found.append(cached.memo)
+        self._hits += len(unique_ids) - len(missing)
+        if not missing:
+            return found
+        self._misses += len(missing)
+        generations = self._begin_load(missing)
+        try:
+            loaded = {memo.id: memo for memo in await self._inner.find_by_ids(missing)}
+            for memo_id in missing:
+                await self._fill(memo_id, loaded.get(memo_id), generations[memo_id])
+        finally:
+            self._end_load(missing)
+        return found + list(loaded.values())
+
+    async def find_version(self, memo_id: str) -> Optional[datetime]:
+        # 304 / 412 の判定に使うため、他のワーカー・マシンの更新を見逃さないよう常に内側に聞く
+        return await self._inner.find_version(memo_id)
+
+    async def collection_version(self) -> MemoCollectionVersion:
+        return await self._inner.collection_version()
+
+    async def find_changes(self, since: MemoSyncToken, limit: int) -> MemoChanges:
+        return await self._inner.find_changes(since, limit)
+
+    async def search(self, query: str, limit: int, offset: int = 0) -> Sequence[MemoSearchHit]:
+        return await self._inner.search(query, limit, offset=offset)
+
+    async def update(self, memo: Memo) -> Memo:
+        try:
+            return await self._inner.update(memo)
+        finally:
+            await self._invalidate(memo.id)
+
+    async def patch(
+        self,
+        memo_id: str,
+        *,
+        title: Optional[str] = None,
+        content: Optional[str] = None,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Memo]:
+        try:
+            return await self._inner.patch(
+                memo_id,
+                title=title,
+                content=content,
+                expected_updated_at=expected_updated_at,
+            )
+        finally:
+            await self._invalidate(memo_id)
+
+    async def delete_by_id(self, memo_id: str) -> bool:
+        try:
+            return await self._inner.delete_by_id(memo_id)
+        finally:
+            await self._invalidate(memo_id)
+
+    async def delete_many(self, memo_ids: Sequence[str]) -> set[str]:
+        try:
+            return await self._inner.delete_many(memo_ids)
+        finally:
+            for memo_id in memo_ids:
+                await self._invalidate(memo_id)
@@ -0,0 +1,177 @@
+"""同時に来た同じ読み取りを1回の問い合わせにまとめる MemoRepository のデコレータ。"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from app.domain.memo import Memo, MemoDraft, MemoSummary
+from app.domain.memo_page import MemoCollectionVersion, MemoCursor
+from app.domain.memo_search import MemoSearchHit
+from app.domain.memo_sync import MemoChanges, MemoSyncToken
+from app.infrastructure.metrics import MetricsRegistry
+from app.infrastructure.single_flight import SingleFlight
+from app.usecases.memo_repository import MemoRepository
+
+_OPERATIONS = (
+    "find_by_id",
+    "find_version",
+    "find_page",
+    "find_summary_page",
+    "collection_version",
+    "find_changes",
+)
+
+
+@dataclass(frozen=True)
+class CoalescingStats:
+    """読み取りの呼び出し数と、実行中の同じ読み取りに相乗りした数。"""
+
+    calls: int
+    coalesced: int
+
+
+class CoalescingMemoRepository(MemoRepository):
+    """別の MemoRepository を包み、実行中の同じ読み取りがあればその結果を共有する（single-flight）。
+
+    対象は1件取得・版の取得・一覧ページ・全体の版・差分同期（同じトークンで同期する端末が多い）。
+    書き込みの後は該当する実行中の読み取りを切り離し、書き込みより後に来た読み取りが
+    書き込み前の結果を受け取らないようにする。
+    返す Memo は不変だが、一覧のリストは呼び出し側で共有されるため変更しないこと。
+    """
+
+    def __init__(self, inner: MemoRepository, registry: Optional[MetricsRegistry] = None) -> None:
+        self._inner = inner
+        self._by_id: SingleFlight[Optional[Memo]] = SingleFlight()
+        self._versions: SingleFlight[Optional[datetime]] = SingleFlight()
+        self._pages: SingleFlight[Sequence[Memo]] = SingleFlight()
+        self._summary_pages: SingleFlight[Sequence[MemoSummary]] = SingleFlight()
+        self._collection: SingleFlight[MemoCollectionVersion] = SingleFlight()
+        self._changes: SingleFlight[MemoChanges] = SingleFlight()
+        self._flights = {
+            "find_by_id": self._by_id,
+            "find_version": self._versions,
+            "find_page": self._pages,
+            "find_summary_page": self._summary_pages,
+            "collection_version": self._collection,
+            "find_changes": self._changes,
+        }
+        self._coalesced_counters = None
+        if registry is not None:
+            counter = registry.counter(
+                "memo_repository_coalesced_total",
+                "MemoRepository reads served by an identical in-flight read.",
+                ("operation",),
+            )
+            self._coalesced_counters = {name: counter.labels(name) for name in _OPERATIONS}
+
+    @property
+    def stats(self) -> CoalescingStats:
+        flights = self._flights.values()
+        return CoalescingStats(
+            calls=sum(f.calls for f in flights),
+            coalesced=sum(f.coalesced for f in flights),
+        )
+
+    async def _run(self, operation: str, key, func):
+        flight = self._flights[operation]
+        if self._coalesced_counters is not None and key in flight:
+            self._coalesced_counters[operation].inc()
+        return await flight.run(key, func)
+
+    def _forget_lists(self) -> None:
+        self._pages.forget_all()
+        self._summary_pages.forget_all()
+        self._collection.forget_all()
+        self._changes.forget_all()
+
+    def _forget(self, memo_ids: Sequence[str]) -> None:
+        for memo_id in memo_ids:
+            self._by_id.forget(memo_id)
+            self._versions.forget(memo_id)
+        self._forget_lists()
+
+    async def create(self, title: str, content: str) -> Memo:
+        try:
+            return await self._inner.create(title=title, content=content)
+        finally:
+            self._forget_lists()
+
+    async def create_many(self, drafts: Sequence[MemoDraft]) -> Sequence[Memo]:
+        try:
+            return await self._inner.create_many(drafts)
+        finally:
+            self._forget_lists()
+
+    async def find_all(self) -> Sequence[Memo]:
+        return await self._inner.find_all()
+
+    async def find_page(self, limit: int, after: Optional[MemoCursor] = None) -> Sequence[Memo]:
+        return await self._run(
+            "find_page", (limit, after), lambda: self._inner.find_page(limit, after=after)
+        )
+
+    async def find_summary_page(
+        self, limit: int, after: Optional[MemoCursor] = None
+    ) -> Sequence[MemoSummary]:
+        return await self._run(
+            "find_summary_page",
+            (limit, after),
+            lambda: self._inner.find_summary_page(limit, after=after),
+        )
+
+    async def find_by_id(self, memo_id: str) -> Optional[Memo]:
+        return await self._run("find_by_id", memo_id, lambda: self._inner.find_by_id(memo_id))
+
+    async def find_by_ids(self, memo_ids: Sequence[str]) -> Sequence[Memo]:
+        return await self._inner.find_by_ids(memo_ids)
+
+    async def find_version(self, memo_id: str) -> Optional[datetime]:
+        return await self._run("find_version", memo_id, lambda: self._inner.find_version(memo_id))
+
+    async def collection_version(self) -> MemoCollectionVersion:
+        return await self._run("collection_version", None, self._inner.collection_version)
+
+    async def find_changes(self, since: MemoSyncToken, limit: int) -> MemoChanges:
+        return await self._run(
+            "find_changes", (since, limit), lambda: self._inner.find_changes(since, limit)
+        )
+
+    async def search(self, query: str, limit: int, offset: int = 0) -> Sequence[MemoSearchHit]:
+        return await self._inner.search(query, limit, offset=offset)
+
+    async def update(self, memo: Memo) -> Memo:
+        try:
+            return await self._inner.update(memo)
+        finally:
+            self._forget([memo.id])
+
+    async def patch(
+        self,
+        memo_id: str,
+        *,
+        title: Optional[str] = None,
+        content: Optional[str] = None,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Memo]:
+        try:
+            return await self._inner.patch(
+                memo_id,
+                title=title,
+                content=content,
+                expected_updated_at=expected_updated_at,
+            )
+        finally:
+            self._forget([memo_id])
+
+    async def delete_by_id(self, memo_id: str) -> bool:
+        try:
+            return await self._inner.delete_by_id(memo_id)
+        finally:
+            self._forget([memo_id])
+
+    async def delete_many(self, memo_ids: Sequence[str]) -> set[str]:
+        try:
+            return await self._inner.delete_many(memo_ids)
+        finally:
+            self._forget(memo_ids)
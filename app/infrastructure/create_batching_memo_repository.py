@@ -0,0 +1,118 @@
+"""同時に来たメモ作成を1回の一括 INSERT にまとめる MemoRepository のデコレータ。"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from app.domain.memo import Memo, MemoDraft, MemoSummary
+from app.domain.memo_page import MemoCollectionVersion, MemoCursor
+from app.domain.memo_search import MemoSearchHit
+from app.domain.memo_sync import MemoChanges, MemoSyncToken
+from app.infrastructure.batch_writer import BatchWriter
+from app.usecases.memo_repository import MemoRepository
+
+
+@dataclass(frozen=True)
+class CreateBatchingStats:
+    """1件作成の呼び出し数と、実際に発行した一括作成の回数。"""
+
+    creates: int
+    batches: int
+
+
+class CreateBatchingMemoRepository(MemoRepository):
+    """別の MemoRepository を包み、create を BatchWriter 経由の create_many にまとめる。
+
+    作成の集中時に、1件ずつ DB と往復する代わりに期限（数ミリ秒）か件数で区切って
+    1回の複数行 INSERT にする。呼び出し側は自分のメモが書き込まれるまで待ち、
+    作成されたメモを受け取る。ID は create_many がアプリ側で入力順に採番するので、
+    cuid の順序は来た順のまま保たれる。1件でも書き込みに失敗すると、同じバッチの
+    呼び出し全員に例外が伝わる。終了時は close() でたまっている分を書き込む。
+    """
+
+    def __init__(
+        self,
+        inner: MemoRepository,
+        *,
+        window_seconds: float = 0.002,
+        max_batch_size: int = 100,
+        max_pending: int = 1000,
+    ) -> None:
+        self._inner = inner
+        self._writer: BatchWriter[MemoDraft, Memo] = BatchWriter(
+            self._write_many,
+            window_seconds=window_seconds,
+            max_batch_size=max_batch_size,
+            max_pending=max_pending,
+        )
+
+    @property
+    def stats(self) -> CreateBatchingStats:
+        return CreateBatchingStats(creates=self._writer.writes, batches=self._writer.batches)
+
+    async def close(self) -> None:
+        """書き込み待ちの作成をすべて書き込む。"""
+        await self._writer.close()
+
+    async def _write_many(self, drafts: list[MemoDraft]) -> Sequence[Memo]:
+        return await self._inner.create_many(drafts)
+
+    async def create(self, title: str, content: str) -> Memo:
+        return await self._writer.submit(MemoDraft(title=title, content=content))
+
+    async def create_many(self, drafts: Sequence[MemoDraft]) -> Sequence[Memo]:
+        return await self._inner.create_many(drafts)
+
+    async def find_all(self) -> Sequence[Memo]:
+        return await self._inner.find_all()
+
+    async def find_page(self, limit: int, after: Optional[MemoCursor] = None) -> Sequence[Memo]:
+        return await self._inner.find_page(limit, after=after)
+
+    async def find_summary_page(
+        self, limit: int, after: Optional[MemoCursor] = None
+    ) -> Sequence[MemoSummary]:
+        return await self._inner.find_summary_page(limit, after=after)
+
+    async def find_by_id(self, memo_id: str) -> Optional[Memo]:
+        return await self._inner.find_by_id(memo_id)
+
+    async def find_by_ids(self, memo_ids: Sequence[str]) -> Sequence[Memo]:
+        return await self._inner.find_by_ids(memo_ids)
+
+    async def find_version(self, memo_id: str) -> Optional[datetime]:
+        return await self._inner.find_version(memo_id)
+
+    async def collection_version(self) -> MemoCollectionVersion:
+        return await self._inner.collection_version()
+
+    async def find_changes(self, since: MemoSyncToken, limit: int) -> MemoChanges:
+        return await self._inner.find_changes(since, limit)
+
+    async def search(self, query: str, limit: int, offset: int = 0) -> Sequence[MemoSearchHit]:
+        return await self._inner.search(query, limit, offset=offset)
+
+    async def update(self, memo: Memo) -> Memo:
+        return await self._inner.update(memo)
+
+    async def patch(
+        self,
+        memo_id: str,
+        *,
+        title: Optional[str] = None,
+        content: Optional[str] = None,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Memo]:
+        return await self._inner.patch(
+            memo_id,
+            title=title,
+            content=content,
+            expected_updated_at=expected_updated_at,
+        )
+
+    async def delete_by_id(self, memo_id: str) -> bool:
+        return await self._inner.delete_by_id(memo_id)
+
+    async def delete_many(self, memo_ids: Sequence[str]) -> set[str]:
+        return await self._inner.delete_many(memo_ids)
@@ -0,0 +1,67 @@
+"""Prisma の cuid() と同じ形式の ID をアプリ側で採番する。
+
+一括作成では DB に ID を振らせると作成結果を読み直す必要があるため、
+採番をアプリ側で行い、1回の INSERT だけで済ませる。
+"""
+
+import itertools
+import os
+import secrets
+import socket
+import time
+
+_BASE = 36
+_BLOCK = 4
+_DISCRETE = _BASE**_BLOCK
+_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+_counter = itertools.count()
+
+
+def _base36(value: int) -> str:
+    if value == 0:
+        return "0"
+    digits = []
+    while value:
+        value, rem = divmod(value, _BASE)
+        digits.append(_ALPHABET[rem])
+    return "".join(reversed(digits))
+
+
+def _pad(value: str, size: int) -> str:
+    return value.rjust(size, "0")[-size:]
+
+
+def _fingerprint() -> str:
+    pid = _pad(_base36(os.getpid()), 2)
+    host = socket.gethostname()
+    host_id = _pad(_base36(sum(map(ord, host)) + len(host) + _BASE), 2)
+    return pid + host_id
+
+
+_FINGERPRINT = _fingerprint()
+
+
+def _reset_after_fork() -> None:
+    """fork した子プロセス（app.server のワーカー）で、自分の pid の指紋とカウンタに作り直す。
+
+    読み込みは fork の前に親で済ませるため、そのままでは全ワーカーが同じ指紋とカウンタの並びを持つ。
+    """
+    global _FINGERPRINT, _counter
+    _FINGERPRINT = _fingerprint()
+    _counter = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):  # Windows には fork が無い
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def new_cuid() -> str:
+    """cuid（v1）形式の ID を返す。同じプロセス内では採番順に文字列としても昇順になる。
+
+    同一ミリ秒内はカウンタで順序を保つ（36^4 件を超えると一周するため保証しない）。
+    """
+    timestamp = _base36(int(time.time() * 1000))
+    count = _pad(_base36(next(_counter) % _DISCRETE), _BLOCK)
+    random_block = _pad(_base36(secrets.randbelow(_DISCRETE**2)), _BLOCK * 2)
+    return f"c{timestamp}{count}{_FINGERPRINT}{random_block}"
@@ -0,0 +1,506 @@
+"""DB を使わない MemoRepository。プレビュー環境・エッジ・テスト向け。
+
+メモは __slots__ の行オブジェクトで持ち、(created_at, id) の昇順に並べた索引を二分探索して
+ページングする。変更は追記専用のログ（JSON Lines）に書き、一定件数ごとにスナップショットへ
+まとめてログを空にする。起動時はスナップショットを読んでからログを再生して復元する。
+差分同期のため、作成・更新・削除のたびに変更の連番を振り、削除の記録（tombstone）も残す。
+閾値以上の本文は zlib で圧縮して持ち、本文を返すときにだけ展開する（要約は展開しない）。
+"""
+
+import asyncio
+import base64
+import json
+import os
+import zlib
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import IO, Optional, Union
+
+from app.domain.memo import (
+    MEMO_PREVIEW_LENGTH,
+    Memo,
+    MemoDraft,
+    MemoSummary,
+    MemoVersionConflictError,
+)
+from app.domain.memo_page import MemoCollectionVersion, MemoCursor
+from app.domain.memo_search import MemoSearchHit
+from app.domain.memo_sync import MemoChanges, MemoSyncToken, MemoTombstone
+from app.infrastructure.cuid import new_cuid
+from app.infrastructure.memo_search_index import MemoSearchIndex
+from app.usecases.memo_repository import MemoRepository
+
+SNAPSHOT_FILE = "memos.snapshot.jsonl"
+LOG_FILE = "memos.log.jsonl"
+
+_MILLISECOND = timedelta(milliseconds=1)
+
+
+def _now() -> datetime:
+    # Postgres 側（Prisma）と同じくミリ秒精度の UTC に揃える
+    now = datetime.now(timezone.utc)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+# 永続化時に圧縮した本文に付ける印（content_encoding）
+_ZLIB = "zlib"
+
+
+class _CompressedContent:
+    """zlib で圧縮した本文。要約に使う文字数と先頭部分は圧縮前に取っておく。"""
+
+    __slots__ = ("data", "length", "preview")
+
+    def __init__(self, data: bytes, length: int, preview: str) -> None:
+        self.data = data
+        self.length = length
+        self.preview = preview
+
+    def decompress(self) -> str:
+        return zlib.decompress(self.data).decode()
+
+
+def _encode_content(content: str, min_bytes: int) -> Union[str, _CompressedContent]:
+    """UTF-8 で min_bytes 以上の本文を圧縮する。min_bytes が 0 以下なら圧縮しない。"""
+    if min_bytes <= 0:
+        return content
+    raw = content.encode()
+    if len(raw) < min_bytes:
+        return content
+    data = zlib.compress(raw)
+    # 縮まない本文（圧縮済みのデータを貼ったものなど）は、展開の手間だけ増えるのでそのまま持つ
+    if len(data) >= len(raw):
+        return content
+    return _CompressedContent(data, len(content), content[:MEMO_PREVIEW_LENGTH])
+
+
+class _Row:
+    """1件分の格納形式。Memo より小さく、索引のキーを兼ねる。"""
+
+    __slots__ = ("id", "title", "body", "created_at", "updated_at", "seq")
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        body: Union[str, _CompressedContent],
+        created_at: datetime,
+        updated_at: datetime,
+        seq: int = 0,
+    ) -> None:
+        self.id = id
+        self.title = title
+        self.body = body
+        self.created_at = created_at
+        self.updated_at = updated_at
+        # 最後に変わったときの変更の連番。0 なら未採番（索引に入れるときに振る）
+        self.seq = seq
+
+    @property
+    def content(self) -> str:
+        body = self.body
+        return body if isinstance(body, str) else body.decompress()
+
+    @property
+    def key(self) -> tuple[datetime, str]:
+        return (self.created_at, self.id)
+
+    def to_memo(self) -> Memo:
+        return Memo(
+            id=self.id,
+            title=self.title,
+            content=self.content,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
+
+    def to_summary(self) -> MemoSummary:
+        body = self.body
+        if isinstance(body, str):
+            content_length, preview = len(body), body[:MEMO_PREVIEW_LENGTH]
+        else:
+            content_length, preview = body.length, body.preview
+        return MemoSummary(
+            id=self.id,
+            title=self.title,
+            content_length=content_length,
+            preview=preview,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
+
+    def to_json(self) -> dict:
+        data = {
+            "id": self.id,
+            "title": self.title,
+            "content": self.body,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+            "seq": self.seq,
+        }
+        body = self.body
+        if not isinstance(body, str):
+            # 圧縮したまま base64 で書き、読み込み時に展開し直さずに済むよう要約も添える
+            data["content"] = base64.b64encode(body.data).decode("ascii")
+            data["content_encoding"] = _ZLIB
+            data["content_length"] = body.length
+            data["content_preview"] = body.preview
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict) -> "_Row":
+        body: Union[str, _CompressedContent] = data["content"]
+        if data.get("content_encoding") == _ZLIB:
+            body = _CompressedContent(
+                base64.b64decode(data["content"]), data["content_length"], data["content_preview"]
+            )
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            body=body,
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+            # 連番を持つ前のデータは、読み込んだ順に振り直す
+            seq=data.get("seq", 0),
+        )
+
+
+class InMemoryMemoRepository(MemoRepository):
+    """プロセス内にメモを持つリポジトリ。
+
+    data_dir を指定した場合だけ永続化する。変更はロックの内側で行い、
+    スナップショット作成中の変更はその完了を待つ。複数プロセス・複数マシン間では共有しない。
+    本文は UTF-8 で compress_min_bytes 以上なら圧縮して持つ（0 なら圧縮しない）。
+    """
+
+    def __init__(
+        self,
+        *,
+        data_dir: Optional[str] = None,
+        snapshot_every: int = 1000,
+        fsync: bool = False,
+        compress_min_bytes: int = 16384,
+    ) -> None:
+        self._rows: dict[str, _Row] = {}
+        # (created_at, id) の昇順。ページングは bisect で開始位置を求める
+        self._order: list[tuple[datetime, str]] = []
+        self._search_index = MemoSearchIndex()
+        self._last_updated_at: Optional[datetime] = None
+        # 差分同期用。変更の連番の昇順と、連番から ID への対応（各 ID の最新の変更だけを持つ）
+        self._change_seq = 0
+        self._change_order: list[int] = []
+        self._change_ids: dict[int, str] = {}
+        # 削除の記録。ID から (変更の連番, 削除日時)
+        self._tombstones: dict[str, tuple[int, datetime]] = {}
+        self._lock = asyncio.Lock()
+        self._data_dir = data_dir
+        self._snapshot_every = snapshot_every
+        self._fsync = fsync
+        self._compress_min_bytes = compress_min_bytes
+        self._log: Optional[IO[str]] = None
+        self._log_entries = 0
+
+    # --- 永続化 ---
+
+    async def load(self) -> None:
+        """スナップショットとログから復元し、以降の変更をログに書けるようにする。"""
+        if self._data_dir is None:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._load_files)
+
+    async def snapshot(self) -> None:
+        """現在の内容をスナップショットに書き、ログを空にする。load 前は何もしない。"""
+        # load 前に書くと、空の内容で既存のスナップショットを上書きしてしまう
+        if self._log is None:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._write_snapshot)
+
+    async def close(self) -> None:
+        """スナップショットを書いてログを閉じる。終了時に呼ぶ。"""
+        if self._log is None:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._write_snapshot)
+            self._log.close()
+            self._log = None
+
+    def _path(self, name: str) -> str:
+        assert self._data_dir is not None
+        return os.path.join(self._data_dir, name)
+
+    def _load_files(self) -> None:
+        os.makedirs(self._data_dir, exist_ok=True)
+        snapshot_path = self._path(SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding="utf-8") as f:
+                for line in f:
+                    data = json.loads(line)
+                    if "op" in data:
+                        self._replay(data)
+                    else:
+                        self._put(_Row.from_json(data))
+        log_path = self._path(LOG_FILE)
+        if os.path.exists(log_path):
+            with open(log_path, "rb+") as f:
+                valid_bytes = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    self._replay(entry)
+                    self._log_entries += 1
+                    valid_bytes += len(line)
+                # 書き込み途中で止まった末尾は捨て、続きの追記が読める位置から書く
+                f.truncate(valid_bytes)
+        self._log = open(log_path, "a", encoding="utf-8")
+
+    def _replay(self, entry: dict) -> None:
+        # put / del は何度適用しても同じ結果になるため、スナップショット後に
+        # ログを空にする前に止まっていても、そのまま再生してよい
+        if entry["op"] == "put":
+            self._put(_Row.from_json(entry["memo"]))
+        elif entry["op"] == "del":
+            deleted_at = entry.get("deleted_at")
+            self._remove(
+                entry["id"],
+                seq=entry.get("seq"),
+                deleted_at=datetime.fromisoformat(deleted_at) if deleted_at else None,
+            )
+
+    def _write_snapshot(self) -> None:
+        tmp_path = self._path(SNAPSHOT_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for _, memo_id in self._order:
+                f.write(json.dumps(self._rows[memo_id].to_json(), ensure_ascii=False))
+                f.write("\n")
+            # 削除の記録はログと同じ形で書き、読み込み時も同じく再生する
+            for memo_id in self._tombstones:
+                f.write(json.dumps(self._tombstone_entry(memo_id), ensure_ascii=False))
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path(SNAPSHOT_FILE))
+        if self._log is not None:
+            self._log.truncate(0)
+            self._log.flush()
+        self._log_entries = 0
+
+    async def _append(self, entries: list[dict]) -> None:
+        """ログに追記する。呼び出し側でロックを取っていること。"""
+        if self._log is None:
+            return
+        for entry in entries:
+            self._log.write(json.dumps(entry, ensure_ascii=False))
+            self._log.write("\n")
+        self._log.flush()
+        if self._fsync:
+            os.fsync(self._log.fileno())
+        self._log_entries += len(entries)
+        if self._log_entries >= self._snapshot_every:
+            await asyncio.to_thread(self._write_snapshot)
+
+    def _tombstone_entry(self, memo_id: str) -> dict:
+        seq, deleted_at = self._tombstones[memo_id]
+        return {"op": "del", "id": memo_id, "seq": seq, "deleted_at": deleted_at.isoformat()}
+
+    # --- 索引の更新 ---
+
+    def _record_change(self, memo_id: str, old_seq: Optional[int], seq: int) -> int:
+        """memo_id の最新の変更を連番 seq（0 なら新しく採番）にし、その連番を返す。"""
+        if old_seq:
+            self._change_order.pop(bisect_left(self._change_order, old_seq))
+            del self._change_ids[old_seq]
+        if not seq:
+            seq = self._change_seq + 1
+        self._change_seq = max(self._change_seq, seq)
+        # 新しい変更は末尾に入るので、通常は追記と同じ手間で済む
+        insort(self._change_order, seq)
+        self._change_ids[seq] = memo_id
+        return seq
+
+    def _put(self, row: _Row) -> None:
+        old = self._rows.get(row.id)
+        row.seq = self._record_change(row.id, old.seq if old is not None else None, row.seq)
+        if old is None:
+            insort(self._order, row.key)
+        elif old.key != row.key:
+            self._order.pop(bisect_left(self._order, old.key))
+            insort(self._order, row.key)
+        self._rows[row.id] = row
+        # 索引は id / title / content しか見ないので、Memo を作らずに行をそのまま渡す
+        self._search_index.add(row)  # type: ignore[arg-type]
+        if self._last_updated_at is None or row.updated_at > self._last_updated_at:
+            self._last_updated_at = row.updated_at
+
+    def _remove(
+        self, memo_id: str, *, seq: Optional[int] = None, deleted_at: Optional[datetime] = None
+    ) -> bool:
+        """メモを消して削除の記録を残す。seq・deleted_at は復元時に記録の値を引き継ぐのに使う。"""
+        row = self._rows.pop(memo_id, None)
+        if row is not None:
+            self._order.pop(bisect_left(self._order, row.key))
+            self._search_index.remove(memo_id)
+            old_seq: Optional[int] = row.seq
+        elif seq is not None:
+            # スナップショット済みの削除の記録（メモ自体はもう無い）
+            old_seq = self._tombstones.get(memo_id, (None,))[0]
+        else:
+            return False
+        seq = self._record_change(memo_id, old_seq, seq or 0)
+        self._tombstones[memo_id] = (seq, deleted_at or _now())
+        return row is not None
+
+    def _encode(self, content: str) -> Union[str, _CompressedContent]:
+        return _encode_content(content, self._compress_min_bytes)
+
+    def _touch(self, row: _Row) -> datetime:
+        # 同じミリ秒内の更新でも ETag が変わるよう、前の updated_at より必ず進める
+        return max(_now(), row.updated_at + _MILLISECOND)
+
+    # --- MemoRepository ---
+
+    async def create(self, title: str, content: str) -> Memo:
+        return (await self.create_many([MemoDraft(title=title, content=content)]))[0]
+
+    async def create_many(self, drafts: Sequence[MemoDraft]) -> Sequence[Memo]:
+        async with self._lock:
+            now = _now()
+            rows = [_Row(new_cuid(), d.title, self._encode(d.content), now, now) for d in drafts]
+            for row in rows:
+                self._put(row)
+            await self._append([{"op": "put", "memo": row.to_json()} for row in rows])
+        return [row.to_memo() for row in rows]
+
+    async def find_all(self) -> Sequence[Memo]:
+        rows = self._rows
+        return [rows[memo_id].to_memo() for _, memo_id in self._order]
+
+    async def find_page(self, limit: int, after: Optional[MemoCursor] = None) -> Sequence[Memo]:
+        start = 0 if after is None else bisect_right(self._order, (after.created_at, after.id))
+        rows = self._rows
+        return [rows[memo_id].to_memo() for _, memo_id in self._order[start : start + limit]]
+
+    async def find_summary_page(
+        self, limit: int, after: Optional[MemoCursor] = None
+    ) -> Sequence[MemoSummary]:
+        start = 0 if after is None else bisect_right(self._order, (after.created_at, after.id))
+        rows = self._rows
+        return [rows[memo_id].to_summary() for _, memo_id in self._order[start : start + limit]]
+
+    async def find_by_id(self, memo_id: str) -> Optional[Memo]:
+        row = self._rows.get(memo_id)
+        return row.to_memo() if row is not None else None
+
+    async def find_by_ids(self, memo_ids: Sequence[str]) -> list[Memo]:
+        rows = (self._rows.get(memo_id) for memo_id in dict.fromkeys(memo_ids))
+        return [row.to_memo() for row in rows if row is not None]
+
+    async def find_version(self, memo_id: str) -> Optional[datetime]:
+        row = self._rows.get(memo_id)
+        return row.updated_at if row is not None else None
+
+    async def collection_version(self) -> MemoCollectionVersion:
+        # 削除しても最終更新日時は戻さない（件数が変わるので版は変わる）
+        return MemoCollectionVersion(count=len(self._rows), last_updated_at=self._last_updated_at)
+
+    async def find_changes(self, since: MemoSyncToken, limit: int) -> MemoChanges:
+        # watermark は変更の連番。その直後（続きのページなら after の直後）から連番順に辿るので、
+        # 手間は返す件数に比例する
+        order = self._change_order
+        start = bisect_right(order, max(since.watermark, since.after))
+        picked: list[int] = []
+        for seq in order[start:]:
+            if since.is_initial and self._change_ids[seq] not in self._rows:
+                continue
+            picked.append(seq)
+            if len(picked) > limit:
+                break
+        has_more = len(picked) > limit
+        page = picked[:limit]
+        changed: list[Memo] = []
+        deleted: list[MemoTombstone] = []
+        for seq in page:
+            memo_id = self._change_ids[seq]
+            row = self._rows.get(memo_id)
+            if row is not None:
+                changed.append(row.to_memo())
+            else:
+                deleted.append(MemoTombstone(id=memo_id, deleted_at=self._tombstones[memo_id][1]))
+        # 1回の同期が複数ページに分かれる間は watermark（初回なら 0 のまま削除の記録を返さない）を
+        # 変えずに after で続きを辿り、最初のページの時点の連番を次の watermark として持ち回る
+        next_watermark = since.next_watermark
+        if next_watermark is None:
+            next_watermark = max(self._change_seq, since.watermark)
+        if has_more:
+            next_token = MemoSyncToken(
+                since.watermark, after=page[-1], next_watermark=next_watermark
+            )
+        else:
+            next_token = MemoSyncToken(next_watermark)
+        return MemoChanges(
+            changed=changed,
+            deleted=deleted,
+            next_token=next_token,
+            has_more=has_more,
+        )
+
+    async def search(self, query: str, limit: int, offset: int = 0) -> Sequence[MemoSearchHit]:
+        scored = self._search_index.search(query)[offset : offset + limit]
+        return [
+            MemoSearchHit(memo=self._rows[memo_id].to_memo(), rank=rank) for memo_id, rank in scored
+        ]
+
+    async def update(self, memo: Memo) -> Memo:
+        async with self._lock:
+            old = self._rows.get(memo.id)
+            if old is None:
+                raise KeyError(memo.id)
+            row = _Row(
+                memo.id, memo.title, self._encode(memo.content), old.created_at, self._touch(old)
+            )
+            self._put(row)
+            await self._append([{"op": "put", "memo": row.to_json()}])
+        return row.to_memo()
+
+    async def patch(
+        self,
+        memo_id: str,
+        *,
+        title: Optional[str] = None,
+        content: Optional[str] = None,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Memo]:
+        async with self._lock:
+            old = self._rows.get(memo_id)
+            if old is None:
+                return None
+            if expected_updated_at is not None and old.updated_at != expected_updated_at:
+                raise MemoVersionConflictError(memo_id)
+            if title is None and content is None:
+                return old.to_memo()
+            row = _Row(
+                memo_id,
+                title if title is not None else old.title,
+                # 本文を変えない場合は、圧縮済みの本文をそのまま引き継ぐ
+                self._encode(content) if content is not None else old.body,
+                old.created_at,
+                self._touch(old),
+            )
+            self._put(row)
+            await self._append([{"op": "put", "memo": row.to_json()}])
+        return row.to_memo()
+
+    async def delete_by_id(self, memo_id: str) -> bool:
+        return bool(await self.delete_many([memo_id]))
+
+    async def delete_many(self, memo_ids: Sequence[str]) -> set[str]:
+        async with self._lock:
+            deleted = {memo_id for memo_id in memo_ids if self._remove(memo_id)}
+            await self._append([self._tombstone_entry(memo_id) for memo_id in deleted])
+        return deleted
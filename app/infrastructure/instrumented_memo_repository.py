@@ -0,0 +1,176 @@
+"""呼び出しごとの所要時間・返した行数・エラー数を記録する MemoRepository のデコレータ。"""
+
+import time
+from collections.abc import Awaitable, Sequence
+from datetime import datetime
+from typing import Any, Callable, Optional, TypeVar
+
+from app.domain.memo import Memo, MemoDraft, MemoSummary
+from app.domain.memo_page import MemoCollectionVersion, MemoCursor
+from app.domain.memo_search import MemoSearchHit
+from app.domain.memo_sync import MemoChanges, MemoSyncToken
+from app.infrastructure.metrics import (
+    CounterChild,
+    HistogramChild,
+    MetricsRegistry,
+)
+from app.usecases.memo_repository import MemoRepository
+
+_T = TypeVar("_T")
+
+# 返した行数のバケット（一覧の上限 200・一括の上限 1000 に合わせる）
+ROW_BUCKETS = (0, 1, 10, 50, 100, 200, 500, 1000)
+
+_OPERATIONS = (
+    "create",
+    "create_many",
+    "find_all",
+    "find_page",
+    "find_summary_page",
+    "find_by_id",
+    "find_by_ids",
+    "find_version",
+    "collection_version",
+    "find_changes",
+    "search",
+    "update",
+    "patch",
+    "delete_by_id",
+    "delete_many",
+)
+
+
+class _Operation:
+    """1メソッド分の計測先（ラベル解決済みの子メトリクス）。"""
+
+    __slots__ = ("seconds", "rows", "errors")
+
+    def __init__(self, seconds: HistogramChild, rows: HistogramChild, errors: CounterChild):
+        self.seconds = seconds
+        self.rows = rows
+        self.errors = errors
+
+
+def _count(result: Any) -> int:
+    return len(result)
+
+
+def _present(result: Any) -> int:
+    return 0 if result is None or result is False else 1
+
+
+def _count_changes(result: MemoChanges) -> int:
+    return len(result.changed) + len(result.deleted)
+
+
+class InstrumentedMemoRepository(MemoRepository):
+    """別の MemoRepository を包み、各メソッドの所要時間と行数をメトリクスに記録する。
+
+    ラベルの組は起動時に作っておき、呼び出しごとには作らない。
+    """
+
+    def __init__(self, inner: MemoRepository, registry: MetricsRegistry) -> None:
+        self._inner = inner
+        seconds = registry.histogram(
+            "memo_repository_operation_seconds",
+            "Latency of MemoRepository calls in seconds.",
+            ("operation",),
+        )
+        rows = registry.histogram(
+            "memo_repository_rows",
+            "Number of rows returned or affected by MemoRepository calls.",
+            ("operation",),
+            buckets=ROW_BUCKETS,
+        )
+        errors = registry.counter(
+            "memo_repository_errors_total",
+            "MemoRepository calls that raised an exception.",
+            ("operation",),
+        )
+        self._ops = {
+            name: _Operation(seconds.labels(name), rows.labels(name), errors.labels(name))
+            for name in _OPERATIONS
+        }
+
+    async def _observe(
+        self, name: str, call: Awaitable[_T], rows: Callable[[_T], int] = _present
+    ) -> _T:
+        op = self._ops[name]
+        started = time.perf_counter()
+        try:
+            result = await call
+        except Exception:
+            op.errors.inc()
+            raise
+        finally:
+            op.seconds.observe(time.perf_counter() - started)
+        op.rows.observe(rows(result))
+        return result
+
+    async def create(self, title: str, content: str) -> Memo:
+        return await self._observe("create", self._inner.create(title=title, content=content))
+
+    async def create_many(self, drafts: Sequence[MemoDraft]) -> Sequence[Memo]:
+        return await self._observe("create_many", self._inner.create_many(drafts), _count)
+
+    async def find_all(self) -> Sequence[Memo]:
+        return await self._observe("find_all", self._inner.find_all(), _count)
+
+    async def find_page(self, limit: int, after: Optional[MemoCursor] = None) -> Sequence[Memo]:
+        return await self._observe("find_page", self._inner.find_page(limit, after=after), _count)
+
+    async def find_summary_page(
+        self, limit: int, after: Optional[MemoCursor] = None
+    ) -> Sequence[MemoSummary]:
+        return await self._observe(
+            "find_summary_page", self._inner.find_summary_page(limit, after=after), _count
+        )
+
+    async def find_by_id(self, memo_id: str) -> Optional[Memo]:
+        return await self._observe("find_by_id", self._inner.find_by_id(memo_id))
+
+    async def find_by_ids(self, memo_ids: Sequence[str]) -> Sequence[Memo]:
+        return await self._observe("find_by_ids", self._inner.find_by_ids(memo_ids), _count)
+
+    async def find_version(self, memo_id: str) -> Optional[datetime]:
+        return await self._observe("find_version", self._inner.find_version(memo_id))
+
+    async def collection_version(self) -> MemoCollectionVersion:
+        return await self._observe("collection_version", self._inner.collection_version())
+
+    async def find_changes(self, since: MemoSyncToken, limit: int) -> MemoChanges:
+        return await self._observe(
+            "find_changes", self._inner.find_changes(since, limit), _count_changes
+        )
+
+    async def search(self, query: str, limit: int, offset: int = 0) -> Sequence[MemoSearchHit]:
+        return await self._observe(
+            "search", self._inner.search(query, limit, offset=offset), _count
+        )
+
+    async def update(self, memo: Memo) -> Memo:
+        return await self._observe("update", self._inner.update(memo))
+
+    async def patch(
+        self,
+        memo_id: str,
+        *,
+        title: Optional[str] = None,
+        content: Optional[str] = None,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Memo]:
+        return await self._observe(
+            "patch",
+            self._inner.patch(
+                memo_id,
+                title=title,
+                content=content,
+                expected_updated_at=expected_updated_at,
+            ),
+        )
+
+    async def delete_by_id(self, memo_id: str) -> bool:
+        return await self._observe("delete_by_id", self._inner.delete_by_id(memo_id))
+
+    async def delete_many(self, memo_ids: Sequence[str]) -> set[str]:
+        return await self._observe("delete_many", self._inner.delete_many(memo_ids), _count)
@@ -0,0 +1,84 @@
+"""メモキャッシュのバックエンド。プロセス内 LRU の実装と、共有キャッシュ用の差し替え口。"""
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Optional
+
+from app.domain.memo import Memo
+
+
+@dataclass(frozen=True)
+class CachedMemo:
+    """キャッシュに載せる値。memo が None なら「存在しない」ことを表す（ネガティブキャッシュ）。"""
+
+    memo: Optional[Memo]
+
+
+class MemoCacheBackend(ABC):
+    """メモキャッシュの保存先。Redis など共有キャッシュを使う場合はこれを実装する。"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CachedMemo]:
+        """キーに対応する値を返す。無い・期限切れなら None。"""
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: CachedMemo, ttl_seconds: float) -> None:
+        """値を ttl_seconds 秒の有効期限付きで保存する。"""
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """キーを削除する。無ければ何もしない。"""
+        ...
+
+    @property
+    def evictions(self) -> int:
+        """容量超過で追い出した件数。バックエンドが数えない場合は 0。"""
+        return 0
+
+
+class InMemoryLRUCache(MemoCacheBackend):
+    """プロセス内の LRU キャッシュ。件数上限を超えると最も古く使われたものから追い出す。"""
+
+    def __init__(
+        self,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._clock = clock
+        # 値は (有効期限, 値)。並び順を最終アクセス順として使う
+        self._entries: OrderedDict[str, tuple[float, CachedMemo]] = OrderedDict()
+        self._evictions = 0
+
+    async def get(self, key: str) -> Optional[CachedMemo]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: CachedMemo, ttl_seconds: float) -> None:
+        self._entries[key] = (self._clock() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    def __len__(self) -> int:
+        return len(self._entries)
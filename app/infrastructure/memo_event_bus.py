@@ -0,0 +1,196 @@
+"""プロセス内のメモ変更イベントの配送（publish / subscribe）。
+
+発行されたイベントに連番を振り、直近 buffer_size 件をリングバッファに残す。
+購読者は最後に受け取ったイベント ID を渡して再接続すると、その続きから受け取れる。
+イベント ID は "<エポック>-<連番>" の形で、エポックはプロセスごとに変わる（fork した子プロセスでも
+作り直す）。
+別のプロセス（再起動後や別のマシン）の ID や、バッファから消えた古い ID の場合は
+続きを再現できないため、リセット（一覧を取り直す合図）を最初に返す。
+"""
+
+import asyncio
+import os
+import secrets
+import weakref
+from collections import deque
+from collections.abc import Iterator
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+from app.domain.memo_event import MemoEvent
+from app.usecases.memo_event_publisher import MemoEventPublisher
+
+
+@dataclass(frozen=True)
+class MemoEventReset:
+    """続きを再現できないことを購読者に知らせる印。event_id 以降のイベントから受け取り直す。"""
+
+    event_id: str
+
+
+@dataclass(frozen=True)
+class SequencedMemoEvent:
+    """連番付きのイベント。"""
+
+    sequence: int
+    event_id: str
+    event: MemoEvent
+
+
+MemoEventMessage = Union[SequencedMemoEvent, MemoEventReset]
+
+
+class MemoEventSubscription:
+    """1購読者分の受け取り口。受け取りが追いつかずキューがあふれたら、リセットを返して終わる。"""
+
+    def __init__(self, bus: "MemoEventBus", queue_size: int) -> None:
+        self._bus = bus
+        self._queue: asyncio.Queue[MemoEventMessage] = asyncio.Queue(maxsize=queue_size)
+        self._overflowed = False
+        self.closed = False
+
+    def _offer(self, message: MemoEventMessage) -> None:
+        if self._overflowed:
+            return
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # 遅い購読者のためにイベントを溜め込まない。取り出し側でリセットを返して終える
+            self._overflowed = True
+
+    async def next(self, timeout: float) -> Optional[MemoEventMessage]:
+        """次のメッセージを返す。timeout 秒来なければ None。あふれた後はリセットを返して閉じる。"""
+        if self._queue.empty() and self._overflowed:
+            self.close()
+            return MemoEventReset(self._bus.last_event_id)
+        try:
+            message = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if self._overflowed and isinstance(message, MemoEventReset):
+            self.close()
+        return message
+
+    def _end(self) -> None:
+        """溜まった分を渡した後にリセットを返して終えるようにする（待っている next も起こす）。"""
+        if self._overflowed:
+            return
+        with suppress(asyncio.QueueFull):
+            self._queue.put_nowait(MemoEventReset(self._bus.last_event_id))
+        self._overflowed = True
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._bus._subscriptions.discard(self)
+
+
+class MemoEventBus(MemoEventPublisher):
+    """メモの変更イベントをプロセス内の購読者に配る。
+
+    app.server は app.main（この bus）を読み込んでから fork するため、子プロセスでは
+    エポックを作り直して連番・バッファ・購読を空にする。そうしないと全ワーカーが同じエポックを持ち、
+    他のワーカーの NOTIFY を自分のものとして捨て、別のワーカーの ID の続きを再現してしまう。
+    """
+
+    def __init__(
+        self, *, buffer_size: int = 1000, queue_size: int = 100, epoch: Optional[str] = None
+    ) -> None:
+        self.epoch = epoch or secrets.token_hex(4)
+        self._queue_size = queue_size
+        self._sequence = 0
+        self._buffer: deque[SequencedMemoEvent] = deque(maxlen=max(1, buffer_size))
+        self._subscriptions: set[MemoEventSubscription] = set()
+        self._forwarders: list[Callable[[MemoEvent], None]] = []
+        self._closed = False
+        self.published = 0
+        _buses.add(self)
+
+    @property
+    def last_event_id(self) -> str:
+        return f"{self.epoch}-{self._sequence}"
+
+    def __len__(self) -> int:
+        """購読者の数。"""
+        return len(self._subscriptions)
+
+    def add_forwarder(self, forward: Callable[[MemoEvent], None]) -> None:
+        """このプロセスで発行したイベントを、他のプロセスにも送る先を登録する。"""
+        self._forwarders.append(forward)
+
+    def remove_forwarder(self, forward: Callable[[MemoEvent], None]) -> None:
+        self._forwarders.remove(forward)
+
+    def close(self) -> None:
+        """すべての購読をリセットを返して終える。終了時、処理中のリクエストを待つ前に呼ぶ。"""
+        self._closed = True
+        for subscription in list(self._subscriptions):
+            subscription._end()
+
+    def publish(self, event: MemoEvent) -> None:
+        self._deliver(event)
+        for forward in self._forwarders:
+            forward(event)
+
+    def publish_remote(self, event: MemoEvent) -> None:
+        """他のプロセスで発行されたイベントを、このプロセスの購読者に配る（転送はしない）。"""
+        self._deliver(event)
+
+    def _deliver(self, event: MemoEvent) -> None:
+        self._sequence += 1
+        self.published += 1
+        message = SequencedMemoEvent(self._sequence, f"{self.epoch}-{self._sequence}", event)
+        self._buffer.append(message)
+        for subscription in self._subscriptions:
+            subscription._offer(message)
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> MemoEventSubscription:
+        """購読を始める。last_event_id を渡すと、その続きのイベントから受け取る。"""
+        backlog: list[MemoEventMessage] = []
+        if last_event_id is not None:
+            replay = self._replay_after(last_event_id)
+            backlog = [MemoEventReset(self.last_event_id)] if replay is None else list(replay)
+        # 再現する分は queue_size に数えない（バッファに残っている分は必ず渡せる）
+        subscription = MemoEventSubscription(self, self._queue_size + len(backlog))
+        for message in backlog:
+            subscription._offer(message)
+        self._subscriptions.add(subscription)
+        if self._closed:
+            subscription._end()
+        return subscription
+
+    def _reset_after_fork(self) -> None:
+        """fork した子プロセスで、別のプロセスとして振る舞うよう状態を作り直す。"""
+        self.epoch = secrets.token_hex(4)
+        self._sequence = 0
+        self._buffer.clear()
+        # 親の購読は親のイベントループのもので、子では使えない
+        self._subscriptions = set()
+        self.published = 0
+
+    def _replay_after(self, last_event_id: str) -> Optional[Iterator[SequencedMemoEvent]]:
+        """last_event_id より後ろのイベント。続きを再現できない場合は None。"""
+        epoch, _, sequence = last_event_id.rpartition("-")
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        after = int(sequence)
+        if after > self._sequence:
+            return None
+        oldest = self._sequence - len(self._buffer) + 1
+        # after の直後（after + 1）がバッファに残っていなければ、間が抜ける
+        if after + 1 < oldest:
+            return None
+        return (message for message in self._buffer if message.sequence > after)
+
+
+_buses: "weakref.WeakSet[MemoEventBus]" = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    for bus in list(_buses):
+        bus._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):  # Windows には fork が無い
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,63 @@
+"""メモ全文検索のインメモリ転置インデックス。DB を使わない実装・テストで使う。"""
+
+import re
+from collections import Counter, defaultdict
+
+from app.domain.memo import Memo
+
+# Postgres 側（setweight の A / B と ts_rank の既定の重み）に合わせる
+_TITLE_WEIGHT = 1.0
+_CONTENT_WEIGHT = 0.4
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Postgres の 'simple' 設定と同様に、記号・空白で区切って小文字にした語の列を返す。"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class MemoSearchIndex:
+    """語 → (メモ ID → 重み付き出現回数) の転置インデックス。
+
+    検索語はすべて含むメモ（AND 検索）だけがヒットする。
+    """
+
+    def __init__(self) -> None:
+        self._postings: defaultdict[str, dict[str, float]] = defaultdict(dict)
+        self._terms_by_id: dict[str, set[str]] = {}
+
+    def add(self, memo: Memo) -> None:
+        """メモを索引に登録する。同じ ID が登録済みなら置き換える。"""
+        self.remove(memo.id)
+        weights: Counter[str] = Counter()
+        for term in tokenize(memo.title):
+            weights[term] += _TITLE_WEIGHT
+        for term in tokenize(memo.content):
+            weights[term] += _CONTENT_WEIGHT
+        for term, weight in weights.items():
+            self._postings[term][memo.id] = weight
+        self._terms_by_id[memo.id] = set(weights)
+
+    def remove(self, memo_id: str) -> None:
+        """メモを索引から取り除く。未登録なら何もしない。"""
+        for term in self._terms_by_id.pop(memo_id, ()):
+            postings = self._postings[term]
+            postings.pop(memo_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def search(self, query: str) -> list[tuple[str, float]]:
+        """検索語をすべて含むメモの (ID, スコア) をスコアの高い順に返す。"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        # 出現件数の少ない語から絞り込むと候補集合が小さく済む
+        postings = sorted((self._postings.get(t, {}) for t in terms), key=len)
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            candidates &= p.keys()
+            if not candidates:
+                return []
+        scores = {memo_id: sum(p[memo_id] for p in postings) for memo_id in candidates}
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
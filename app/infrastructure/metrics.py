@@ -0,0 +1,208 @@
+"""Prometheus テキスト形式で出力できる軽量なメトリクス（Counter / Gauge / Histogram）。
+
+ラベル値ごとの子メトリクスは labels() で一度だけ作ってキャッシュする。
+呼び出し側は起動時に子を取り出して保持しておけば、計測のたびに dict を作らずに済む。
+"""
+
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from typing import Generic, TypeVar
+
+# 秒単位のレイテンシ向けの既定バケット（5ms〜10s）
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ChildT = TypeVar("_ChildT")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(Generic[_ChildT]):
+    """ラベル付きメトリクスの共通部分。"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], _ChildT] = {}
+
+    def labels(self, *values: str) -> _ChildT:
+        """ラベル値に対応する子メトリクスを返す。初回だけ作る。"""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {values}")
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self) -> _ChildT:
+        raise NotImplementedError
+
+    def _samples(self, labels: str, child: _ChildT) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        for values, child in self._children.items():
+            yield from self._samples(_format_labels(self.labelnames, values), child)
+
+
+class CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric[CounterChild]):
+    """単調増加するカウンタ。"""
+
+    type_name = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def _samples(self, labels: str, child: CounterChild) -> Iterable[str]:
+        yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+class GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Gauge(_Metric[GaugeChild]):
+    """増減する値。"""
+
+    type_name = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def _samples(self, labels: str, child: GaugeChild) -> Iterable[str]:
+        yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+class HistogramChild:
+    __slots__ = ("_upper_bounds", "counts", "sum", "count")
+
+    def __init__(self, upper_bounds: tuple[float, ...]) -> None:
+        self._upper_bounds = upper_bounds
+        # 最後の要素は +Inf バケット
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self._upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric[HistogramChild]):
+    """値の分布。バケットごとの件数（le 以下の累積）と合計・件数を持つ。"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != float("inf")))
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def _samples(self, labels: str, child: HistogramChild) -> Iterable[str]:
+        prefix = labels[:-1] + "," if labels else "{"
+        cumulative = 0
+        for bound, count in zip((*self.buckets, float("inf")), child.counts):
+            cumulative += count
+            le = _format_value(bound)
+            yield f'{self.name}_bucket{prefix}le="{le}"}} {cumulative}'
+        yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+        yield f"{self.name}_count{labels} {child.count}"
+
+
+class MetricsRegistry:
+    """メトリクスをまとめて Prometheus テキスト形式で出力する。"""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric[_ChildT]) -> _Metric[_ChildT]:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def _get_or_create(self, metric: _Metric[_ChildT]) -> _Metric[_ChildT]:
+        # lifespan が同じプロセスで再度走った場合（テストなど）は、登録済みのものを使い続ける
+        existing = self._metrics.get(metric.name)
+        if existing is None:
+            return self.register(metric)
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise ValueError(f"metric already registered with another shape: {metric.name}")
+        return existing
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """カウンタを返す。同じ名前・ラベルのものが登録済みならそれを返す。"""
+        return self._get_or_create(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """ゲージを返す。同じ名前・ラベルのものが登録済みならそれを返す。"""
+        return self._get_or_create(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """ヒストグラムを返す。同じ名前・ラベルのものが登録済みならそれを返す。"""
+        return self._get_or_create(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """全メトリクスを Prometheus テキスト形式（version 0.0.4）で返す。"""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
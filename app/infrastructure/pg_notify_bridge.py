@@ -0,0 +1,198 @@
+"""Postgres の LISTEN / NOTIFY で、マシン間（プロセス間）にメモの変更イベントを配る。
+
+asyncpg は任意依存（`uv sync --extra pubsub`）。Prisma のクエリエンジンは LISTEN を
+扱えないため、専用の接続を1本だけ張る。PgBouncer のトランザクションモードでは
+LISTEN が使えないので、直接つながる URL を渡す。
+
+配送は最善努力で、接続が切れている間や送信待ちがあふれた分のイベントは他のプロセスに届かない。
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.domain.memo_event import MemoEvent
+from app.infrastructure.memo_event_bus import MemoEventBus
+
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - 任意依存
+    asyncpg = None
+
+if TYPE_CHECKING:
+    from asyncpg import Connection
+
+logger = logging.getLogger(__name__)
+
+# Prisma 用で asyncpg が受け付けない接続パラメータ
+_PRISMA_ONLY_PARAMS = frozenset(
+    {
+        "connection_limit",
+        "pool_timeout",
+        "connect_timeout",
+        "socket_timeout",
+        "statement_cache_size",
+        "pgbouncer",
+        "schema",
+    }
+)
+# 接続が切れたときに張り直すまでの最大間隔
+_MAX_RECONNECT_SECONDS = 10.0
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    """DATABASE_URL から Prisma 専用のパラメータを除いた、asyncpg で使える URL を返す。"""
+    parts = urlsplit(database_url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)]
+    kept = [(k, v) for k, v in query if k not in _PRISMA_ONLY_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(kept)))
+
+
+def encode_event(origin: str, event: MemoEvent) -> str:
+    """NOTIFY のペイロード（8000 バイト未満に収まるよう本文は載せない）。"""
+    return json.dumps(
+        {
+            "origin": origin,
+            "kind": event.kind,
+            "id": event.memo_id,
+            "at": event.occurred_at.isoformat(),
+        },
+        separators=(",", ":"),
+    )
+
+
+def decode_event(payload: str) -> tuple[str, MemoEvent]:
+    """encode_event のペイロードを (送り元, イベント) に戻す。不正なら ValueError。"""
+    try:
+        data = json.loads(payload)
+        event = MemoEvent(
+            kind=data["kind"],
+            memo_id=data["id"],
+            occurred_at=datetime.fromisoformat(data["at"]),
+        )
+        return data["origin"], event
+    except (KeyError, TypeError) as exc:
+        raise ValueError(f"invalid memo event payload: {payload!r}") from exc
+
+
+class PgNotifyBridge:
+    """このプロセスで発行したイベントを NOTIFY で送り、他のプロセスの NOTIFY を bus に配る。
+
+    自分が送った NOTIFY も届くので、送り元（bus のエポック）で見分けて捨てる。
+    送信は1本のタスクで順に行い、発行した順序を保つ。送信待ちは outbox_size 件までで、
+    DB が遅い・つながらない間に作成・更新の経路でメモリが増え続けないよう、あふれた分は捨てる。
+    """
+
+    def __init__(
+        self,
+        bus: MemoEventBus,
+        dsn: str,
+        channel: str = "memo_events",
+        *,
+        outbox_size: int = 1000,
+    ) -> None:
+        if asyncpg is None:
+            raise RuntimeError("asyncpg is not installed (uv sync --extra pubsub)")
+        self._bus = bus
+        self._dsn = dsn
+        self._channel = channel
+        self._conn: Optional[Connection] = None
+        self._outbox: asyncio.Queue[Optional[str]] = asyncio.Queue(maxsize=outbox_size)
+        self._sender: Optional[asyncio.Task] = None
+        self._reconnecting: Optional[asyncio.Task] = None
+        self._closed = False
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+        self._overflowing = False
+
+    async def start(self) -> None:
+        """LISTEN を始め、bus で発行したイベントの転送を始める。"""
+        await self._connect()
+        self._bus.add_forwarder(self._forward)
+        self._sender = asyncio.ensure_future(self._send_loop())
+
+    async def close(self) -> None:
+        """送り残しを送ってから LISTEN をやめて切断する。"""
+        self._closed = True
+        self._bus.remove_forwarder(self._forward)
+        if self._reconnecting is not None:
+            self._reconnecting.cancel()
+        if self._sender is not None:
+            await self._outbox.put(None)
+            await self._sender
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+
+    async def _connect(self) -> None:
+        conn = await asyncpg.connect(self._dsn)
+        try:
+            await conn.add_listener(self._channel, self._on_notify)
+        except BaseException:
+            await conn.close()
+            raise
+        conn.add_termination_listener(self._on_terminated)
+        self._conn = conn
+
+    def _on_terminated(self, conn: "Connection") -> None:
+        if self._closed or self._reconnecting is not None:
+            return
+        logger.warning("LISTEN connection lost; reconnecting")
+        self._reconnecting = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 0.5
+        try:
+            while not self._closed:
+                try:
+                    await self._connect()
+                    return
+                except Exception:
+                    # タイムアウトや asyncpg の InterfaceError なども含め、止めずに張り直し続ける
+                    logger.exception("failed to reconnect LISTEN; retrying in %.1fs", delay)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, _MAX_RECONNECT_SECONDS)
+        finally:
+            self._reconnecting = None
+
+    def _forward(self, event: MemoEvent) -> None:
+        try:
+            self._outbox.put_nowait(encode_event(self._bus.epoch, event))
+        except asyncio.QueueFull:
+            # あふれている間に毎回ログを出さないよう、続けて捨てた最初の1件だけ警告する
+            if not self._overflowing:
+                logger.warning("memo event outbox is full; dropping events")
+            self._overflowing = True
+            self.dropped += 1
+        else:
+            self._overflowing = False
+
+    async def _send_loop(self) -> None:
+        while True:
+            payload = await self._outbox.get()
+            if payload is None:
+                return
+            conn = self._conn
+            if conn is None or conn.is_closed():
+                # 張り直している間のイベントは他のプロセスに届かない（最善努力）
+                continue
+            try:
+                await conn.execute("SELECT pg_notify($1, $2)", self._channel, payload)
+                self.sent += 1
+            except Exception:
+                # 送信タスクが止まると以降のイベントが一切送られなくなるので、何が起きても続ける
+                logger.exception("failed to NOTIFY memo event")
+
+    def _on_notify(self, conn: "Connection", pid: int, channel: str, payload: str) -> None:
+        try:
+            origin, event = decode_event(payload)
+        except ValueError:
+            logger.warning("ignored malformed memo event payload")
+            return
+        if origin == self._bus.epoch:
+            return
+        self.received += 1
+        self._bus.publish_remote(event)
@@ -0,0 +1,116 @@
+"""Prisma クライアントの生成・ウォームアップ・接続プールの監視。"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.settings import Settings
+
+if TYPE_CHECKING:
+    from prisma import Prisma
+
+
+def build_datasource_url(url: str, settings: Settings) -> str:
+    """DATABASE_URL に接続プール関連のパラメータを付け足した URL を返す。
+
+    URL 側に同じパラメータが既にあれば、設定値で上書きする。
+    """
+    params: dict[str, str] = {}
+    if settings.db_connection_limit is not None:
+        params["connection_limit"] = str(settings.db_connection_limit)
+    if settings.db_pool_timeout_seconds is not None:
+        params["pool_timeout"] = str(settings.db_pool_timeout_seconds)
+    if settings.db_connect_timeout_seconds is not None:
+        params["connect_timeout"] = str(settings.db_connect_timeout_seconds)
+    if settings.db_socket_timeout_seconds is not None:
+        params["socket_timeout"] = str(settings.db_socket_timeout_seconds)
+    if settings.db_statement_cache_size is not None:
+        params["statement_cache_size"] = str(settings.db_statement_cache_size)
+    if settings.db_pgbouncer:
+        params["pgbouncer"] = "true"
+    if not params:
+        return url
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update(params)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def create_prisma(settings: Settings) -> "Prisma":
+    """設定に従って Prisma クライアントを生成する（接続はしない）。"""
+    from prisma import Prisma
+
+    kwargs: dict = {
+        "connect_timeout": timedelta(seconds=settings.db_engine_connect_timeout_seconds),
+    }
+    if settings.database_url:
+        kwargs["datasource"] = {"url": build_datasource_url(settings.database_url, settings)}
+    if settings.db_query_timeout_seconds is not None:
+        # クエリエンジンへの HTTP リクエストのタイムアウト＝1クエリの上限時間になる
+        kwargs["http"] = {"timeout": settings.db_query_timeout_seconds}
+    return Prisma(**kwargs)
+
+
+async def warm_up(db: "Prisma", connections: int) -> None:
+    """軽いクエリを同時に流し、接続プールに connections 本の接続を張っておく。
+
+    起動直後の最初のリクエストが接続確立を待たずに済むようにする。
+    """
+    if connections <= 0:
+        return
+    await asyncio.gather(*(db.query_raw("SELECT 1") for _ in range(connections)))
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """接続プールの状態。値はクエリエンジンのメトリクスから取得する。"""
+
+    connection_limit: Optional[int]
+    open: int
+    busy: int
+    idle: int
+    queries_active: int
+    queries_waiting: int
+
+    @property
+    def saturation(self) -> Optional[float]:
+        """使用中の接続数 / 上限。上限が不明なら None。"""
+        if not self.connection_limit:
+            return None
+        return self.busy / self.connection_limit
+
+
+_GAUGE_KEYS = {
+    "prisma_pool_connections_open": "open",
+    "prisma_pool_connections_busy": "busy",
+    "prisma_pool_connections_idle": "idle",
+    "prisma_client_queries_active": "queries_active",
+    "prisma_client_queries_wait": "queries_waiting",
+}
+
+
+class PrismaPoolMonitor:
+    """クエリエンジンのメトリクス（previewFeatures = ["metrics"]）から接続プールの状態を読む。"""
+
+    def __init__(self, db: "Prisma", connection_limit: Optional[int]) -> None:
+        self._db = db
+        self._connection_limit = connection_limit
+
+    async def snapshot(self) -> PoolStats:
+        metrics = await self._db.get_metrics()
+        values = dict.fromkeys(_GAUGE_KEYS.values(), 0)
+        for gauge in metrics.gauges:
+            name = _GAUGE_KEYS.get(gauge.key)
+            if name is not None:
+                values[name] = int(gauge.value)
+        return PoolStats(connection_limit=self._connection_limit, **values)
+
+
+async def probe_latency(db: "Prisma", timeout_seconds: float) -> float:
+    """SELECT 1 の往復にかかった秒数を返す。timeout_seconds を超えたら TimeoutError。"""
+    started = time.perf_counter()
+    await asyncio.wait_for(db.query_raw("SELECT 1"), timeout=timeout_seconds)
+    return time.perf_counter() - started
@@ -1,10 +1,80 @@
 """Prisma を使ったメモリポジトリの実装。"""
 
-from typing import Optional
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional
 
-from app.domain.memo import Memo
+from app.domain.memo import Memo, MemoDraft, MemoSummary, MemoVersionConflictError
+from app.domain.memo_page import MemoCollectionVersion, MemoCursor
+from app.domain.memo_search import MemoSearchHit
+from app.domain.memo_sync import MemoChanges, MemoSyncToken, MemoTombstone
+from app.infrastructure.cuid import new_cuid
 from app.usecases.memo_repository import MemoRepository
-from prisma import Prisma
+
+if TYPE_CHECKING:
+    from prisma import Prisma
+
+
+# 1文の INSERT に載せる行数。Postgres のバインド変数上限（65535）に余裕を持たせる
+_CREATE_MANY_CHUNK_SIZE = 1000
+
+
+def _now() -> datetime:
+    """DB の精度（TIMESTAMP(3)）に合わせてミリ秒に丸めた現在時刻を返す。"""
+    now = datetime.now(timezone.utc)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+# search_vector は title を重み A、content を重み B として生成列で保持している
+_SEARCH_SQL = """
+SELECT "id", "title", "content", "created_at", "updated_at",
+       ts_rank("search_vector", query) AS "rank"
+FROM "Memo", websearch_to_tsquery('simple', $1) AS query
+WHERE "search_vector" @@ query
+ORDER BY "rank" DESC, "created_at" ASC, "id" ASC
+LIMIT $2 OFFSET $3
+"""
+
+
+# 本文の代わりに生成列（文字数・先頭部分）を読む。大きな本文の TOAST を読まずに済む
+_SUMMARY_COLUMNS = """
+SELECT "id", "title", "content_length", "content_preview", "created_at", "updated_at"
+FROM "Memo"
+"""
+_SUMMARY_PAGE_SQL = _SUMMARY_COLUMNS + 'ORDER BY "created_at" ASC, "id" ASC LIMIT $1'
+# 行値の比較で (created_at, id) の複合インデックスを範囲スキャンさせる
+_SUMMARY_PAGE_AFTER_SQL = (
+    _SUMMARY_COLUMNS
+    + 'WHERE ("created_at", "id") > ($2::timestamp(3), $3)\n'
+    + 'ORDER BY "created_at" ASC, "id" ASC LIMIT $1'
+)
+
+
+# 差分同期。$1 以降のトランザクションによる変更のうち、連番が $2 より後ろのものを連番順に返す。
+# 同じ文でスナップショットの xmin（まだコミットしていない最古のトランザクション）も読み、
+# 同期し終えた後の watermark にする。xmin より前のトランザクションはすべてこの文から見えて
+# いるため、遅れてコミットされる変更は次の同期で必ず拾える（同じ変更が2回返ることはある）。
+# xid8 と bigint は Prisma の引数で桁あふれしないよう文字列で渡す
+_CHANGES_SQL = """
+WITH "snapshot" AS (
+    SELECT pg_snapshot_xmin(pg_current_snapshot())::text AS "xmin"
+), "changes" AS (
+    (SELECT "id", "title", "content", "created_at", "updated_at",
+            NULL::timestamp(3) AS "deleted_at", "change_seq"
+     FROM "Memo"
+     WHERE "change_xid" >= $1::text::xid8 AND "change_seq" > $2::text::bigint
+     ORDER BY "change_seq" LIMIT $4)
+    UNION ALL
+    (SELECT "id", NULL, NULL, NULL, NULL, "deleted_at", "change_seq"
+     FROM "MemoTombstone"
+     WHERE $3::boolean AND "change_xid" >= $1::text::xid8 AND "change_seq" > $2::text::bigint
+     ORDER BY "change_seq" LIMIT $4)
+)
+SELECT "snapshot"."xmin", "changes".*
+FROM "snapshot" LEFT JOIN "changes" ON TRUE
+ORDER BY "changes"."change_seq"
+LIMIT $4
+"""
 
 
 def _to_domain(row: object) -> Memo:
@@ -18,26 +88,180 @@ def _to_domain(row: object) -> Memo:
     )
 
 
+def _create_rows(memos: Sequence[Memo]) -> list[dict]:
+    return [
+        {
+            "id": m.id,
+            "title": m.title,
+            "content": m.content,
+            "created_at": m.created_at,
+            "updated_at": m.updated_at,
+        }
+        for m in memos
+    ]
+
+
 class PrismaMemoRepository(MemoRepository):
     """Prisma を用いた MemoRepository の実装。"""
 
-    def __init__(self, db: Prisma) -> None:
+    def __init__(self, db: "Prisma") -> None:
         self._db = db
 
     async def create(self, title: str, content: str) -> Memo:
         row = await self._db.memo.create(data={"title": title, "content": content})
         return _to_domain(row)
 
+    async def create_many(self, drafts: Sequence[MemoDraft]) -> list[Memo]:
+        # ID と日時をアプリ側で採番し、作成結果を読み直さずに返す
+        now = _now()
+        memos = [
+            Memo(id=new_cuid(), title=d.title, content=d.content, created_at=now, updated_at=now)
+            for d in drafts
+        ]
+        if len(memos) <= _CREATE_MANY_CHUNK_SIZE:
+            # 1文の INSERT はそれだけで原子的なので、トランザクションの往復を省く
+            await self._db.memo.create_many(data=_create_rows(memos))
+            return memos
+        async with self._db.tx() as tx:
+            for start in range(0, len(memos), _CREATE_MANY_CHUNK_SIZE):
+                chunk = memos[start : start + _CREATE_MANY_CHUNK_SIZE]
+                await tx.memo.create_many(data=_create_rows(chunk))
+        return memos
+
     async def find_all(self) -> list[Memo]:
         rows = await self._db.memo.find_many(order={"created_at": "asc"})
         return [_to_domain(r) for r in rows]
 
+    async def find_page(self, limit: int, after: Optional[MemoCursor] = None) -> list[Memo]:
+        # (created_at, id) の複合インデックスを範囲スキャンさせるため、
+        # 並び順と同じ列でカーソル以降を絞り込む
+        where = {}
+        if after is not None:
+            where = {
+                "OR": [
+                    {"created_at": {"gt": after.created_at}},
+                    {"created_at": after.created_at, "id": {"gt": after.id}},
+                ]
+            }
+        rows = await self._db.memo.find_many(
+            where=where,
+            order=[{"created_at": "asc"}, {"id": "asc"}],
+            take=limit,
+        )
+        return [_to_domain(r) for r in rows]
+
+    async def find_summary_page(
+        self, limit: int, after: Optional[MemoCursor] = None
+    ) -> list[MemoSummary]:
+        # Prisma Client Python の find_many は列を選べないため、生 SQL で要約の列だけを読む
+        if after is None:
+            rows = await self._db.query_raw(_SUMMARY_PAGE_SQL, limit)
+        else:
+            rows = await self._db.query_raw(
+                _SUMMARY_PAGE_AFTER_SQL, limit, after.created_at, after.id
+            )
+        return [
+            MemoSummary(
+                id=r["id"],
+                title=r["title"],
+                content_length=r["content_length"],
+                preview=r["content_preview"],
+                created_at=r["created_at"],
+                updated_at=r["updated_at"],
+            )
+            for r in rows
+        ]
+
     async def find_by_id(self, memo_id: str) -> Optional[Memo]:
         row = await self._db.memo.find_unique(where={"id": memo_id})
         if row is None:
             return None
         return _to_domain(row)
 
+    async def find_by_ids(self, memo_ids: Sequence[str]) -> list[Memo]:
+        if not memo_ids:
+            return []
+        rows = await self._db.memo.find_many(where={"id": {"in": list(dict.fromkeys(memo_ids))}})
+        return [_to_domain(r) for r in rows]
+
+    async def find_version(self, memo_id: str) -> Optional[datetime]:
+        rows = await self._db.query_raw(
+            'SELECT "updated_at" FROM "Memo" WHERE "id" = $1',
+            memo_id,
+        )
+        if not rows:
+            return None
+        return rows[0]["updated_at"]
+
+    async def collection_version(self) -> MemoCollectionVersion:
+        # MAX は updated_at のインデックスの端を読むだけで済む
+        rows = await self._db.query_raw(
+            'SELECT COUNT(*)::int AS "count", MAX("updated_at") AS "last_updated_at" FROM "Memo"'
+        )
+        return MemoCollectionVersion(
+            count=rows[0]["count"],
+            last_updated_at=rows[0]["last_updated_at"],
+        )
+
+    async def find_changes(self, since: MemoSyncToken, limit: int) -> MemoChanges:
+        rows = await self._db.query_raw(
+            _CHANGES_SQL,
+            str(since.watermark),
+            str(since.after),
+            not since.is_initial,
+            limit + 1,
+        )
+        # 変更が無くても xmin の1行は返る（changes 側の列は NULL）
+        changes = [r for r in rows if r["change_seq"] is not None]
+        page = changes[:limit]
+        # 1回の同期が複数ページに分かれる間は、最初のページの xmin を次の watermark として持ち回る
+        next_watermark = since.next_watermark
+        if next_watermark is None:
+            next_watermark = int(rows[0]["xmin"])
+        has_more = len(changes) > limit
+        if has_more:
+            next_token = MemoSyncToken(
+                since.watermark, after=page[-1]["change_seq"], next_watermark=next_watermark
+            )
+        else:
+            next_token = MemoSyncToken(next_watermark)
+        return MemoChanges(
+            changed=[
+                Memo(
+                    id=r["id"],
+                    title=r["title"],
+                    content=r["content"],
+                    created_at=r["created_at"],
+                    updated_at=r["updated_at"],
+                )
+                for r in page
+                if r["deleted_at"] is None
+            ],
+            deleted=[
+                MemoTombstone(id=r["id"], deleted_at=r["deleted_at"])
+                for r in page
+                if r["deleted_at"] is not None
+            ],
+            next_token=next_token,
+            has_more=has_more,
+        )
+
+    async def search(self, query: str, limit: int, offset: int = 0) -> list[MemoSearchHit]:
+        rows = await self._db.query_raw(_SEARCH_SQL, query, limit, offset)
+        return [
+            MemoSearchHit(
+                memo=Memo(
+                    id=r["id"],
+                    title=r["title"],
+                    content=r["content"],
+                    created_at=r["created_at"],
+                    updated_at=r["updated_at"],
+                ),
+                rank=float(r["rank"]),
+            )
+            for r in rows
+        ]
+
     async def update(self, memo: Memo) -> Memo:
         row = await self._db.memo.update(
             where={"id": memo.id},
@@ -48,6 +272,36 @@ class PrismaMemoRepository(MemoRepository):
         )
         return _to_domain(row)
 
+    async def patch(
+        self,
+        memo_id: str,
+        *,
+        title: Optional[str] = None,
+        content: Optional[str] = None,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Memo]:
+        # バージョン指定時は where に updated_at を含め、比較と更新を1文で行う
+        where: dict = {"id": memo_id}
+        if expected_updated_at is not None:
+            where["updated_at"] = expected_updated_at
+        data: dict = {}
+        if title is not None:
+            data["title"] = title
+        if content is not None:
+            data["content"] = content
+        if data:
+            row = await self._db.memo.update(where=where, data=data)
+        else:
+            row = await self._db.memo.find_first(where=where)
+        if row is not None:
+            return _to_domain(row)
+        if expected_updated_at is None:
+            return None
+        # 条件付き更新が空振りした場合だけ、存在しないのかバージョン違いなのかを確かめる
+        if await self._db.memo.count(where={"id": memo_id}) == 0:
+            return None
+        raise MemoVersionConflictError(memo_id)
+
     async def delete_by_id(self, memo_id: str) -> bool:
         try:
             await self._db.memo.delete(where={"id": memo_id})
@@ -55,3 +309,13 @@ class PrismaMemoRepository(MemoRepository):
         except Exception:
             # 存在しない ID の場合は Prisma が例外を投げる想定
             return False
+
+    async def delete_many(self, memo_ids: Sequence[str]) -> set[str]:
+        if not memo_ids:
+            return set()
+        # RETURNING で削除できた ID を受け取り、確認用の SELECT を省く
+        rows = await self._db.query_raw(
+            'DELETE FROM "Memo" WHERE "id" = ANY($1::text[]) RETURNING "id"',
+            list(memo_ids),
+        )
+        return {row["id"] for row in rows}
@@ -0,0 +1,70 @@
+"""同じキーの同時実行をまとめる single-flight。"""
+
+import asyncio
+from collections.abc import Awaitable, Hashable
+from typing import Callable, Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+class _Flight(Generic[_T]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[_T]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[_T]):
+    """同じキーで実行中の呼び出しがあれば、新たに実行せずその結果を待つ。
+
+    実体は別タスクで動かすので、待っている側の1つがキャンセルされても他の待ち手には影響しない。
+    待ち手が全員キャンセルされた場合だけ実体もキャンセルする。例外は待ち手全員に伝わり、
+    次の呼び出しは改めて実行する（失敗は覚えない）。
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, _Flight[_T]] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[_T]]) -> _T:
+        """key の呼び出しが実行中ならその結果を、なければ func() を実行して結果を返す。"""
+        self.calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(func()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._finish(key, task))
+        else:
+            self.coalesced += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def forget(self, key: Hashable) -> None:
+        """実行中の key を切り離す。以降の呼び出しは新たに実行する（書き込み後の読み直し用）。"""
+        self._flights.pop(key, None)
+
+    def forget_all(self) -> None:
+        """実行中の呼び出しをすべて切り離す。"""
+        self._flights.clear()
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[_T]") -> None:
+        if self._flights.get(key) is not None and self._flights[key].task is task:
+            del self._flights[key]
+        # 待ち手が全員いなくなった後の例外を「取り出されなかった例外」として警告させない
+        if not task.cancelled():
+            task.exception()
@@ -1,3 +1,6 @@
+from app.interfaces.health_router import router as health_router
 from app.interfaces.memo_router import router as memo_router
+from app.interfaces.metrics_router import router as metrics_router
+from app.interfaces.ops_router import router as ops_router
 
-__all__ = ["memo_router"]
+__all__ = ["health_router", "memo_router", "metrics_router", "ops_router"]
@@ -0,0 +1,259 @@
+"""受け付け制御の ASGI ミドルウェア。過負荷のときに DB の接続プールを守る。
+
+- クライアントごとのトークンバケットでリクエストの頻度を抑え、超えたら 429 で断る
+- 全体の同時処理数を抑え、あふれたリクエストは上限付きのキューで順番を待たせる。
+  キューが満杯か、待ち時間の期限を過ぎたら 503 で断る（待たせ続けて全員を遅くしない）
+
+どちらも Retry-After を付けて返す。ヘルスチェックと /metrics は対象外にする。
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterable
+from typing import Callable, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.infrastructure.metrics import CounterChild, GaugeChild, HistogramChild, MetricsRegistry
+
+# 受け付け制御の対象外にするパス（プローブや計測が過負荷で落ちると、原因の切り分けができない）。
+# 変更通知のストリームは接続している間ずっと続くため、同時処理数の枠を占有させない
+DEFAULT_EXEMPT_PATHS = frozenset({"/healthz", "/readyz", "/metrics", "/memos/stream"})
+
+# 断った理由（メトリクスのラベル）
+RATE_LIMITED = "rate_limited"
+QUEUE_FULL = "queue_full"
+QUEUE_TIMEOUT = "queue_timeout"
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimiter:
+    """キーごとのトークンバケット。毎秒 rate_per_second 個たまり、最大 burst 個まで持てる。
+
+    バケットは最近使った max_keys 個だけ持ち、古いものから捨てる（捨てたキーは満タンからやり直す）。
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int,
+        *,
+        max_keys: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate_per_second <= 0 or burst < 1:
+            raise ValueError("rate_per_second must be positive and burst at least 1")
+        self._rate = rate_per_second
+        self._burst = float(burst)
+        self._max_keys = max_keys
+        self._clock = clock
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+
+    def acquire(self, key: str) -> float:
+        """key のトークンを1つ使う。使えたら 0、足りなければ1つたまるまでの秒数を返す。"""
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(self._burst, now)
+            if len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket.tokens = min(self._burst, bucket.tokens + (now - bucket.updated) * self._rate)
+            bucket.updated = now
+        if bucket.tokens >= 1.0:
+            bucket.tokens -= 1.0
+            return 0.0
+        return (1.0 - bucket.tokens) / self._rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ConcurrencyLimiter:
+    """同時に処理するリクエストを limit 件に抑える。空きを待てるのは max_queue 件まで（先着順）。"""
+
+    def __init__(self, limit: int, *, max_queue: int, queue_timeout_seconds: float) -> None:
+        if limit < 1 or max_queue < 0:
+            raise ValueError("limit must be at least 1 and max_queue non-negative")
+        self._limit = limit
+        self._max_queue = max_queue
+        self._timeout = queue_timeout_seconds
+        self._active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def queue_timeout_seconds(self) -> float:
+        return self._timeout
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def would_queue(self) -> bool:
+        """いま acquire() を呼ぶと、空きを待つ（キューに並ぶ）ことになるか。"""
+        return self._active >= self._limit or bool(self._waiters)
+
+    async def acquire(self) -> Optional[str]:
+        """枠を1つ取る。取れたら None、断るなら理由（QUEUE_FULL / QUEUE_TIMEOUT）を返す。"""
+        if not self.would_queue():
+            self._active += 1
+            return None
+        if len(self._waiters) >= self._max_queue:
+            return QUEUE_FULL
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait((waiter,), timeout=self._timeout)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if waiter.done():
+            # release() から枠を引き継いだ（active はそのまま）
+            return None
+        self._abandon(waiter)
+        return QUEUE_TIMEOUT
+
+    def release(self) -> None:
+        """枠を返す。待っているリクエストがあれば、先頭にそのまま引き継ぐ。"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def _abandon(self, waiter: "asyncio.Future[None]") -> None:
+        if waiter.done() and not waiter.cancelled():
+            # 枠を引き継いだ直後に諦めた場合は、次に回す
+            self.release()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+class AdmissionMetrics:
+    """受け付け制御のメトリクス一式。"""
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        rejected = registry.counter(
+            "http_admission_rejected_total",
+            "Requests shed by admission control by reason.",
+            ("reason",),
+        )
+        self.rejected: dict[str, CounterChild] = {
+            reason: rejected.labels(reason) for reason in (RATE_LIMITED, QUEUE_FULL, QUEUE_TIMEOUT)
+        }
+        self.queued: CounterChild = registry.counter(
+            "http_admission_queued_total", "Requests that waited for a concurrency slot."
+        ).labels()
+        self.queue_length: GaugeChild = registry.gauge(
+            "http_admission_queue_length", "Requests currently waiting for a concurrency slot."
+        ).labels()
+        self.queue_wait: HistogramChild = registry.histogram(
+            "http_admission_queue_wait_seconds",
+            "Time admitted requests waited for a concurrency slot in seconds.",
+        ).labels()
+
+
+def client_key(scope: Scope, header: Optional[str]) -> str:
+    """レート制限のキー。header があればその値、無ければ接続元のアドレス。"""
+    if header is not None:
+        value = Headers(scope=scope).get(header)
+        if value:
+            return value
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class AdmissionMiddleware:
+    """レート制限と同時処理数の制限をかけ、超えたリクエストを 429 / 503 ですぐに断る。"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate_limiter: Optional[RateLimiter] = None,
+        limiter: Optional[ConcurrencyLimiter] = None,
+        metrics: Optional[AdmissionMetrics] = None,
+        key_header: Optional[str] = None,
+        exempt_paths: Iterable[str] = DEFAULT_EXEMPT_PATHS,
+    ) -> None:
+        self.app = app
+        self.rate_limiter = rate_limiter
+        self.limiter = limiter
+        self.metrics = metrics
+        self.key_header = key_header
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.acquire(client_key(scope, self.key_header))
+            if wait > 0:
+                await self._reject(scope, receive, send, 429, RATE_LIMITED, wait)
+                return
+        limiter = self.limiter
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        reason = await self._acquire(limiter)
+        if reason is not None:
+            await self._reject(scope, receive, send, 503, reason, limiter.queue_timeout_seconds)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    async def _acquire(self, limiter: ConcurrencyLimiter) -> Optional[str]:
+        metrics = self.metrics
+        if metrics is None or not limiter.would_queue():
+            return await limiter.acquire()
+        # 待たされる場合だけ、待ち行列の長さと、枠を取れたリクエストの待ち時間を記録する
+        started = time.perf_counter()
+        metrics.queue_length.inc()
+        try:
+            reason = await limiter.acquire()
+        finally:
+            metrics.queue_length.dec()
+        if reason != QUEUE_FULL:
+            metrics.queued.inc()
+        if reason is None:
+            metrics.queue_wait.observe(time.perf_counter() - started)
+        return reason
+
+    async def _reject(
+        self, scope: Scope, receive: Receive, send: Send, status: int, reason: str, retry: float
+    ) -> None:
+        if self.metrics is not None:
+            self.metrics.rejected[reason].inc()
+        response = JSONResponse(
+            {"detail": "Too many requests" if status == 429 else "Server is busy"},
+            status_code=status,
+            headers={"Retry-After": str(max(1, math.ceil(retry)))},
+        )
+        await response(scope, receive, send)
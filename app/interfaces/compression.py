@@ -0,0 +1,70 @@
+"""レスポンス圧縮ミドルウェア。クライアントが対応していれば brotli、なければ gzip で圧縮する。
+
+brotli は任意依存（`uv sync --extra compression`）。未インストールなら gzip のみ使う。
+"""
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 任意依存
+    brotli = None
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    """Accept-Encoding に coding が q=0 以外で含まれるかを返す。"""
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() != coding:
+            continue
+        q = params.strip().replace(" ", "")
+        return q not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class BrotliResponder(IdentityResponder):
+    """brotli で圧縮する Responder。ストリーミングでは受け取ったチャンクごとに flush する。"""
+
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        chunk = self.compressor.process(body)
+        if more_body:
+            return chunk + self.compressor.flush()
+        return chunk + self.compressor.finish()
+
+
+class CompressionMiddleware:
+    """minimum_size バイト以上のレスポンスを brotli / gzip で圧縮する。"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1000,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = Headers(scope=scope).get("Accept-Encoding", "")
+        responder: ASGIApp
+        if brotli is not None and _accepts(accept_encoding, "br"):
+            responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+        elif _accepts(accept_encoding, "gzip"):
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
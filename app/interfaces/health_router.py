@@ -0,0 +1,96 @@
+"""ヘルスチェック用のルーター。Fly.io のヘルスチェックから呼ばれる。"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Request, Response, status
+from pydantic import BaseModel
+
+from app.deps import (
+    get_db,
+    get_pool_monitor,
+    get_readiness_gate,
+    get_settings,
+    get_startup_profile,
+)
+from app.infrastructure.prisma_client import probe_latency
+from app.interfaces.readiness import ReadinessGate
+from app.settings import Settings
+from app.startup_profile import StartupProfile
+
+router = APIRouter(tags=["health"])
+
+
+class LivenessResponse(BaseModel):
+    """プロセスが動いていること。"""
+
+    status: str
+
+
+class ReadinessResponse(BaseModel):
+    """リクエストを受け付けられるかどうかと、その根拠。"""
+
+    status: str
+    startup_seconds: Optional[float] = None
+    # 起動のフェーズ（imports・app・routers・prisma_connect など）ごとの所要時間
+    startup_phases_ms: Optional[dict[str, float]] = None
+    db_latency_ms: Optional[float] = None
+    pool_open_connections: Optional[int] = None
+    pool_saturation: Optional[float] = None
+
+
+@router.get("/healthz", response_model=LivenessResponse)
+async def healthz() -> LivenessResponse:
+    """プロセスが応答できることだけを返す（DB は見ない）。"""
+    return LivenessResponse(status="ok")
+
+
+@router.get(
+    "/readyz",
+    response_model=ReadinessResponse,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessResponse}},
+)
+async def readyz(
+    request: Request,
+    response: Response,
+    gate: ReadinessGate = Depends(get_readiness_gate),
+    settings: Settings = Depends(get_settings),
+    profile: StartupProfile = Depends(get_startup_profile),
+) -> ReadinessResponse:
+    """起動処理が終わり、DB に届く場合に 200。それ以外は 503。
+
+    DB には SELECT 1 を投げて往復時間を測る。DB を使わない構成では起動処理の完了だけを見る。
+    """
+    phases = profile.as_milliseconds()
+    if not gate.is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return ReadinessResponse(
+            status="starting", startup_seconds=gate.startup_seconds, startup_phases_ms=phases
+        )
+    db = get_db(request)
+    if db is None:
+        # インメモリの保存先では DB を見ない
+        return ReadinessResponse(
+            status="ok", startup_seconds=gate.startup_seconds, startup_phases_ms=phases
+        )
+    try:
+        latency = await probe_latency(db, settings.readiness_probe_timeout_seconds)
+    except Exception:
+        # 接続断・タイムアウトなど理由を問わず、DB に届かなければ準備未完了とする
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return ReadinessResponse(
+            status="db_unavailable", startup_seconds=gate.startup_seconds, startup_phases_ms=phases
+        )
+    body = ReadinessResponse(
+        status="ok",
+        startup_seconds=gate.startup_seconds,
+        startup_phases_ms=phases,
+        db_latency_ms=round(latency * 1000, 3),
+    )
+    try:
+        stats = await get_pool_monitor(request).snapshot()
+    except Exception:
+        # メトリクスが取れなくても readiness には影響させない
+        return body
+    body.pool_open_connections = stats.open
+    body.pool_saturation = stats.saturation
+    return body
@@ -0,0 +1,92 @@
+"""メモの ETag（id と updated_at から作る強い ETag）の生成と解釈、条件付きリクエストの判定。"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from app.domain.memo import Memo
+from app.domain.memo_page import MemoCollectionVersion
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # DB から来る日時は UTC。タイムゾーン無しの日時も UTC とみなす
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _to_micros(value: datetime) -> int:
+    return (_as_utc(value) - _EPOCH) // _MICROSECOND
+
+
+def memo_version_etag(memo_id: str, updated_at: datetime) -> str:
+    """メモの ID と updated_at から ETag を返す。"""
+    return f'"{memo_id}.{_to_micros(updated_at)}"'
+
+
+def memo_etag(memo: Memo) -> str:
+    """メモの ETag を返す。updated_at が変われば値も変わる。"""
+    return memo_version_etag(memo.id, memo.updated_at)
+
+
+def parse_memo_etag(value: str, memo_id: str) -> Optional[datetime]:
+    """memo_etag が返した ETag から updated_at を取り出す。
+
+    別のメモの ETag・弱い ETag・形式が違うものは None を返す。
+    """
+    value = value.strip()
+    if len(value) < 2 or not (value.startswith('"') and value.endswith('"')):
+        return None
+    etag_id, sep, micros = value[1:-1].rpartition(".")
+    if not sep or etag_id != memo_id or not micros.isdigit():
+        return None
+    return _EPOCH + timedelta(microseconds=int(micros))
+
+
+def memo_list_etag(version: MemoCollectionVersion, *parts: object) -> str:
+    """一覧ページの弱い ETag を返す。parts にはカーソルや件数などページを決める値を渡す。"""
+    last = _to_micros(version.last_updated_at) if version.last_updated_at is not None else 0
+    key = "|".join(str(p) for p in (version.count, last, *parts))
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+
+def http_date(value: datetime) -> str:
+    """Last-Modified 等に使う HTTP 日付文字列を返す。"""
+    return format_datetime(_as_utc(value).replace(microsecond=0), usegmt=True)
+
+
+def _opaque(etag: str) -> str:
+    # 弱い比較（RFC 9110）では W/ の有無を無視する
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(
+    etag: str,
+    last_modified: Optional[datetime],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> bool:
+    """条件付き GET で 304 を返してよいかを判定する。
+
+    If-None-Match があれば If-Modified-Since は見ない（RFC 9110）。
+    """
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        current = _opaque(etag)
+        return any(_opaque(candidate) == current for candidate in if_none_match.split(","))
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP 日付は秒単位なので、更新日時も秒に切り捨てて比べる
+    return _as_utc(last_modified).replace(microsecond=0) <= since
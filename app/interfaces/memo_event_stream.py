@@ -0,0 +1,48 @@
+"""メモの変更イベントを Server-Sent Events（text/event-stream）で送る。
+
+1イベントは次の形で、id は再接続時に Last-Event-ID として送り返してもらう。
+
+    id: <イベント ID>
+    event: created | updated | deleted
+    data: {"id": "<メモ ID>", "kind": "...", "occurred_at": "..."}
+
+続きを再現できない場合は event: reset を送る。クライアントは一覧を取り直し、
+reset の id 以降のイベントを受け取る。何も起きない間は keepalive のコメント行を送り、
+途中のプロキシにアイドル接続として切られないようにする。
+"""
+
+from collections.abc import AsyncIterator
+
+from app.infrastructure.memo_event_bus import (
+    MemoEventMessage,
+    MemoEventReset,
+    MemoEventSubscription,
+)
+from app.interfaces.memo_serializer import dump_memo_event
+
+SSE_MEDIA_TYPE = "text/event-stream"
+# 切断されたクライアントが再接続するまでの待ち時間（ミリ秒）
+RETRY_MILLISECONDS = 1000
+KEEPALIVE = b": keepalive\n\n"
+
+
+def format_message(message: MemoEventMessage) -> bytes:
+    """1メッセージを SSE のイベント1つにする。"""
+    if isinstance(message, MemoEventReset):
+        return f"id: {message.event_id}\nevent: reset\ndata: {{}}\n\n".encode()
+    head = f"id: {message.event_id}\nevent: {message.event.kind}\ndata: ".encode()
+    return head + dump_memo_event(message.event) + b"\n\n"
+
+
+async def stream_memo_events(
+    subscription: MemoEventSubscription, keepalive_seconds: float
+) -> AsyncIterator[bytes]:
+    """購読したイベントを SSE で流す。購読が閉じたら（あふれた後のリセットを送ったら）終える。"""
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+        while not subscription.closed:
+            message = await subscription.next(keepalive_seconds)
+            yield KEEPALIVE if message is None else format_message(message)
+    finally:
+        # クライアントが切断した場合もここを通り、以降のイベントを溜めない
+        subscription.close()
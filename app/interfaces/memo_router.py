@@ -1,107 +1,381 @@
 """メモ API のルーター。ユースケースを呼び出し HTTP に変換する。"""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from collections.abc import AsyncIterator
+from typing import Literal, Optional, Union
 
-from app.deps import get_db
-from app.domain.memo import Memo
-from app.infrastructure.prisma_memo_repository import PrismaMemoRepository
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.deps import (
+    get_bulk_create_memos_use_case,
+    get_bulk_delete_memos_use_case,
+    get_create_memo_use_case,
+    get_delete_memo_use_case,
+    get_export_memos_use_case,
+    get_list_memo_changes_use_case,
+    get_list_memo_summaries_use_case,
+    get_list_memos_use_case,
+    get_memo_collection_version_use_case,
+    get_memo_event_bus,
+    get_memo_use_case,
+    get_memo_version_use_case,
+    get_memos_use_case,
+    get_search_memos_use_case,
+    get_settings,
+    get_update_memo_use_case,
+)
+from app.domain.memo import MemoDraft, MemoVersionConflictError
+from app.domain.memo_page import InvalidMemoCursorError, MemoCursor
+from app.domain.memo_search import MemoSearchHit
+from app.domain.memo_sync import InvalidSyncTokenError, MemoSyncToken
+from app.infrastructure.memo_event_bus import MemoEventBus
+from app.interfaces.memo_etag import (
+    http_date,
+    is_not_modified,
+    memo_etag,
+    memo_list_etag,
+    memo_version_etag,
+    parse_memo_etag,
+)
+from app.interfaces.memo_event_stream import SSE_MEDIA_TYPE, stream_memo_events
 from app.interfaces.memo_schema import (
+    MemoBulkCreateRequest,
+    MemoBulkCreateResponse,
+    MemoBulkDeleteRequest,
+    MemoBulkDeleteResponse,
+    MemoBulkDeleteResult,
+    MemoChangesResponse,
     MemoCreateRequest,
+    MemoMultiGetResponse,
+    MemoPageResponse,
     MemoResponse,
+    MemoSearchHitResponse,
+    MemoSearchResponse,
+    MemoSummaryPageResponse,
     MemoUpdateRequest,
 )
+from app.interfaces.memo_serializer import (
+    dump_memo,
+    dump_memo_changes,
+    dump_memo_items,
+    dump_memo_lines,
+    dump_memo_multi_get,
+    dump_memo_page,
+    dump_memo_summary_page,
+)
+from app.settings import Settings
 from app.usecases.memo_use_cases import (
+    BulkCreateMemosUseCase,
+    BulkDeleteMemosUseCase,
     CreateMemoUseCase,
     DeleteMemoUseCase,
+    ExportMemosUseCase,
+    GetMemoCollectionVersionUseCase,
+    GetMemosUseCase,
     GetMemoUseCase,
+    GetMemoVersionUseCase,
+    ListMemoChangesUseCase,
+    ListMemoSummariesUseCase,
     ListMemosUseCase,
+    SearchMemosUseCase,
     UpdateMemoUseCase,
 )
 
 router = APIRouter(prefix="/memos", tags=["memos"])
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+EXPORT_BATCH_SIZE = 500
+MAX_MULTI_GET_IDS = 100
+
 
-def _memo_to_response(memo: Memo) -> MemoResponse:
-    return MemoResponse(
-        id=memo.id,
-        title=memo.title,
-        content=memo.content,
-        created_at=memo.created_at,
-        updated_at=memo.updated_at,
+def _hit_to_response(hit: MemoSearchHit) -> MemoSearchHitResponse:
+    return MemoSearchHitResponse(
+        id=hit.memo.id,
+        title=hit.memo.title,
+        content=hit.memo.content,
+        created_at=hit.memo.created_at,
+        updated_at=hit.memo.updated_at,
+        rank=hit.rank,
     )
 
 
-def _get_use_cases(db=Depends(get_db)) -> dict:
-    """DI: リポジトリとユースケースを組み立てる。"""
-    repo = PrismaMemoRepository(db)
-    return {
-        "create": CreateMemoUseCase(repo),
-        "list": ListMemosUseCase(repo),
-        "get": GetMemoUseCase(repo),
-        "update": UpdateMemoUseCase(repo),
-        "delete": DeleteMemoUseCase(repo),
-    }
+def _encode_cursor(cursor: Optional[MemoCursor]) -> Optional[str]:
+    return cursor.encode() if cursor is not None else None
+
+
+def _json_response(
+    body: bytes,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[dict[str, str]] = None,
+) -> Response:
+    """シリアライズ済みの JSON をそのまま返す（FastAPI による再検証・再エンコードを省く）。"""
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
 
 
 @router.post("", response_model=MemoResponse, status_code=status.HTTP_201_CREATED)
 async def create_memo(
     body: MemoCreateRequest,
-    use_cases: dict = Depends(_get_use_cases),
-) -> MemoResponse:
-    memo = await use_cases["create"].execute(
+    create: CreateMemoUseCase = Depends(get_create_memo_use_case),
+) -> Response:
+    memo = await create.execute(
         title=body.title,
         content=body.content,
     )
-    return _memo_to_response(memo)
+    return _json_response(
+        dump_memo(memo),
+        status_code=status.HTTP_201_CREATED,
+        headers={"ETag": memo_etag(memo)},
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=MemoBulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def bulk_create_memos(
+    body: MemoBulkCreateRequest,
+    bulk_create: BulkCreateMemosUseCase = Depends(get_bulk_create_memos_use_case),
+) -> Response:
+    memos = await bulk_create.execute(
+        [MemoDraft(title=item.title, content=item.content) for item in body.items]
+    )
+    return _json_response(dump_memo_items(memos), status_code=status.HTTP_201_CREATED)
+
+
+@router.delete("/bulk", response_model=MemoBulkDeleteResponse)
+async def bulk_delete_memos(
+    body: MemoBulkDeleteRequest,
+    bulk_delete: BulkDeleteMemosUseCase = Depends(get_bulk_delete_memos_use_case),
+) -> MemoBulkDeleteResponse:
+    results = await bulk_delete.execute(body.ids)
+    return MemoBulkDeleteResponse(
+        results=[MemoBulkDeleteResult(id=memo_id, deleted=deleted) for memo_id, deleted in results]
+    )
+
+
+def _parse_ids(ids: str) -> list[str]:
+    memo_ids = [memo_id for memo_id in (part.strip() for part in ids.split(",")) if memo_id]
+    if not memo_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids を1つ以上指定してください",
+        )
+    if len(memo_ids) > MAX_MULTI_GET_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids は {MAX_MULTI_GET_IDS} 件までです",
+        )
+    return memo_ids
 
 
-@router.get("", response_model=list[MemoResponse])
+@router.get(
+    "",
+    response_model=Union[MemoPageResponse, MemoSummaryPageResponse, MemoMultiGetResponse],
+)
 async def list_memos(
-    use_cases: dict = Depends(_get_use_cases),
-) -> list[MemoResponse]:
-    memos = await use_cases["list"].execute()
-    return [_memo_to_response(m) for m in memos]
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    view: Literal["full", "summary"] = Query(
+        "full", description="summary なら本文の代わりに文字数と先頭部分を返す"
+    ),
+    ids: Optional[str] = Query(
+        None, description="カンマ区切りの ID。指定するとページングせずそれらのメモだけを返す"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    list_page: ListMemosUseCase = Depends(get_list_memos_use_case),
+    list_summaries: ListMemoSummariesUseCase = Depends(get_list_memo_summaries_use_case),
+    get_many: GetMemosUseCase = Depends(get_memos_use_case),
+    list_version: GetMemoCollectionVersionUseCase = Depends(get_memo_collection_version_use_case),
+) -> Response:
+    if ids is not None:
+        # N 件の取得を1回の問い合わせで済ませる（limit / cursor / view は使わない）
+        results = await get_many.execute(_parse_ids(ids))
+        items = [memo for _, memo in results if memo is not None]
+        missing = [memo_id for memo_id, memo in results if memo is None]
+        return _json_response(dump_memo_multi_get(items, missing))
+    after = None
+    if cursor is not None:
+        try:
+            after = MemoCursor.decode(cursor)
+        except InvalidMemoCursorError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="カーソルが不正です",
+            ) from None
+    # 版を先に読んでからページを読む。間に更新が入っても ETag が古い側に倒れるだけで済む
+    version = await list_version.execute()
+    etag = memo_list_etag(version, cursor, limit, view)
+    if is_not_modified(etag, None, if_none_match, None):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    if view == "summary":
+        summaries = await list_summaries.execute(limit, cursor=after)
+        next_cursor = _encode_cursor(summaries.next_cursor)
+        body = dump_memo_summary_page(summaries.items, next_cursor)
+    else:
+        page = await list_page.execute(limit, cursor=after)
+        body = dump_memo_page(page.items, _encode_cursor(page.next_cursor))
+    return _json_response(body, headers={"ETag": etag})
+
+
+@router.get("/search", response_model=MemoSearchResponse)
+async def search_memos(
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    search: SearchMemosUseCase = Depends(get_search_memos_use_case),
+) -> MemoSearchResponse:
+    page = await search.execute(q, limit, offset=offset)
+    return MemoSearchResponse(
+        items=[_hit_to_response(h) for h in page.hits],
+        next_offset=page.next_offset,
+    )
+
+
+async def _export_lines(use_case: ExportMemosUseCase) -> AsyncIterator[bytes]:
+    """バッチ単位で NDJSON（1メモ1行）にエンコードして返す。"""
+    async for batch in use_case.execute(EXPORT_BATCH_SIZE):
+        yield dump_memo_lines(batch)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_memos(
+    export: ExportMemosUseCase = Depends(get_export_memos_use_case),
+) -> StreamingResponse:
+    # 件数に関わらずメモリ上に保持するのは1バッチ分だけになる
+    return StreamingResponse(
+        _export_lines(export),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/changes", response_model=MemoChangesResponse)
+async def list_memo_changes(
+    since: Optional[str] = Query(
+        None, max_length=200, description="前回の next_token。省略すると全件を返す（初回の同期）"
+    ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    list_changes: ListMemoChangesUseCase = Depends(get_list_memo_changes_use_case),
+) -> Response:
+    # 一覧を全件取り直す代わりに、前回の同期以降に作成・更新・削除されたメモだけを返す
+    token = None
+    if since is not None:
+        try:
+            token = MemoSyncToken.decode(since)
+        except InvalidSyncTokenError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="同期トークンが不正です",
+            ) from None
+    changes = await list_changes.execute(limit, since=token)
+    return _json_response(
+        dump_memo_changes(
+            changes.changed, changes.deleted, changes.next_token.encode(), changes.has_more
+        )
+    )
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_memo_changes(
+    last_event_id: Optional[str] = Query(None, max_length=64),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID", max_length=64),
+    bus: Optional[MemoEventBus] = Depends(get_memo_event_bus),
+    settings: Settings = Depends(get_settings),
+) -> StreamingResponse:
+    # 一覧のポーリングの代わりに、作成・更新・削除を Server-Sent Events で受け取る。
+    # 再接続時はブラウザが送る Last-Event-ID（無ければクエリ）の続きから流す
+    if bus is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="変更通知は無効です")
+    subscription = bus.subscribe(last_event_id_header or last_event_id)
+    return StreamingResponse(
+        stream_memo_events(subscription, settings.memo_events_keepalive_seconds),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{memo_id}", response_model=MemoResponse)
 async def get_memo(
     memo_id: str,
-    use_cases: dict = Depends(_get_use_cases),
-) -> MemoResponse:
-    memo = await use_cases["get"].execute(memo_id)
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    get: GetMemoUseCase = Depends(get_memo_use_case),
+    version: GetMemoVersionUseCase = Depends(get_memo_version_use_case),
+) -> Response:
+    # 条件付き GET は updated_at だけを読んで判定し、変わっていなければ本文を読まずに 304 を返す
+    if if_none_match is not None or if_modified_since is not None:
+        updated_at = await version.execute(memo_id)
+        if updated_at is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="メモが見つかりません",
+            )
+        etag = memo_version_etag(memo_id, updated_at)
+        if is_not_modified(etag, updated_at, if_none_match, if_modified_since):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag, "Last-Modified": http_date(updated_at)},
+            )
+    memo = await get.execute(memo_id)
     if memo is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="メモが見つかりません",
         )
-    return _memo_to_response(memo)
+    return _json_response(
+        dump_memo(memo),
+        headers={"ETag": memo_etag(memo), "Last-Modified": http_date(memo.updated_at)},
+    )
 
 
 @router.patch("/{memo_id}", response_model=MemoResponse)
 async def update_memo(
     memo_id: str,
     body: MemoUpdateRequest,
-    use_cases: dict = Depends(_get_use_cases),
-) -> MemoResponse:
-    memo = await use_cases["update"].execute(
-        memo_id,
-        title=body.title,
-        content=body.content,
-    )
+    if_match: Optional[str] = Header(None),
+    update: UpdateMemoUseCase = Depends(get_update_memo_use_case),
+) -> Response:
+    # If-Match に ETag があれば、そのバージョンのときだけ更新する（"*" は存在確認のみ）
+    expected_updated_at = None
+    if if_match is not None and if_match.strip() != "*":
+        expected_updated_at = parse_memo_etag(if_match, memo_id)
+        if expected_updated_at is None:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="If-Match の ETag がこのメモのものではありません",
+            )
+    try:
+        memo = await update.execute(
+            memo_id,
+            title=body.title,
+            content=body.content,
+            expected_updated_at=expected_updated_at,
+        )
+    except MemoVersionConflictError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="メモが他の更新と競合しました",
+        ) from None
     if memo is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="メモが見つかりません",
         )
-    return _memo_to_response(memo)
+    return _json_response(dump_memo(memo), headers={"ETag": memo_etag(memo)})
 
 
 @router.delete("/{memo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_memo(
     memo_id: str,
-    use_cases: dict = Depends(_get_use_cases),
+    delete: DeleteMemoUseCase = Depends(get_delete_memo_use_case),
 ) -> None:
-    deleted = await use_cases["delete"].execute(memo_id)
+    deleted = await delete.execute(memo_id)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
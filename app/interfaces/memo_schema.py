@@ -13,6 +13,21 @@ class MemoCreateRequest(BaseModel):
     content: str = Field(..., max_length=100_000)
 
 
+MAX_BULK_ITEMS = 1000
+
+
+class MemoBulkCreateRequest(BaseModel):
+    """メモ一括作成リクエスト。"""
+
+    items: list[MemoCreateRequest] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class MemoBulkDeleteRequest(BaseModel):
+    """メモ一括削除リクエスト。"""
+
+    ids: list[str] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
 class MemoUpdateRequest(BaseModel):
     """メモ更新リクエスト。タイトル・本文は任意指定。"""
 
@@ -28,3 +43,90 @@ class MemoResponse(BaseModel):
     content: str
     created_at: datetime
     updated_at: datetime
+
+
+class MemoPageResponse(BaseModel):
+    """メモ一覧1ページ分のレスポンス。next_cursor を次回の cursor に渡すと続きを取得できる。"""
+
+    items: list[MemoResponse]
+    next_cursor: Optional[str]
+
+
+class MemoMultiGetResponse(BaseModel):
+    """複数 ID での取得（ids 指定）のレスポンス。
+
+    items は指定順（重複 ID は1つにまとめる）。存在しなかった ID は missing に入る。
+    """
+
+    items: list[MemoResponse]
+    missing: list[str]
+
+
+class MemoSummaryResponse(BaseModel):
+    """一覧の要約（view=summary）の1件分。本文の代わりに文字数と先頭部分を返す。"""
+
+    id: str
+    title: str
+    content_length: int
+    preview: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class MemoSummaryPageResponse(BaseModel):
+    """要約一覧1ページ分のレスポンス。"""
+
+    items: list[MemoSummaryResponse]
+    next_cursor: Optional[str]
+
+
+class MemoBulkCreateResponse(BaseModel):
+    """メモ一括作成のレスポンス。items はリクエストと同じ順。"""
+
+    items: list[MemoResponse]
+
+
+class MemoBulkDeleteResult(BaseModel):
+    """メモ一括削除の1件分の結果。"""
+
+    id: str
+    deleted: bool
+
+
+class MemoBulkDeleteResponse(BaseModel):
+    """メモ一括削除のレスポンス。results はリクエストと同じ順（重複 ID は1つにまとめる）。"""
+
+    results: list[MemoBulkDeleteResult]
+
+
+class MemoSearchHitResponse(MemoResponse):
+    """検索にヒットしたメモ1件。rank が大きいほど関連度が高い。"""
+
+    rank: float
+
+
+class MemoSearchResponse(BaseModel):
+    """全文検索結果1ページ分のレスポンス。next_offset を次回の offset に渡すと続きを取得できる。"""
+
+    items: list[MemoSearchHitResponse]
+    next_offset: Optional[int]
+
+
+class MemoTombstoneResponse(BaseModel):
+    """差分同期で返す、削除されたメモの記録。"""
+
+    id: str
+    deleted_at: datetime
+
+
+class MemoChangesResponse(BaseModel):
+    """差分同期1ページ分のレスポンス。
+
+    has_more なら next_token を since に渡してすぐ続きを取得する。無ければ next_token を保存し、
+    次回の同期で since に渡す。同じ変更が2回返ることがあるため、クライアントは ID で上書きする。
+    """
+
+    changed: list[MemoResponse]
+    deleted: list[MemoTombstoneResponse]
+    next_token: str
+    has_more: bool
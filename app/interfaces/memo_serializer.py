@@ -0,0 +1,122 @@
+"""メモのレスポンス JSON を直接生成する高速シリアライザ。
+
+ドメインの Memo（dataclass）を事前に組み立てた TypeAdapter でそのまま JSON にし、
+MemoResponse の生成と FastAPI による再検証・再エンコードを省く。
+出力の形は MemoResponse / MemoPageResponse / MemoSummaryPageResponse / MemoMultiGetResponse /
+MemoChangesResponse と同じ。
+変更イベント（SSE の data）も同じ日時の書式にそろえるため、ここで JSON にする。
+"""
+
+from collections.abc import Sequence
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+from app.domain.memo import Memo, MemoSummary
+from app.domain.memo_event import MemoEvent, MemoEventKind
+from app.domain.memo_sync import MemoTombstone
+
+
+class _MemoPageBody(TypedDict):
+    items: Sequence[Memo]
+    next_cursor: Optional[str]
+
+
+class _MemoSummaryPageBody(TypedDict):
+    items: Sequence[MemoSummary]
+    next_cursor: Optional[str]
+
+
+class _MemoListBody(TypedDict):
+    items: Sequence[Memo]
+
+
+class _MemoMultiGetBody(TypedDict):
+    items: Sequence[Memo]
+    missing: Sequence[str]
+
+
+class _MemoChangesBody(TypedDict):
+    changed: Sequence[Memo]
+    deleted: Sequence[MemoTombstone]
+    next_token: str
+    has_more: bool
+
+
+class _MemoEventBody(TypedDict):
+    id: str
+    kind: MemoEventKind
+    occurred_at: datetime
+
+
+class _Adapters:
+    """各レスポンスの TypeAdapter。組み立てに時間がかかるため、初めて使うときに作る。"""
+
+    def __init__(self) -> None:
+        self.memo = TypeAdapter(Memo)
+        self.page = TypeAdapter(_MemoPageBody)
+        self.summary_page = TypeAdapter(_MemoSummaryPageBody)
+        self.items = TypeAdapter(_MemoListBody)
+        self.multi_get = TypeAdapter(_MemoMultiGetBody)
+        self.changes = TypeAdapter(_MemoChangesBody)
+        self.event = TypeAdapter(_MemoEventBody)
+
+
+@lru_cache(maxsize=1)
+def _adapters() -> _Adapters:
+    return _Adapters()
+
+
+def prepare_serializers() -> None:
+    """TypeAdapter を組み立てておく。起動時の待ち時間（DB 接続など）の間に呼ぶ。"""
+    _adapters()
+
+
+def dump_memo(memo: Memo) -> bytes:
+    """メモ1件を MemoResponse と同じ形の JSON にする。"""
+    return _adapters().memo.dump_json(memo)
+
+
+def dump_memo_page(items: Sequence[Memo], next_cursor: Optional[str]) -> bytes:
+    """一覧1ページを MemoPageResponse と同じ形の JSON にする。"""
+    return _adapters().page.dump_json({"items": items, "next_cursor": next_cursor})
+
+
+def dump_memo_summary_page(items: Sequence[MemoSummary], next_cursor: Optional[str]) -> bytes:
+    """要約一覧1ページを MemoSummaryPageResponse と同じ形の JSON にする。"""
+    return _adapters().summary_page.dump_json({"items": items, "next_cursor": next_cursor})
+
+
+def dump_memo_items(items: Sequence[Memo]) -> bytes:
+    """メモの並びを {"items": [...]} の形の JSON にする。"""
+    return _adapters().items.dump_json({"items": items})
+
+
+def dump_memo_multi_get(items: Sequence[Memo], missing: Sequence[str]) -> bytes:
+    """複数 ID での取得結果を MemoMultiGetResponse と同じ形の JSON にする。"""
+    return _adapters().multi_get.dump_json({"items": items, "missing": missing})
+
+
+def dump_memo_changes(
+    changed: Sequence[Memo], deleted: Sequence[MemoTombstone], next_token: str, has_more: bool
+) -> bytes:
+    """差分同期1ページを MemoChangesResponse と同じ形の JSON にする。"""
+    return _adapters().changes.dump_json(
+        {"changed": changed, "deleted": deleted, "next_token": next_token, "has_more": has_more}
+    )
+
+
+def dump_memo_lines(memos: Sequence[Memo]) -> bytes:
+    """メモの並びを NDJSON（1メモ1行）にする。"""
+    adapter = _adapters().memo
+    return b"".join(adapter.dump_json(m) + b"\n" for m in memos)
+
+
+def dump_memo_event(event: MemoEvent) -> bytes:
+    """変更イベントを {"id", "kind", "occurred_at"} の形の JSON にする。"""
+    return _adapters().event.dump_json(
+        {"id": event.memo_id, "kind": event.kind, "occurred_at": event.occurred_at}
+    )
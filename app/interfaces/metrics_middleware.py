@@ -0,0 +1,102 @@
+"""ルートごとのレイテンシ・ステータス・処理中リクエスト数を記録する ASGI ミドルウェア。"""
+
+import time
+from collections.abc import Iterable
+
+from starlette.routing import BaseRoute, Route
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.metrics import CounterChild, GaugeChild, HistogramChild, MetricsRegistry
+
+# どのルートにも一致しなかったリクエストのラベル（パスをそのまま使うと種類が増え続けるため）
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class _RouteMetrics:
+    """メソッド×ルート1組分の計測先。ステータスごとのカウンタは初出時に作って保持する。"""
+
+    __slots__ = ("_requests", "_method", "_route", "duration", "statuses")
+
+    def __init__(self, metrics: "HttpMetrics", method: str, route: str) -> None:
+        self._requests = metrics.requests
+        self._method = method
+        self._route = route
+        self.duration: HistogramChild = metrics.duration.labels(method, route)
+        self.statuses: dict[int, CounterChild] = {}
+
+    def status(self, code: int) -> CounterChild:
+        child = self.statuses.get(code)
+        if child is None:
+            child = self.statuses[code] = self._requests.labels(
+                self._method, self._route, str(code)
+            )
+        return child
+
+
+class HttpMetrics:
+    """HTTP リクエストのメトリクス一式。"""
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.requests = registry.counter(
+            "http_requests_total",
+            "HTTP requests by method, route template and status code.",
+            ("method", "route", "status"),
+        )
+        self.duration = registry.histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by method and route template in seconds.",
+            ("method", "route"),
+        )
+        self.in_flight: GaugeChild = registry.gauge(
+            "http_requests_in_flight", "HTTP requests currently being processed."
+        ).labels()
+        self._routes: dict[tuple[str, str], _RouteMetrics] = {}
+
+    def for_route(self, method: str, route: str) -> _RouteMetrics:
+        key = (method, route)
+        found = self._routes.get(key)
+        if found is None:
+            found = self._routes[key] = _RouteMetrics(self, method, route)
+        return found
+
+    def preallocate(self, routes: Iterable[BaseRoute]) -> None:
+        """アプリのルートに対応する計測先を先に作っておく。"""
+        for route in routes:
+            if isinstance(route, Route):
+                for method in route.methods or ():
+                    self.for_route(method, route.path)
+
+
+class MetricsMiddleware:
+    """リクエストごとに、一致したルートのテンプレート（/memos/{memo_id} など）で記録する。"""
+
+    def __init__(self, app: ASGIApp, metrics: HttpMetrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = self.metrics.in_flight
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            # ルーティングで scope["route"] が設定される（一致しなければ無い）
+            route = scope.get("route")
+            path = route.path if route is not None else UNMATCHED_ROUTE
+            route_metrics = self.metrics.for_route(scope["method"], path)
+            route_metrics.duration.observe(elapsed)
+            route_metrics.status(status_code).inc()
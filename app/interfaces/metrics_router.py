@@ -0,0 +1,19 @@
+"""メトリクスを Prometheus テキスト形式で返すルーター。"""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.deps import get_metrics_registry
+from app.infrastructure.metrics import MetricsRegistry
+
+router = APIRouter(tags=["ops"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(
+    registry: MetricsRegistry = Depends(get_metrics_registry),
+) -> PlainTextResponse:
+    """HTTP とリポジトリのメトリクスを返す。"""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
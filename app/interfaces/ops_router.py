@@ -0,0 +1,42 @@
+"""運用向けのルーター。接続プールの状態など、アプリ内部の状態を返す。"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel
+
+from app.deps import get_pool_monitor
+from app.infrastructure.prisma_client import PrismaPoolMonitor
+
+router = APIRouter(prefix="/ops", tags=["ops"])
+
+
+class PoolStatsResponse(BaseModel):
+    """接続プールの状態。"""
+
+    connection_limit: Optional[int]
+    open: int
+    busy: int
+    idle: int
+    queries_active: int
+    queries_waiting: int
+    saturation: Optional[float]
+
+
+@router.get("/pool", response_model=PoolStatsResponse)
+async def get_pool_stats(
+    monitor: Optional[PrismaPoolMonitor] = Depends(get_pool_monitor),
+) -> PoolStatsResponse:
+    """接続プールの使用状況（使用中・待ち行列・飽和度）を返す。DB を使わない構成では 404。"""
+    if monitor is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No connection pool")
+    stats = await monitor.snapshot()
+    return PoolStatsResponse(
+        connection_limit=stats.connection_limit,
+        open=stats.open,
+        busy=stats.busy,
+        idle=stats.idle,
+        queries_active=stats.queries_active,
+        queries_waiting=stats.queries_waiting,
+        saturation=stats.saturation,
+    )
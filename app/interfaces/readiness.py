@@ -0,0 +1,38 @@
+"""起動完了までの間、準備完了（readiness）を保留するためのゲート。"""
+
+import time
+from typing import Callable, Optional
+
+
+class ReadinessGate:
+    """起動処理（DB 接続・ウォームアップ）が終わったかどうかと、その所要時間を持つ。
+
+    lifespan の起動処理の最後に mark_ready、終了処理の最初に mark_draining を呼ぶ。
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._started_at = clock()
+        self._ready_at: Optional[float] = None
+        self._draining = False
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready_at is not None and not self._draining
+
+    @property
+    def startup_seconds(self) -> Optional[float]:
+        """起動処理にかかった秒数。起動中は None。"""
+        if self._ready_at is None:
+            return None
+        return self._ready_at - self._started_at
+
+    def mark_ready(self) -> None:
+        """起動処理が終わったことを記録する。"""
+        if self._ready_at is None:
+            self._ready_at = self._clock()
+        self._draining = False
+
+    def mark_draining(self) -> None:
+        """終了処理に入ったことを記録する。以降は準備未完了として扱う。"""
+        self._draining = True
@@ -1,29 +1,277 @@
 """FastAPI エントリーポイント。"""
 
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from typing import Optional
 
-import uvicorn
 from fastapi import FastAPI
 
+from app.container import Container
+from app.infrastructure.batching_memo_repository import BatchingMemoRepository
+from app.infrastructure.cached_memo_repository import CachedMemoRepository
+from app.infrastructure.coalescing_memo_repository import CoalescingMemoRepository
+from app.infrastructure.create_batching_memo_repository import CreateBatchingMemoRepository
+from app.infrastructure.in_memory_memo_repository import InMemoryMemoRepository
+from app.infrastructure.instrumented_memo_repository import InstrumentedMemoRepository
+from app.infrastructure.memo_cache import InMemoryLRUCache
+from app.infrastructure.memo_event_bus import MemoEventBus
+from app.infrastructure.metrics import MetricsRegistry
+from app.infrastructure.pg_notify_bridge import PgNotifyBridge, asyncpg_dsn
+from app.infrastructure.prisma_client import PrismaPoolMonitor, create_prisma, warm_up
+from app.infrastructure.prisma_memo_repository import PrismaMemoRepository
+from app.interfaces.admission import (
+    AdmissionMetrics,
+    AdmissionMiddleware,
+    ConcurrencyLimiter,
+    RateLimiter,
+)
+from app.interfaces.compression import CompressionMiddleware
+from app.interfaces.health_router import router as health_router
 from app.interfaces.memo_router import router as memo_router
-from prisma import Prisma
+from app.interfaces.memo_serializer import prepare_serializers
+from app.interfaces.metrics_middleware import HttpMetrics, MetricsMiddleware
+from app.interfaces.metrics_router import router as metrics_router
+from app.interfaces.ops_router import router as ops_router
+from app.interfaces.readiness import ReadinessGate
+from app.settings import Settings, load_settings
+from app.startup_profile import StartupProfile, process_uptime_seconds
+from app.usecases.memo_repository import MemoRepository
+
+logger = logging.getLogger(__name__)
+
+startup = StartupProfile()
+# ここまでに読み込んだモジュールの分（インタプリタの起動を含む）
+_uptime = process_uptime_seconds()
+if _uptime is not None:
+    startup.record("imports", _uptime)
+
+settings = load_settings()
+
+# 保存先を開けなかったときに再試行するまでの最大間隔
+_MAX_OPEN_RETRY_SECONDS = 10.0
+
+
+def _build_memo_repository(
+    base: MemoRepository,
+    settings: Settings,
+    registry: Optional[MetricsRegistry],
+    stack: Optional[AsyncExitStack] = None,
+) -> MemoRepository:
+    """設定に応じてリポジトリを組み立てる。計測・一括化・相乗り・キャッシュ有効時は base を包む。
+
+    計測は base の直上に挟み、キャッシュに当たった呼び出しや相乗りした読み取りは
+    DB の計測に含めない。一括化と相乗りはキャッシュの内側に置き、キャッシュミスをまとめる。
+    作成の一括化を有効にした場合、書き込み待ちを終了時に書き込む処理を stack に積む。
+    """
+    repo = base
+    if registry is not None:
+        repo = InstrumentedMemoRepository(repo, registry)
+    if settings.memo_create_batching_enabled:
+        repo = CreateBatchingMemoRepository(
+            repo,
+            window_seconds=settings.memo_create_batch_window_seconds,
+            max_batch_size=settings.memo_create_batch_max_size,
+            max_pending=settings.memo_create_max_pending,
+        )
+        if stack is not None:
+            # base の後始末（切断など）より先に走るよう、後から積む
+            stack.push_async_callback(repo.close)
+    if settings.memo_batching_enabled:
+        repo = BatchingMemoRepository(
+            repo,
+            window_seconds=settings.memo_batch_window_seconds,
+            max_batch_size=settings.memo_batch_max_size,
+        )
+    if settings.memo_coalescing_enabled:
+        repo = CoalescingMemoRepository(repo, registry)
+    if settings.memo_cache_enabled:
+        repo = CachedMemoRepository(
+            repo,
+            InMemoryLRUCache(max_entries=settings.memo_cache_max_entries),
+            ttl_seconds=settings.memo_cache_ttl_seconds,
+            negative_ttl_seconds=settings.memo_cache_negative_ttl_seconds,
+        )
+    return repo
+
+
+async def _open_prisma(app: FastAPI, stack: AsyncExitStack) -> MemoRepository:
+    """Prisma に接続してプールを温める。切断は stack に積む。"""
+    db = create_prisma(settings)
+    with startup.phase("prisma_connect"):
+        connecting = asyncio.ensure_future(db.connect())
+        # クエリエンジンのプロセスが立ち上がるのを待つ間に、レスポンスの組み立てを用意する
+        await asyncio.sleep(0)
+        with startup.phase("serializers"):
+            prepare_serializers()
+        await connecting
+    stack.push_async_callback(db.disconnect)
+    # 最初のリクエストより前に接続を張っておき、コールドスタート直後の遅延を避ける
+    with startup.phase("warm_up"):
+        await warm_up(db, settings.db_warm_up_connections)
+    app.state.db = db
+    app.state.pool_monitor = PrismaPoolMonitor(db, settings.db_connection_limit)
+    bus = app.state.memo_events
+    if bus is not None and settings.memo_events_pg_notify:
+        await _start_pg_notify(bus, stack)
+    return PrismaMemoRepository(db)
+
+
+async def _start_pg_notify(bus: MemoEventBus, stack: AsyncExitStack) -> None:
+    """他のマシンと変更イベントを共有する LISTEN / NOTIFY を始める。止める処理は stack に積む。"""
+    url = settings.memo_events_database_url or settings.database_url
+    if url is None:
+        raise RuntimeError("MEMO_EVENTS_PG_NOTIFY requires DATABASE_URL")
+    bridge = PgNotifyBridge(bus, asyncpg_dsn(url), channel=settings.memo_events_channel)
+    with startup.phase("pg_listen"):
+        await bridge.start()
+    stack.push_async_callback(bridge.close)
+
+
+async def _open_in_memory(app: FastAPI, stack: AsyncExitStack) -> MemoRepository:
+    """インメモリのリポジトリをスナップショットとログから復元する。終了時の保存は stack に積む。"""
+    repo = InMemoryMemoRepository(
+        data_dir=settings.memory_data_dir,
+        snapshot_every=settings.memory_snapshot_every,
+        fsync=settings.memory_fsync,
+        compress_min_bytes=settings.memory_compress_min_bytes,
+    )
+    with startup.phase("memory_load"):
+        await repo.load()
+    stack.push_async_callback(repo.close)
+    with startup.phase("serializers"):
+        prepare_serializers()
+    app.state.db = None
+    app.state.pool_monitor = None
+    return repo
+
+
+async def _open_backend(app: FastAPI, stack: AsyncExitStack) -> None:
+    """保存先を開き、リポジトリとユースケースを組み立てて準備完了にする。"""
+    if settings.memo_repository_backend == "memory":
+        base = await _open_in_memory(app, stack)
+    else:
+        base = await _open_prisma(app, stack)
+    repo = _build_memo_repository(base, settings, app.state.metrics_registry, stack)
+    app.state.container = Container.build(repo, app.state.memo_events)
+    app.state.readiness.mark_ready()
+    if settings.startup_profile:
+        startup.log()
+
+
+async def _open_backend_until_ready(app: FastAPI, stack: AsyncExitStack) -> None:
+    """保存先を開けるまで間隔を空けて再試行する。開いたものの後始末は stack に積む。"""
+    delay = 1.0
+    while True:
+        attempt = AsyncExitStack()
+        try:
+            await _open_backend(app, attempt)
+        except Exception:
+            await attempt.aclose()
+            logger.exception("failed to open the memo store; retrying in %.0fs", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _MAX_OPEN_RETRY_SECONDS)
+            continue
+        stack.push_async_callback(attempt.aclose)
+        return
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """起動時に Prisma に接続、終了時に切断する。"""
-    db = Prisma()
-    await db.connect()
-    app.state.db = db
-    try:
-        yield
-    finally:
-        await db.disconnect()
+    """保存先（Prisma またはインメモリ）を開いてリポジトリを組み立てる。終了時に閉じる。
+
+    startup_lazy_connect なら保存先を開くのを待たずに待ち受けを始め、接続は裏で進める
+    （コールドスタートでは DB 接続とソケットの待ち受け開始が重なる）。開くまでの間、
+    /readyz は 503 を返し、リポジトリを使うリクエストは get_container で待つ。
+    """
+    gate: ReadinessGate = app.state.readiness
+    async with AsyncExitStack() as stack:
+        if settings.startup_lazy_connect:
+            app.state.opening = asyncio.ensure_future(_open_backend_until_ready(app, stack))
+        else:
+            await _open_backend(app, stack)
+        try:
+            yield
+        finally:
+            gate.mark_draining()
+            opening = app.state.opening
+            if opening is not None:
+                opening.cancel()
+                with suppress(asyncio.CancelledError):
+                    await opening
+                app.state.opening = None
+
 
+with startup.phase("app"):
+    app = FastAPI(lifespan=lifespan)
+    app.state.settings = settings
+    app.state.startup = startup
+    app.state.readiness = ReadinessGate()
+    app.state.metrics_registry = MetricsRegistry() if settings.metrics_enabled else None
+    # 保存先を開く前から購読を受け付けられるよう、変更イベントの配送はここで作る
+    app.state.memo_events = (
+        MemoEventBus(
+            buffer_size=settings.memo_events_buffer_size,
+            queue_size=settings.memo_events_queue_size,
+        )
+        if settings.memo_events_enabled
+        else None
+    )
+    # 保存先を開くまでの値（lifespan で差し替える）
+    app.state.opening = None
+    app.state.container = None
+    app.state.db = None
+    app.state.pool_monitor = None
 
-app = FastAPI(lifespan=lifespan)
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.compression_gzip_level,
+            brotli_quality=settings.compression_brotli_quality,
+        )
 
-app.include_router(memo_router)
+    # 圧縮より外側に置き、断るリクエストの分は圧縮もしない
+    if settings.rate_limit_per_second is not None or settings.admission_max_concurrency is not None:
+        app.add_middleware(
+            AdmissionMiddleware,
+            rate_limiter=(
+                RateLimiter(
+                    settings.rate_limit_per_second,
+                    settings.rate_limit_burst,
+                    max_keys=settings.rate_limit_max_clients,
+                )
+                if settings.rate_limit_per_second is not None
+                else None
+            ),
+            limiter=(
+                ConcurrencyLimiter(
+                    settings.admission_max_concurrency,
+                    max_queue=settings.admission_max_queue,
+                    queue_timeout_seconds=settings.admission_queue_timeout_seconds,
+                )
+                if settings.admission_max_concurrency is not None
+                else None
+            ),
+            metrics=(
+                AdmissionMetrics(app.state.metrics_registry)
+                if app.state.metrics_registry is not None
+                else None
+            ),
+            key_header=settings.rate_limit_key_header,
+        )
+
+with startup.phase("routers"):
+    app.include_router(health_router)
+    app.include_router(memo_router)
+    app.include_router(ops_router)
+
+    if app.state.metrics_registry is not None:
+        app.include_router(metrics_router)
+        http_metrics = HttpMetrics(app.state.metrics_registry)
+        http_metrics.preallocate(app.routes)
+        # 最後に追加したミドルウェアが一番外側になるので、圧縮の時間も含めて計測する
+        app.add_middleware(MetricsMiddleware, metrics=http_metrics)
 
 
 @app.get("/")
@@ -32,4 +280,7 @@ def read_root() -> dict[str, str]:
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    import uvicorn
+
+    # 開発用（変更を検知して再起動する）。本番は python -m app.server で起動する
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
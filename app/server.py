@@ -0,0 +1,280 @@
+"""本番用のサーバー起動。`python -m app.server` で起動する。
+
+CPU 数とメモリからワーカー数を決め、親プロセスでアプリを読み込んでから fork する。
+読み込み済みのモジュールはコピーオンライトで共有されるため、ワーカーを増やしても
+メモリは1ワーカー分ずつしか増えない。DB 接続（Prisma のクエリエンジン）は各ワーカーの
+lifespan で張るので、プールはワーカーごとに持つ。
+
+親は SIGINT / SIGTERM を受けるとワーカーに SIGTERM を送り、新しい接続の受け付けを止めて
+処理中のリクエストを捌き切るのを待つ（Fly.io の停止は既定で SIGINT）。
+"""
+
+import gc
+import importlib.util
+import logging
+import math
+import os
+import signal
+import socket
+import sys
+import time
+from dataclasses import dataclass
+from types import FrameType
+from typing import Optional
+
+import uvicorn
+
+from app.settings import Settings, load_settings
+
+logger = logging.getLogger("app.server")
+
+# メモリのうちワーカーに割り当てる割合（残りは親プロセス・クエリエンジン以外の余裕）
+_MEMORY_HEADROOM = 0.75
+# 落ちたワーカーを立て直すまでの間隔（起動直後に落ち続ける場合に空回りしないように）
+_RESTART_DELAY_SECONDS = 1.0
+# 猶予時間を過ぎても終わらないワーカーを SIGKILL するまでの追加の待ち時間
+_KILL_MARGIN_SECONDS = 5
+
+
+@dataclass(frozen=True)
+class ServerPlan:
+    """起動するワーカー数と、ワーカー1つあたりの DB 接続数の上限（None なら設定どおり）。
+
+    memo_events_pg_notify は、変更通知をワーカー間で LISTEN / NOTIFY により共有するかどうか。
+    """
+
+    workers: int
+    db_connection_limit: Optional[int]
+    memo_events_pg_notify: bool = False
+
+
+def _read_first_line(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+
+def available_cpus() -> int:
+    """このプロセスが使える CPU 数。cgroup v2 のクォータがあればそれで頭打ちにする。"""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+    cpu_max = _read_first_line("/sys/fs/cgroup/cpu.max")
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            count = min(count, math.ceil(int(quota) / int(period)))
+    return max(1, count)
+
+
+def available_memory_mb() -> Optional[int]:
+    """このプロセスが使えるメモリ（MB）。cgroup v2 の上限があればそれで頭打ちにする。"""
+    limits: list[int] = []
+    memory_max = _read_first_line("/sys/fs/cgroup/memory.max")
+    if memory_max and memory_max != "max":
+        limits.append(int(memory_max))
+    try:
+        limits.append(os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE"))
+    except (AttributeError, ValueError, OSError):
+        pass
+    if not limits:
+        return None
+    return min(limits) // (1024 * 1024)
+
+
+def _shares_memo_events(settings: Settings, workers: int, pubsub_installed: bool) -> bool:
+    """変更通知を LISTEN / NOTIFY でワーカー間（マシン間）に共有するかどうか。"""
+    if settings.memo_events_pg_notify:
+        return True
+    return settings.memo_events_enabled and workers > 1 and pubsub_installed
+
+
+def plan_server(
+    settings: Settings,
+    *,
+    cpus: int,
+    memory_mb: Optional[int],
+    pubsub_installed: bool = True,
+) -> ServerPlan:
+    """設定とマシンの大きさからワーカー数と DB 接続数の配分を決める。
+
+    WEB_CONCURRENCY があればそれに従う。無ければ CPU 数を、メモリに収まる数で頭打ちにする。
+    DB_TOTAL_CONNECTION_LIMIT があれば、全ワーカーの接続数の合計がそれを超えないよう割り振る
+    （LISTEN / NOTIFY で共有する場合は、ワーカーごとの LISTEN の1本も合計に数える）。
+    memory バックエンドはプロセスごとに別のデータを持つため、常に1ワーカーにする。
+    変更通知の bus はプロセスごとにあるため、変更通知が有効で2ワーカー以上なら、
+    別のワーカーで起きた変更も届くよう LISTEN / NOTIFY での共有を有効にする
+    （asyncpg が入っていない場合を除く）。
+    """
+    if settings.memo_repository_backend == "memory":
+        workers = 1
+    elif settings.web_concurrency is not None:
+        workers = settings.web_concurrency
+    else:
+        workers = cpus
+        if memory_mb is not None:
+            by_memory = int(memory_mb * _MEMORY_HEADROOM) // settings.worker_memory_mb
+            workers = min(workers, by_memory)
+    workers = max(1, workers)
+    db_connection_limit = settings.db_connection_limit
+    total = settings.db_total_connection_limit
+    pg_notify = _shares_memo_events(settings, workers, pubsub_installed)
+    if total is not None:
+        # 各ワーカーが LISTEN の分を除いて少なくとも1本は持てるよう、ワーカー数を頭打ちにする
+        workers = max(1, min(workers, total // 2 if pg_notify else total))
+        pg_notify = _shares_memo_events(settings, workers, pubsub_installed)
+        db_connection_limit = max(1, total // workers - (1 if pg_notify else 0))
+    return ServerPlan(
+        workers=workers,
+        db_connection_limit=db_connection_limit,
+        memo_events_pg_notify=pg_notify,
+    )
+
+
+def _serve_worker(app: object, sock: socket.socket, settings: Settings) -> None:
+    """fork 後のワーカーで uvicorn を動かす。戻ったら終了する。"""
+    # 親のシグナルハンドラを引き継がないようにし、uvicorn 自身の処理に任せる
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    config = uvicorn.Config(
+        app,
+        # uvloop / httptools が入っていれば使い、無ければ asyncio / h11 にする
+        loop="auto",
+        http="auto",
+        lifespan="on",
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+        timeout_graceful_shutdown=settings.server_graceful_timeout_seconds,
+    )
+    _Server(config).run(sockets=[sock])
+
+
+class _Server(uvicorn.Server):
+    """停止時、処理中のリクエストを待つ前に変更通知のストリームを終える。
+
+    ストリームは自分からは終わらないため、そのままでは猶予時間いっぱい停止が待たされる。
+    クライアントは reset を受け取り、別のマシン（か起動し直したマシン）に再接続する。
+    """
+
+    async def shutdown(self, sockets: Optional[list[socket.socket]] = None) -> None:
+        events = getattr(self.config.app.state, "memo_events", None)
+        if events is not None:
+            events.close()
+        await super().shutdown(sockets=sockets)
+
+
+class _Supervisor:
+    """ワーカーを fork して見張る。落ちたものは立て直し、停止シグナルで全員を止める。"""
+
+    def __init__(
+        self, app: object, sock: socket.socket, plan: ServerPlan, settings: Settings
+    ) -> None:
+        self._app = app
+        self._sock = sock
+        self._plan = plan
+        self._settings = settings
+        self._children: set[int] = set()
+        self._stopping = False
+
+    def run(self) -> int:
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGALRM, self._kill)
+        for _ in range(self._plan.workers):
+            self._spawn()
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            self._children.discard(pid)
+            if self._stopping:
+                continue
+            logger.warning("worker %d exited (status %d); restarting", pid, status)
+            time.sleep(_RESTART_DELAY_SECONDS)
+            if not self._stopping:
+                self._spawn()
+        return 0
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _serve_worker(self._app, self._sock, self._settings)
+            except BaseException:
+                logger.exception("worker crashed")
+                code = 1
+            finally:
+                # 親の後始末（atexit など）をワーカーで走らせない
+                os._exit(code)
+        self._children.add(pid)
+
+    def _stop(self, signum: int, frame: Optional[FrameType]) -> None:
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.info("received %s; draining %d worker(s)", signal.Signals(signum).name, len(self))
+        for pid in self._children:
+            os.kill(pid, signal.SIGTERM)
+        # 猶予時間を過ぎても残っているワーカーは SIGALRM で強制終了する
+        signal.alarm(
+            math.ceil(self._settings.server_graceful_timeout_seconds) + _KILL_MARGIN_SECONDS
+        )
+
+    def _kill(self, signum: int, frame: Optional[FrameType]) -> None:
+        for pid in self._children:
+            logger.warning("worker %d did not stop in time; killing", pid)
+            os.kill(pid, signal.SIGKILL)
+
+    def __len__(self) -> int:
+        return len(self._children)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    settings = load_settings()
+    pubsub_installed = importlib.util.find_spec("asyncpg") is not None
+    plan = plan_server(
+        settings,
+        cpus=available_cpus(),
+        memory_mb=available_memory_mb(),
+        pubsub_installed=pubsub_installed,
+    )
+    if plan.db_connection_limit is not None:
+        # app.main は読み込み時に設定を読むので、ワーカーごとの上限は環境変数で先に渡す
+        os.environ["DB_CONNECTION_LIMIT"] = str(plan.db_connection_limit)
+    if plan.memo_events_pg_notify and not settings.memo_events_pg_notify:
+        logger.info("enabling MEMO_EVENTS_PG_NOTIFY to share memo events across workers")
+        os.environ["MEMO_EVENTS_PG_NOTIFY"] = "true"
+    elif settings.memo_events_enabled and plan.workers > 1 and not plan.memo_events_pg_notify:
+        # ワーカーごとの bus だけでは、別のワーカーで起きた変更が購読者に届かない
+        logger.warning(
+            "asyncpg is not installed, so memo events are not shared across %d workers "
+            "(subscribers only see changes made through their own worker); "
+            "run `uv sync --extra pubsub` or set WEB_CONCURRENCY=1",
+            plan.workers,
+        )
+    # fork の前にアプリを読み込み、ワーカーからはコピーオンライトで共有する
+    from app.main import app
+
+    sock = socket.create_server(
+        (settings.server_host, settings.server_port), backlog=settings.server_backlog
+    )
+    # 読み込み済みのオブジェクトを GC の対象外にし、ワーカーでの GC がページを書き換えないようにする
+    gc.freeze()
+    logger.info(
+        "listening on %s:%d with %d worker(s), db_connection_limit=%s per worker",
+        settings.server_host,
+        settings.server_port,
+        plan.workers,
+        plan.db_connection_limit,
+    )
+    sys.exit(_Supervisor(app, sock, plan, settings).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""アプリケーション設定。環境変数から読み込む。"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def _env_choice(name: str, default: str, choices: tuple[str, ...]) -> str:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    value = value.strip().lower()
+    if value not in choices:
+        raise ValueError(f"{name} must be one of {choices}, got {value!r}")
+    return value
+
+
+def _env_optional_int(name: str) -> Optional[int]:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return None
+    return int(value)
+
+
+def _env_optional_float(name: str) -> Optional[float]:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return None
+    return float(value)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return float(value)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """アプリケーション設定。"""
+
+    # メモの保存先。"prisma"（PostgreSQL）か "memory"（プロセス内。memory_data_dir に永続化）
+    memo_repository_backend: str = "prisma"
+    memory_data_dir: Optional[str] = None
+    memory_snapshot_every: int = 1000
+    memory_fsync: bool = False
+    # memory のとき、UTF-8 でこのバイト数以上の本文を zlib で圧縮して持つ。0 なら圧縮しない。
+    # 既定の 16KiB 以上なら保持するメモリが約半分になり、展開は1件あたり 0.1ms 程度
+    # （benchmarks.content_storage）
+    memory_compress_min_bytes: int = 16384
+
+    # メモ1件取得のキャッシュ（既定では無効）
+    memo_cache_enabled: bool = False
+    memo_cache_ttl_seconds: float = 30.0
+    memo_cache_negative_ttl_seconds: float = 5.0
+    memo_cache_max_entries: int = 1024
+
+    # 同時に来た同じ読み取り（1件取得・一覧ページ）を1回の問い合わせにまとめる
+    memo_coalescing_enabled: bool = True
+
+    # 並行して来た別々の ID の1件取得を1回の IN 問い合わせにまとめる。
+    # 窓が 0 ならイベントループの1周分だけ集める
+    memo_batching_enabled: bool = True
+    memo_batch_window_seconds: float = 0.0
+    memo_batch_max_size: int = 100
+
+    # 並行して来たメモ作成を期限（秒）か件数で区切り、1回の複数行 INSERT にまとめる（既定は無効）
+    # 書き込み待ちが max_pending 件に達したら、新しい作成は空くまで待たせる
+    memo_create_batching_enabled: bool = False
+    memo_create_batch_window_seconds: float = 0.002
+    memo_create_batch_max_size: int = 100
+    memo_create_max_pending: int = 1000
+
+    # 変更通知（GET /memos/stream の Server-Sent Events）。直近 buffer_size 件を再接続時の
+    # 続きのために残し、購読者ごとに queue_size 件まで溜める（あふれたらリセットを送って切る）
+    memo_events_enabled: bool = True
+    memo_events_buffer_size: int = 1000
+    memo_events_queue_size: int = 100
+    memo_events_keepalive_seconds: float = 15.0
+    # 複数のマシンでイベントを共有する Postgres の LISTEN / NOTIFY（asyncpg が必要。既定は無効）。
+    # database_url が PgBouncer（トランザクションモード）経由なら、直接つながる URL を指定する
+    memo_events_pg_notify: bool = False
+    memo_events_channel: str = "memo_events"
+    memo_events_database_url: Optional[str] = None
+
+    # レスポンス圧縮（brotli は任意依存。入っていなければ gzip のみ）
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1000
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+
+    # /metrics（Prometheus 形式）と、HTTP・リポジトリ呼び出しの計測
+    metrics_enabled: bool = True
+
+    # 受け付け制御（既定では無効）。rate_limit_per_second はクライアントごとの
+    # トークンバケットで、超えたら 429。admission_max_concurrency は全体の同時処理数で、
+    # 待てるのは admission_max_queue 件・admission_queue_timeout_seconds 秒まで（超えたら 503）
+    rate_limit_per_second: Optional[float] = None
+    rate_limit_burst: int = 20
+    # クライアントを見分けるヘッダー（API キーなど）。None なら接続元のアドレス
+    rate_limit_key_header: Optional[str] = None
+    rate_limit_max_clients: int = 10000
+    admission_max_concurrency: Optional[int] = None
+    admission_max_queue: int = 100
+    admission_queue_timeout_seconds: float = 1.0
+
+    # データベース接続。None の項目は DATABASE_URL の指定（無ければエンジンの既定値）に従う
+    database_url: Optional[str] = None
+    db_connection_limit: Optional[int] = None
+    db_pool_timeout_seconds: Optional[int] = None
+    db_connect_timeout_seconds: Optional[int] = None
+    db_socket_timeout_seconds: Optional[int] = None
+    db_statement_cache_size: Optional[int] = None
+    db_pgbouncer: bool = False
+    # クエリエンジン起動の待ち時間と、1クエリあたりの上限時間
+    db_engine_connect_timeout_seconds: float = 10.0
+    db_query_timeout_seconds: Optional[float] = None
+    # 起動時に張っておく接続数（0 ならウォームアップしない）
+    db_warm_up_connections: int = 1
+    # /readyz で DB に投げる SELECT 1 の待ち時間の上限
+    readiness_probe_timeout_seconds: float = 2.0
+
+    # 起動。lazy_connect なら保存先を開くのを待たずに待ち受けを始め、リクエストは開くまで待たせる
+    startup_lazy_connect: bool = True
+    startup_wait_timeout_seconds: float = 10.0
+    # 起動のフェーズごとの所要時間をログに出す（/readyz には常に出す）
+    startup_profile: bool = False
+
+    # 本番用サーバー（python -m app.server）。web_concurrency が None なら CPU とメモリから決める
+    server_host: str = "0.0.0.0"
+    server_port: int = 8080
+    server_backlog: int = 2048
+    server_graceful_timeout_seconds: float = 25.0
+    web_concurrency: Optional[int] = None
+    # ワーカー1つが使う見込みのメモリ（MB）。ワーカー数をメモリに収めるのに使う
+    worker_memory_mb: int = 128
+    # 全ワーカーの DB 接続数の合計の上限。指定するとワーカーごとの DB_CONNECTION_LIMIT を割り振る
+    db_total_connection_limit: Optional[int] = None
+
+
+def load_settings() -> Settings:
+    """環境変数から設定を読み込む。未設定の項目は既定値を使う。"""
+    defaults = Settings()
+    return Settings(
+        memo_repository_backend=_env_choice(
+            "MEMO_REPOSITORY_BACKEND", defaults.memo_repository_backend, ("prisma", "memory")
+        ),
+        memory_data_dir=os.environ.get("MEMORY_DATA_DIR") or None,
+        memory_snapshot_every=_env_int("MEMORY_SNAPSHOT_EVERY", defaults.memory_snapshot_every),
+        memory_fsync=_env_bool("MEMORY_FSYNC", defaults.memory_fsync),
+        memory_compress_min_bytes=_env_int(
+            "MEMORY_COMPRESS_MIN_BYTES", defaults.memory_compress_min_bytes
+        ),
+        memo_cache_enabled=_env_bool("MEMO_CACHE_ENABLED", defaults.memo_cache_enabled),
+        memo_cache_ttl_seconds=_env_float(
+            "MEMO_CACHE_TTL_SECONDS", defaults.memo_cache_ttl_seconds
+        ),
+        memo_cache_negative_ttl_seconds=_env_float(
+            "MEMO_CACHE_NEGATIVE_TTL_SECONDS", defaults.memo_cache_negative_ttl_seconds
+        ),
+        memo_cache_max_entries=_env_int("MEMO_CACHE_MAX_ENTRIES", defaults.memo_cache_max_entries),
+        memo_coalescing_enabled=_env_bool(
+            "MEMO_COALESCING_ENABLED", defaults.memo_coalescing_enabled
+        ),
+        memo_batching_enabled=_env_bool("MEMO_BATCHING_ENABLED", defaults.memo_batching_enabled),
+        memo_batch_window_seconds=_env_float(
+            "MEMO_BATCH_WINDOW_SECONDS", defaults.memo_batch_window_seconds
+        ),
+        memo_batch_max_size=_env_int("MEMO_BATCH_MAX_SIZE", defaults.memo_batch_max_size),
+        memo_create_batching_enabled=_env_bool(
+            "MEMO_CREATE_BATCHING_ENABLED", defaults.memo_create_batching_enabled
+        ),
+        memo_create_batch_window_seconds=_env_float(
+            "MEMO_CREATE_BATCH_WINDOW_SECONDS", defaults.memo_create_batch_window_seconds
+        ),
+        memo_create_batch_max_size=_env_int(
+            "MEMO_CREATE_BATCH_MAX_SIZE", defaults.memo_create_batch_max_size
+        ),
+        memo_create_max_pending=_env_int(
+            "MEMO_CREATE_MAX_PENDING", defaults.memo_create_max_pending
+        ),
+        memo_events_enabled=_env_bool("MEMO_EVENTS_ENABLED", defaults.memo_events_enabled),
+        memo_events_buffer_size=_env_int(
+            "MEMO_EVENTS_BUFFER_SIZE", defaults.memo_events_buffer_size
+        ),
+        memo_events_queue_size=_env_int("MEMO_EVENTS_QUEUE_SIZE", defaults.memo_events_queue_size),
+        memo_events_keepalive_seconds=_env_float(
+            "MEMO_EVENTS_KEEPALIVE_SECONDS", defaults.memo_events_keepalive_seconds
+        ),
+        memo_events_pg_notify=_env_bool("MEMO_EVENTS_PG_NOTIFY", defaults.memo_events_pg_notify),
+        memo_events_channel=os.environ.get("MEMO_EVENTS_CHANNEL") or defaults.memo_events_channel,
+        memo_events_database_url=os.environ.get("MEMO_EVENTS_DATABASE_URL") or None,
+        compression_enabled=_env_bool("COMPRESSION_ENABLED", defaults.compression_enabled),
+        compression_minimum_size=_env_int(
+            "COMPRESSION_MINIMUM_SIZE", defaults.compression_minimum_size
+        ),
+        compression_gzip_level=_env_int("COMPRESSION_GZIP_LEVEL", defaults.compression_gzip_level),
+        compression_brotli_quality=_env_int(
+            "COMPRESSION_BROTLI_QUALITY", defaults.compression_brotli_quality
+        ),
+        metrics_enabled=_env_bool("METRICS_ENABLED", defaults.metrics_enabled),
+        rate_limit_per_second=_env_optional_float("RATE_LIMIT_PER_SECOND"),
+        rate_limit_burst=_env_int("RATE_LIMIT_BURST", defaults.rate_limit_burst),
+        rate_limit_key_header=os.environ.get("RATE_LIMIT_KEY_HEADER") or None,
+        rate_limit_max_clients=_env_int("RATE_LIMIT_MAX_CLIENTS", defaults.rate_limit_max_clients),
+        admission_max_concurrency=_env_optional_int("ADMISSION_MAX_CONCURRENCY"),
+        admission_max_queue=_env_int("ADMISSION_MAX_QUEUE", defaults.admission_max_queue),
+        admission_queue_timeout_seconds=_env_float(
+            "ADMISSION_QUEUE_TIMEOUT_SECONDS", defaults.admission_queue_timeout_seconds
+        ),
+        database_url=os.environ.get("DATABASE_URL") or None,
+        db_connection_limit=_env_optional_int("DB_CONNECTION_LIMIT"),
+        db_pool_timeout_seconds=_env_optional_int("DB_POOL_TIMEOUT_SECONDS"),
+        db_connect_timeout_seconds=_env_optional_int("DB_CONNECT_TIMEOUT_SECONDS"),
+        db_socket_timeout_seconds=_env_optional_int("DB_SOCKET_TIMEOUT_SECONDS"),
+        db_statement_cache_size=_env_optional_int("DB_STATEMENT_CACHE_SIZE"),
+        db_pgbouncer=_env_bool("DB_PGBOUNCER", defaults.db_pgbouncer),
+        db_engine_connect_timeout_seconds=_env_float(
+            "DB_ENGINE_CONNECT_TIMEOUT_SECONDS", defaults.db_engine_connect_timeout_seconds
+        ),
+        db_query_timeout_seconds=_env_optional_float("DB_QUERY_TIMEOUT_SECONDS"),
+        db_warm_up_connections=_env_int("DB_WARM_UP_CONNECTIONS", defaults.db_warm_up_connections),
+        readiness_probe_timeout_seconds=_env_float(
+            "READINESS_PROBE_TIMEOUT_SECONDS", defaults.readiness_probe_timeout_seconds
+        ),
+        startup_lazy_connect=_env_bool("STARTUP_LAZY_CONNECT", defaults.startup_lazy_connect),
+        startup_wait_timeout_seconds=_env_float(
+            "STARTUP_WAIT_TIMEOUT_SECONDS", defaults.startup_wait_timeout_seconds
+        ),
+        startup_profile=_env_bool("STARTUP_PROFILE", defaults.startup_profile),
+        server_host=os.environ.get("HOST") or defaults.server_host,
+        server_port=_env_int("PORT", defaults.server_port),
+        server_backlog=_env_int("SERVER_BACKLOG", defaults.server_backlog),
+        server_graceful_timeout_seconds=_env_float(
+            "SERVER_GRACEFUL_TIMEOUT_SECONDS", defaults.server_graceful_timeout_seconds
+        ),
+        web_concurrency=_env_optional_int("WEB_CONCURRENCY"),
+        worker_memory_mb=_env_int("WORKER_MEMORY_MB", defaults.worker_memory_mb),
+        db_total_connection_limit=_env_optional_int("DB_TOTAL_CONNECTION_LIMIT"),
+    )
@@ -0,0 +1,53 @@
+"""起動時間の計測。フェーズごとの所要時間を記録し、ログと /readyz に出す。"""
+
+import logging
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+logger = logging.getLogger("app.startup")
+
+
+def process_uptime_seconds() -> Optional[float]:
+    """このプロセスが起動してからの秒数。/proc が無い環境では None。"""
+    try:
+        with open("/proc/self/stat") as f:
+            stat = f.read()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    # 2番目の項目（コマンド名）は空白を含みうるので、最後の ")" より後ろを区切る。
+    # その先頭は3番目の項目なので、22番目の starttime（起動時刻。クロック数）は 19 番目になる
+    started_ticks = int(stat.rsplit(")", 1)[1].split()[19])
+    return max(0.0, uptime - started_ticks / os.sysconf("SC_CLK_TCK"))
+
+
+class StartupProfile:
+    """起動のフェーズごとの所要時間（秒）を、記録した順に持つ。同じ名前は合算する。"""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self.phases: dict[str, float] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """with ブロックの所要時間を name のフェーズとして記録する。"""
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.record(name, self._clock() - started)
+
+    def as_milliseconds(self) -> dict[str, float]:
+        return {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()}
+
+    def log(self) -> None:
+        """フェーズごとの所要時間を1行でログに出す。"""
+        summary = ", ".join(f"{name}={ms:.1f}ms" for name, ms in self.as_milliseconds().items())
+        logger.info("startup phases: %s", summary)
@@ -1,17 +1,37 @@
+from app.usecases.memo_event_publisher import MemoEventPublisher
 from app.usecases.memo_repository import MemoRepository
 from app.usecases.memo_use_cases import (
+    BulkCreateMemosUseCase,
+    BulkDeleteMemosUseCase,
     CreateMemoUseCase,
     DeleteMemoUseCase,
+    ExportMemosUseCase,
+    GetMemoCollectionVersionUseCase,
+    GetMemosUseCase,
     GetMemoUseCase,
+    GetMemoVersionUseCase,
+    ListMemoChangesUseCase,
+    ListMemoSummariesUseCase,
     ListMemosUseCase,
+    SearchMemosUseCase,
     UpdateMemoUseCase,
 )
 
 __all__ = [
     "MemoRepository",
+    "MemoEventPublisher",
     "CreateMemoUseCase",
     "ListMemosUseCase",
+    "ListMemoSummariesUseCase",
+    "ListMemoChangesUseCase",
+    "ExportMemosUseCase",
+    "SearchMemosUseCase",
     "GetMemoUseCase",
+    "GetMemosUseCase",
+    "GetMemoVersionUseCase",
+    "GetMemoCollectionVersionUseCase",
     "UpdateMemoUseCase",
     "DeleteMemoUseCase",
+    "BulkCreateMemosUseCase",
+    "BulkDeleteMemosUseCase",
 ]
@@ -0,0 +1,14 @@
+"""メモの変更イベントの発行先インターフェース。実装はインフラ層に依存する。"""
+
+from abc import ABC, abstractmethod
+
+from app.domain.memo_event import MemoEvent
+
+
+class MemoEventPublisher(ABC):
+    """作成・更新・削除のユースケースが、変更を購読者に知らせるために使う。"""
+
+    @abstractmethod
+    def publish(self, event: MemoEvent) -> None:
+        """イベントを発行する。待たずに戻る（購読者への配送は実装側で行う）。"""
+        ...
@@ -1,10 +1,14 @@
 """メモの永続化インターフェース。実装はインフラ層に依存する。"""
 
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 from typing import Optional
 
-from app.domain.memo import Memo
+from app.domain.memo import Memo, MemoDraft, MemoSummary
+from app.domain.memo_page import MemoCollectionVersion, MemoCursor
+from app.domain.memo_search import MemoSearchHit
+from app.domain.memo_sync import MemoChanges, MemoSyncToken
 
 
 class MemoRepository(ABC):
@@ -15,22 +19,100 @@ class MemoRepository(ABC):
         """メモを1件作成し、生成されたエンティティを返す。"""
         ...
 
+    @abstractmethod
+    async def create_many(self, drafts: Sequence[MemoDraft]) -> Sequence[Memo]:
+        """メモをまとめて1トランザクションで作成し、入力と同じ順で生成されたエンティティを返す。"""
+        ...
+
     @abstractmethod
     async def find_all(self) -> Sequence[Memo]:
         """全メモを作成日時の昇順で返す。"""
         ...
 
+    @abstractmethod
+    async def find_page(self, limit: int, after: Optional[MemoCursor] = None) -> Sequence[Memo]:
+        """(created_at, id) の昇順で after より後ろのメモを最大 limit 件返す。"""
+        ...
+
+    async def find_summary_page(
+        self, limit: int, after: Optional[MemoCursor] = None
+    ) -> Sequence[MemoSummary]:
+        """find_page と同じ範囲の要約を返す。本文を読まずに済む実装は上書きする。"""
+        return [MemoSummary.of(memo) for memo in await self.find_page(limit, after=after)]
+
+    async def iter_batches(self, batch_size: int) -> AsyncIterator[Sequence[Memo]]:
+        """全メモを (created_at, id) の昇順で batch_size 件ずつ返す非同期ジェネレータ。"""
+        # find_page をキーセットで辿るため、件数に関わらず保持するのは1バッチ分だけ
+        after: Optional[MemoCursor] = None
+        while True:
+            batch = await self.find_page(batch_size, after=after)
+            if batch:
+                yield batch
+            if len(batch) < batch_size:
+                return
+            after = MemoCursor.after(batch[-1])
+
     @abstractmethod
     async def find_by_id(self, memo_id: str) -> Optional[Memo]:
         """IDでメモを1件取得する。存在しなければ None。"""
         ...
 
+    async def find_by_ids(self, memo_ids: Sequence[str]) -> Sequence[Memo]:
+        """指定した ID のうち存在するメモを順不同で返す。まとめて読める実装は上書きする。"""
+        memos = [await self.find_by_id(memo_id) for memo_id in dict.fromkeys(memo_ids)]
+        return [memo for memo in memos if memo is not None]
+
+    @abstractmethod
+    async def find_version(self, memo_id: str) -> Optional[datetime]:
+        """IDでメモの updated_at だけを取得する（本文は読まない）。存在しなければ None。"""
+        ...
+
+    @abstractmethod
+    async def collection_version(self) -> MemoCollectionVersion:
+        """メモ全体の件数と最終更新日時を返す（本文は読まない）。"""
+        ...
+
+    @abstractmethod
+    async def find_changes(self, since: MemoSyncToken, limit: int) -> MemoChanges:
+        """since より後に作成・更新されたメモと削除の記録を、変更の古い順に最大 limit 件返す。
+
+        件数は作成・更新と削除の合計。変更の数に比例する手間で求め、メモ全体は読まない。
+        since が初回（is_initial）なら削除の記録は返さない。
+        """
+        ...
+
+    @abstractmethod
+    async def search(self, query: str, limit: int, offset: int = 0) -> Sequence[MemoSearchHit]:
+        """タイトル・本文を全文検索し、関連度の高い順に offset から最大 limit 件返す。"""
+        ...
+
     @abstractmethod
     async def update(self, memo: Memo) -> Memo:
         """メモを更新する。更新後のエンティティを返す。"""
         ...
 
+    @abstractmethod
+    async def patch(
+        self,
+        memo_id: str,
+        *,
+        title: Optional[str] = None,
+        content: Optional[str] = None,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Memo]:
+        """指定されたフィールドだけを1回の更新で書き換え、更新後のエンティティを返す。
+
+        存在しなければ None。expected_updated_at を指定した場合、現在の updated_at と
+        一致しなければ更新せず MemoVersionConflictError を送出する。
+        """
+        ...
+
     @abstractmethod
     async def delete_by_id(self, memo_id: str) -> bool:
         """IDでメモを1件削除する。削除した場合 True、存在しなければ False。"""
         ...
+
+    @abstractmethod
+    async def delete_many(self, memo_ids: Sequence[str]) -> set[str]:
+        """指定した ID のメモをまとめて削除し、実際に削除できた ID を返す。"""
+        ...
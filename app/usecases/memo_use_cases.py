@@ -1,30 +1,125 @@
 """メモのアプリケーションサービス（ユースケース）。リポジトリに依存する。"""
 
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 from typing import Optional
 
-from app.domain.memo import Memo
+from app.domain.memo import Memo, MemoDraft
+from app.domain.memo_event import MemoEvent
+from app.domain.memo_page import (
+    MemoCollectionVersion,
+    MemoCursor,
+    MemoPage,
+    MemoSummaryPage,
+)
+from app.domain.memo_search import MemoSearchPage
+from app.domain.memo_sync import MemoChanges, MemoSyncToken
+from app.usecases.memo_event_publisher import MemoEventPublisher
 from app.usecases.memo_repository import MemoRepository
 
 
 class CreateMemoUseCase:
-    """メモを1件作成するユースケース。"""
+    """メモを1件作成するユースケース。events があれば作成を発行する。"""
 
-    def __init__(self, repository: MemoRepository) -> None:
+    def __init__(
+        self, repository: MemoRepository, events: Optional[MemoEventPublisher] = None
+    ) -> None:
         self._repo = repository
+        self._events = events
 
     async def execute(self, title: str, content: str) -> Memo:
-        return await self._repo.create(title=title, content=content)
+        memo = await self._repo.create(title=title, content=content)
+        if self._events is not None:
+            self._events.publish(MemoEvent.created(memo))
+        return memo
+
+
+class BulkCreateMemosUseCase:
+    """メモをまとめて作成するユースケース。events があれば1件ずつ作成を発行する。"""
+
+    def __init__(
+        self, repository: MemoRepository, events: Optional[MemoEventPublisher] = None
+    ) -> None:
+        self._repo = repository
+        self._events = events
+
+    async def execute(self, drafts: Sequence[MemoDraft]) -> list[Memo]:
+        if not drafts:
+            return []
+        memos = list(await self._repo.create_many(drafts))
+        if self._events is not None:
+            for memo in memos:
+                self._events.publish(MemoEvent.created(memo))
+        return memos
 
 
 class ListMemosUseCase:
-    """メモ一覧を取得するユースケース。"""
+    """メモ一覧を1ページ分取得するユースケース。"""
+
+    def __init__(self, repository: MemoRepository) -> None:
+        self._repo = repository
+
+    async def execute(self, limit: int, cursor: Optional[MemoCursor] = None) -> MemoPage:
+        # 1件多く取得し、溢れた分があれば次ページが存在すると判断する
+        rows = list(await self._repo.find_page(limit + 1, after=cursor))
+        if len(rows) <= limit:
+            return MemoPage(items=rows, next_cursor=None)
+        items = rows[:limit]
+        return MemoPage(items=items, next_cursor=MemoCursor.after(items[-1]))
+
+
+class ListMemoSummariesUseCase:
+    """メモ一覧を本文抜きの要約で1ページ分取得するユースケース。"""
+
+    def __init__(self, repository: MemoRepository) -> None:
+        self._repo = repository
+
+    async def execute(self, limit: int, cursor: Optional[MemoCursor] = None) -> MemoSummaryPage:
+        # 1件多く取得し、溢れた分があれば次ページが存在すると判断する
+        rows = list(await self._repo.find_summary_page(limit + 1, after=cursor))
+        if len(rows) <= limit:
+            return MemoSummaryPage(items=rows, next_cursor=None)
+        items = rows[:limit]
+        return MemoSummaryPage(items=items, next_cursor=MemoCursor.after(items[-1]))
+
+
+class ListMemoChangesUseCase:
+    """前回の同期以降に変わったメモと削除の記録を1ページ分取得するユースケース（差分同期）。"""
+
+    def __init__(self, repository: MemoRepository) -> None:
+        self._repo = repository
+
+    async def execute(self, limit: int, since: Optional[MemoSyncToken] = None) -> MemoChanges:
+        # トークンが無ければ初回の同期として全件を返す（削除の記録は要らない）
+        return await self._repo.find_changes(since or MemoSyncToken(), limit)
+
+
+class SearchMemosUseCase:
+    """メモを全文検索するユースケース。"""
 
     def __init__(self, repository: MemoRepository) -> None:
         self._repo = repository
 
-    async def execute(self) -> list[Memo]:
-        result = await self._repo.find_all()
-        return list(result)
+    async def execute(self, query: str, limit: int, offset: int = 0) -> MemoSearchPage:
+        query = query.strip()
+        if not query:
+            return MemoSearchPage(hits=[], next_offset=None)
+        # 1件多く取得し、溢れた分があれば次ページが存在すると判断する
+        hits = list(await self._repo.search(query, limit + 1, offset=offset))
+        if len(hits) <= limit:
+            return MemoSearchPage(hits=hits, next_offset=None)
+        return MemoSearchPage(hits=hits[:limit], next_offset=offset + limit)
+
+
+class ExportMemosUseCase:
+    """全メモを一定件数ずつ順に取り出すユースケース（エクスポート用）。"""
+
+    def __init__(self, repository: MemoRepository) -> None:
+        self._repo = repository
+
+    async def execute(self, batch_size: int) -> AsyncIterator[Sequence[Memo]]:
+        async for batch in self._repo.iter_batches(batch_size):
+            yield batch
 
 
 class GetMemoUseCase:
@@ -37,35 +132,104 @@ class GetMemoUseCase:
         return await self._repo.find_by_id(memo_id)
 
 
-class UpdateMemoUseCase:
-    """メモを更新するユースケース。"""
+class GetMemosUseCase:
+    """複数の ID でメモをまとめて取得するユースケース。"""
+
+    def __init__(self, repository: MemoRepository) -> None:
+        self._repo = repository
+
+    async def execute(self, memo_ids: Sequence[str]) -> list[tuple[str, Optional[Memo]]]:
+        """ID ごとに (ID, メモ) を入力順で返す。無ければ None。重複した ID は1つにまとめる。"""
+        unique_ids = list(dict.fromkeys(memo_ids))
+        if not unique_ids:
+            return []
+        found = {memo.id: memo for memo in await self._repo.find_by_ids(unique_ids)}
+        return [(memo_id, found.get(memo_id)) for memo_id in unique_ids]
+
+
+class GetMemoVersionUseCase:
+    """IDでメモの版（updated_at）だけを取得するユースケース。条件付き GET の判定に使う。"""
 
     def __init__(self, repository: MemoRepository) -> None:
         self._repo = repository
 
+    async def execute(self, memo_id: str) -> Optional[datetime]:
+        return await self._repo.find_version(memo_id)
+
+
+class GetMemoCollectionVersionUseCase:
+    """メモ全体の版を取得するユースケース。一覧の条件付き GET の判定に使う。"""
+
+    def __init__(self, repository: MemoRepository) -> None:
+        self._repo = repository
+
+    async def execute(self) -> MemoCollectionVersion:
+        return await self._repo.collection_version()
+
+
+class UpdateMemoUseCase:
+    """メモを部分更新するユースケース。
+
+    expected_updated_at を渡すと楽観的排他制御になり、他の更新と競合した場合は
+    MemoVersionConflictError を送出する。events があれば更新を発行する。
+    """
+
+    def __init__(
+        self, repository: MemoRepository, events: Optional[MemoEventPublisher] = None
+    ) -> None:
+        self._repo = repository
+        self._events = events
+
     async def execute(
         self,
         memo_id: str,
         *,
         title: Optional[str] = None,
         content: Optional[str] = None,
+        expected_updated_at: Optional[datetime] = None,
     ) -> Optional[Memo]:
-        existing = await self._repo.find_by_id(memo_id)
-        if existing is None:
-            return None
-        updated = existing
-        if title is not None:
-            updated = updated.with_title(title)
-        if content is not None:
-            updated = updated.with_content(content)
-        return await self._repo.update(updated)
+        memo = await self._repo.patch(
+            memo_id,
+            title=title,
+            content=content,
+            expected_updated_at=expected_updated_at,
+        )
+        if memo is not None and self._events is not None:
+            self._events.publish(MemoEvent.updated(memo))
+        return memo
 
 
 class DeleteMemoUseCase:
-    """メモを1件削除するユースケース。"""
+    """メモを1件削除するユースケース。events があれば削除を発行する。"""
 
-    def __init__(self, repository: MemoRepository) -> None:
+    def __init__(
+        self, repository: MemoRepository, events: Optional[MemoEventPublisher] = None
+    ) -> None:
         self._repo = repository
+        self._events = events
 
     async def execute(self, memo_id: str) -> bool:
-        return await self._repo.delete_by_id(memo_id)
+        deleted = await self._repo.delete_by_id(memo_id)
+        if deleted and self._events is not None:
+            self._events.publish(MemoEvent.deleted(memo_id))
+        return deleted
+
+
+class BulkDeleteMemosUseCase:
+    """メモをまとめて削除するユースケース。events があれば削除できた分を発行する。"""
+
+    def __init__(
+        self, repository: MemoRepository, events: Optional[MemoEventPublisher] = None
+    ) -> None:
+        self._repo = repository
+        self._events = events
+
+    async def execute(self, memo_ids: Sequence[str]) -> list[tuple[str, bool]]:
+        """ID ごとに (ID, 削除できたか) を入力順で返す。重複した ID は1つにまとめる。"""
+        unique_ids = list(dict.fromkeys(memo_ids))
+        deleted = await self._repo.delete_many(unique_ids)
+        if self._events is not None:
+            for memo_id in unique_ids:
+                if memo_id in deleted:
+                    self._events.publish(MemoEvent.deleted(memo_id))
+        return [(memo_id, memo_id in deleted) for memo_id in unique_ids]
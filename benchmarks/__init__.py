@@ -0,0 +1 @@
+# benchmarks（pytest の対象外。`uv run python -m benchmarks.<名前>` で実行する）
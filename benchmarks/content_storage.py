@@ -0,0 +1,197 @@
+"""本文の圧縮による保存サイズと読み取りレイテンシを、本文の長さごとに測るベンチマーク。
+
+- codec: 本文1件を zlib で圧縮・展開したときのサイズと所要時間
+- memory: インメモリのリポジトリを圧縮なし / あり（MEMORY_COMPRESS_MIN_BYTES）で比べる。
+  保持しているメモリ・スナップショットのサイズと、1件取得（展開する）・要約一覧（展開しない）の時間
+- postgres（--postgres）: DATABASE_URL の Postgres にメモを作り、本文の元のサイズと
+  保存サイズ（pg_column_size）・圧縮方式と、1件取得・要約一覧の時間を測って後始末する
+
+本文は語彙からランダムに選んだ日本語・英数字混じりの文章にする（同じ文の繰り返しは縮みすぎるため）。
+結果は JSON で標準出力に出す。
+
+    uv run python -m benchmarks.content_storage
+    uv run python -m benchmarks.content_storage --postgres --memos 100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+import zlib
+from collections.abc import Awaitable
+from typing import Callable
+
+from app.domain.memo import MemoDraft
+from app.infrastructure.in_memory_memo_repository import SNAPSHOT_FILE, InMemoryMemoRepository
+from app.usecases.memo_repository import MemoRepository
+
+_WORDS = (
+    "今日は 明日の 会議で 資料を 確認する 予定 です。 買い物 牛乳 パン 卵 を忘れずに。 "
+    "デプロイ 手順 ロールバック 監視 アラート 対応 した。 東京 大阪 出張 新幹線 ホテル 予約。 "
+    "TODO fix bug in parser and add tests. https://example.com/docs/guide?id= v1.2.3 "
+    "メモ 下書き 要約 検索 タグ 期限 優先度 高 中 低 完了 未着手 レビュー待ち 。、「」"
+).split()
+
+
+def make_content(size: int, seed: int = 0) -> str:
+    """語彙からランダムに語を選び、size 文字の本文を作る。"""
+    rng = random.Random(seed)
+    parts: list[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(_WORDS)
+        sep = "\n" if rng.random() < 0.05 else " "
+        parts.append(word + sep)
+        length += len(word) + 1
+    return "".join(parts)[:size]
+
+
+def _best_of(func: Callable[[], object], repeat: int, number: int) -> float:
+    """1回あたりの最短時間（秒）を返す。"""
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+
+async def _best_of_async(func: Callable[[], Awaitable[object]], repeat: int, number: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def run_codec(sizes: list[int], repeat: int) -> list[dict]:
+    results = []
+    for size in sizes:
+        raw = make_content(size).encode()
+        compressed = zlib.compress(raw)
+        number = max(1, 200_000 // size)
+        results.append(
+            {
+                "content_chars": size,
+                "raw_bytes": len(raw),
+                "zlib_bytes": len(compressed),
+                "ratio": len(compressed) / len(raw),
+                "compress_seconds": _best_of(lambda: zlib.compress(raw), repeat, number),
+                "decompress_seconds": _best_of(lambda: zlib.decompress(compressed), repeat, number),
+            }
+        )
+    return results
+
+
+async def _measure_repo(repo: MemoRepository, ids: list[str], repeat: int) -> dict:
+    return {
+        "find_by_id_seconds": await _best_of_async(
+            lambda: asyncio.gather(*(repo.find_by_id(i) for i in ids)), repeat, 1
+        )
+        / len(ids),
+        "summary_page_seconds": await _best_of_async(
+            lambda: repo.find_summary_page(min(len(ids), 50)), repeat, 10
+        ),
+    }
+
+
+async def run_memory(sizes: list[int], memos: int, compress_min_bytes: int, repeat: int) -> list:
+    results = []
+    for size in sizes:
+        for label, min_bytes in (("plain", 0), ("compressed", compress_min_bytes)):
+            with tempfile.TemporaryDirectory() as tmp:
+                repo = InMemoryMemoRepository(data_dir=tmp, compress_min_bytes=min_bytes)
+                await repo.load()
+                # 本文も測定中に作り、作成が返した Memo（展開済みの本文）を手放した後に残った分を
+                # リポジトリが保持するメモリとする（圧縮なしなら元の本文がそのまま残る）
+                tracemalloc.start()
+                before = tracemalloc.get_traced_memory()[0]
+                created = await repo.create_many(
+                    [MemoDraft(f"メモ {i}", make_content(size, seed=i)) for i in range(memos)]
+                )
+                ids = [memo.id for memo in created]
+                del created
+                retained = tracemalloc.get_traced_memory()[0] - before
+                tracemalloc.stop()
+                result = {
+                    "content_chars": size,
+                    "storage": label,
+                    "retained_bytes": retained,
+                    **await _measure_repo(repo, ids, repeat),
+                }
+                await repo.close()
+                result["snapshot_bytes"] = os.path.getsize(os.path.join(tmp, SNAPSHOT_FILE))
+                results.append(result)
+    return results
+
+
+async def run_postgres(sizes: list[int], memos: int, repeat: int) -> list[dict]:
+    from app.infrastructure.prisma_client import create_prisma
+    from app.infrastructure.prisma_memo_repository import PrismaMemoRepository
+    from app.settings import load_settings
+
+    db = create_prisma(load_settings())
+    await db.connect()
+    repo = PrismaMemoRepository(db)
+    results = []
+    try:
+        for size in sizes:
+            drafts = [MemoDraft(f"bench {i}", make_content(size, seed=i)) for i in range(memos)]
+            ids = [memo.id for memo in await repo.create_many(drafts)]
+            try:
+                [row] = await db.query_raw(
+                    'SELECT sum(octet_length("content"))::bigint AS "raw", '
+                    'sum(pg_column_size("content"))::bigint AS "stored", '
+                    "string_agg(DISTINCT coalesce(pg_column_compression(\"content\"), 'none'), ',')"
+                    ' AS "compression" '
+                    'FROM "Memo" WHERE "id" = ANY($1::text[])',
+                    ids,
+                )
+                results.append(
+                    {
+                        "content_chars": size,
+                        "raw_bytes": int(row["raw"]),
+                        "stored_bytes": int(row["stored"]),
+                        "compression": row["compression"],
+                        **await _measure_repo(repo, ids, repeat),
+                    }
+                )
+            finally:
+                await repo.delete_many(ids)
+    finally:
+        await db.disconnect()
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict:
+    result = {
+        "benchmark": "content_storage",
+        "python": sys.version.split()[0],
+        "memos": args.memos,
+        "compress_min_bytes": args.compress_min_bytes,
+        "codec": run_codec(args.sizes, args.repeat),
+        "memory": await run_memory(args.sizes, args.memos, args.compress_min_bytes, args.repeat),
+    }
+    if args.postgres:
+        result["postgres"] = await run_postgres(args.sizes, args.memos, args.repeat)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[200, 2_000, 20_000, 100_000], help="本文の文字数"
+    )
+    parser.add_argument("--memos", type=int, default=200, help="本文の長さごとに作るメモの件数")
+    parser.add_argument("--compress-min-bytes", type=int, default=16384)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--postgres", action="store_true", help="DATABASE_URL の Postgres も測る")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""メモ API の負荷テスト。app.main:app をプロセス内で動かし、操作の混合比と同時実行数を変えて測る。
+
+- backend=memory: DB を使わず、インメモリのリポジトリでアプリ全体（ミドルウェア・ルーター・
+  ユースケース・シリアライズ）を測る
+- backend=postgres: lifespan をそのまま動かし、DATABASE_URL の Postgres に対して測る
+
+操作ごとと全体の p50 / p95 / p99 レイテンシ・RPS・ピーク RSS と、新しいプロセスで app.main を
+読み込む時間（ソースから / コンパイル済みバイトコードから）を JSON で標準出力に出す。
+--baseline に以前の結果を渡すと、p95 と RPS が許容範囲を超えて悪化した場合に終了コード 1 で終わる。
+
+    uv run python -m benchmarks.load --mix read-heavy --concurrency 32 --requests 5000
+    uv run python -m benchmarks.load --output baseline.json
+    uv run python -m benchmarks.load --baseline baseline.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import compileall
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Optional
+
+import httpx
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+OPERATIONS = ("create", "get", "list", "patch", "delete")
+
+# 操作ごとの重み
+MIXES = {
+    "read-heavy": {"get": 70, "list": 20, "create": 5, "patch": 4, "delete": 1},
+    "balanced": {"get": 40, "list": 20, "create": 20, "patch": 15, "delete": 5},
+    "write-heavy": {"get": 15, "list": 5, "create": 45, "patch": 25, "delete": 10},
+}
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """混合比の名前（read-heavy など）か、get=70,list=30 の形の重み指定を解釈する。"""
+    if value in MIXES:
+        return MIXES[value]
+    weights: dict[str, int] = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS or not weight.strip().isdigit():
+            raise argparse.ArgumentTypeError(f"invalid mix item: {item!r}")
+        weights[name] = int(weight)
+    if not any(weights.values()):
+        raise argparse.ArgumentTypeError("mix must have at least one positive weight")
+    return weights
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """昇順に並んだ値の p パーセンタイル（nearest-rank 法）を返す。"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def _summary(latencies: list[float], elapsed: float) -> dict:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "rps": len(values) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": (values[-1] if values else 0.0) * 1000,
+    }
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """このプロセスのピーク RSS（バイト）。取得できない環境では None。"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux は KiB、macOS はバイトで返す
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+_IMPORT_SCRIPT = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def _import_once(cwd: str) -> float:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1", "PYTHONPATH": cwd}
+    out = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT],
+        cwd=cwd,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def measure_import_seconds(runs: int) -> dict[str, float]:
+    """新しいプロセスで app.main を読み込む時間（秒。runs 回の中央値）。
+
+    app パッケージを一時ディレクトリに写し、source はバイトコード無し（起動のたびにソースから
+    コンパイルする）、bytecode は compileall で事前にコンパイルした状態で測る。
+    標準ライブラリと依存パッケージは、どちらもインストール済みのバイトコードを使う。
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(
+            os.path.join(root, "app"),
+            os.path.join(tmp, "app"),
+            ignore=shutil.ignore_patterns("__pycache__"),
+        )
+        source = statistics.median(_import_once(tmp) for _ in range(runs))
+        compileall.compile_dir(os.path.join(tmp, "app"), quiet=1)
+        bytecode = statistics.median(_import_once(tmp) for _ in range(runs))
+    return {"source": source, "bytecode": bytecode}
+
+
+@asynccontextmanager
+async def _running_app(backend: str) -> AsyncIterator[object]:
+    from app.container import Container
+    from app.main import _build_memo_repository, app, lifespan, settings
+
+    if backend == "postgres":
+        async with lifespan(app):
+            yield app
+        return
+    from app.infrastructure.in_memory_memo_repository import InMemoryMemoRepository
+
+    # 永続化なしのインメモリ実装を、本番と同じく計測・キャッシュで包んで使う
+    app.state.db = None
+    app.state.pool_monitor = None
+    async with AsyncExitStack() as stack:
+        app.state.container = Container.build(
+            _build_memo_repository(
+                InMemoryMemoRepository(), settings, app.state.metrics_registry, stack
+            )
+        )
+        app.state.readiness.mark_ready()
+        yield app
+
+
+class _Worker:
+    """1本の同時実行枠。共有の ID 一覧を使い、混合比に従って操作を選ぶ。"""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        rng: random.Random,
+        ids: list[str],
+        mix: dict[str, int],
+        content_size: int,
+    ) -> None:
+        self._client = client
+        self._rng = rng
+        self._ids = ids
+        self._names = [name for name, weight in mix.items() if weight > 0]
+        self._weights = [mix[name] for name in self._names]
+        self._content = "x" * content_size
+
+    async def _request(self, operation: str) -> httpx.Response:
+        client, ids = self._client, self._ids
+        if operation == "create" or not ids:
+            res = await client.post("/memos", json={"title": "bench", "content": self._content})
+            if res.status_code == 201:
+                ids.append(res.json()["id"])
+            return res
+        if operation == "get":
+            return await client.get(f"/memos/{self._rng.choice(ids)}")
+        if operation == "list":
+            return await client.get("/memos", params={"limit": 50})
+        if operation == "patch":
+            return await client.patch(f"/memos/{self._rng.choice(ids)}", json={"title": "edited"})
+        memo_id = ids.pop(self._rng.randrange(len(ids)))
+        return await client.delete(f"/memos/{memo_id}")
+
+    async def run(
+        self, remaining: list[int], latencies: dict[str, list[float]], errors: dict[str, int]
+    ) -> None:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            operation = self._rng.choices(self._names, self._weights)[0]
+            if not self._ids:
+                operation = "create"
+            started = time.perf_counter()
+            res = await self._request(operation)
+            latencies[operation].append(time.perf_counter() - started)
+            if res.status_code >= 400:
+                errors[operation] += 1
+
+
+async def run(
+    backend: str,
+    mix: dict[str, int],
+    concurrency: int,
+    requests: int,
+    seed_memos: int,
+    content_size: int,
+    seed: int,
+    import_runs: int = 0,
+) -> dict:
+    import_seconds = measure_import_seconds(import_runs) if import_runs > 0 else None
+    latencies: dict[str, list[float]] = {name: [] for name in OPERATIONS}
+    errors = dict.fromkeys(OPERATIONS, 0)
+    async with _running_app(backend) as app:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            ids: list[str] = []
+            for start in range(0, seed_memos, 1000):
+                items = [
+                    {"title": f"seed {i}", "content": "x" * content_size}
+                    for i in range(start, min(seed_memos, start + 1000))
+                ]
+                res = await client.post("/memos/bulk", json={"items": items})
+                res.raise_for_status()
+                ids.extend(item["id"] for item in res.json()["items"])
+            remaining = [requests]
+            workers = [
+                _Worker(client, random.Random(seed + i), ids, mix, content_size)
+                for i in range(concurrency)
+            ]
+            started = time.perf_counter()
+            await asyncio.gather(*(w.run(remaining, latencies, errors) for w in workers))
+            elapsed = time.perf_counter() - started
+    everything = [v for values in latencies.values() for v in values]
+    return {
+        "benchmark": "load",
+        "python": sys.version.split()[0],
+        "backend": backend,
+        "mix": mix,
+        "concurrency": concurrency,
+        "seed_memos": seed_memos,
+        "content_size": content_size,
+        "elapsed_seconds": elapsed,
+        "overall": {**_summary(everything, elapsed), "errors": sum(errors.values())},
+        "operations": {
+            name: {**_summary(values, elapsed), "errors": errors[name]}
+            for name, values in latencies.items()
+            if values
+        },
+        "peak_rss_bytes": peak_rss_bytes(),
+        "import_seconds": import_seconds,
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """基準の結果と比べ、許容範囲（割合）を超えて悪化した項目を返す。"""
+    regressions = []
+    current, base = result["overall"], baseline["overall"]
+    if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+        regressions.append(f"p95_ms {base['p95_ms']:.2f} -> {current['p95_ms']:.2f}")
+    if current["rps"] < base["rps"] * (1 - tolerance):
+        regressions.append(f"rps {base['rps']:.1f} -> {current['rps']:.1f}")
+    if result.get("peak_rss_bytes") and baseline.get("peak_rss_bytes"):
+        if result["peak_rss_bytes"] > baseline["peak_rss_bytes"] * (1 + tolerance):
+            regressions.append(
+                f"peak_rss_bytes {baseline['peak_rss_bytes']} -> {result['peak_rss_bytes']}"
+            )
+    if result.get("import_seconds") and baseline.get("import_seconds"):
+        current_import = result["import_seconds"]["bytecode"]
+        base_import = baseline["import_seconds"]["bytecode"]
+        if current_import > base_import * (1 + tolerance):
+            regressions.append(f"import_seconds {base_import:.3f} -> {current_import:.3f}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("memory", "postgres"), default="memory")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=MIXES["read-heavy"],
+        help=f"{' / '.join(MIXES)} または get=70,list=20,... の形の重み",
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000, help="計測するリクエストの総数")
+    parser.add_argument("--seed-memos", type=int, default=1000, help="計測前に作っておくメモ数")
+    parser.add_argument("--content-size", type=int, default=500, help="1メモの本文の文字数")
+    parser.add_argument("--seed", type=int, default=0, help="操作の選び方の乱数シード")
+    parser.add_argument(
+        "--import-runs",
+        type=int,
+        default=5,
+        help="app.main の読み込み時間を測る回数（中央値を出す。0 で測らない）",
+    )
+    parser.add_argument("--output", help="結果の JSON を書き出すファイル")
+    parser.add_argument("--baseline", help="比較する以前の結果の JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="許容する悪化の割合")
+    args = parser.parse_args()
+    result = asyncio.run(
+        run(
+            args.backend,
+            args.mix,
+            args.concurrency,
+            args.requests,
+            args.seed_memos,
+            args.content_size,
+            args.seed,
+            args.import_runs,
+        )
+    )
+    if args.baseline:
+        with open(args.baseline) as f:
+            result["regressions"] = compare(result, json.load(f), args.tolerance)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    if result.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""メモ一覧レスポンスのシリアライズ速度を旧経路と新経路で比べるマイクロベンチマーク。
+
+- 旧経路: Memo → MemoResponse を組み立て、FastAPI と同様に response_model で再検証して
+  json.dumps する（FastAPI の serialize_response + JSONResponse 相当）
+- 新経路: app.interfaces.memo_serializer で Memo を直接 JSON にする
+
+あわせて gzip / brotli の圧縮後サイズと所要時間も測る。結果は JSON で標準出力に出す。
+
+    uv run python -m benchmarks.serialization
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from pydantic import TypeAdapter
+
+from app.domain.memo import Memo
+from app.interfaces.memo_schema import MemoPageResponse, MemoResponse
+from app.interfaces.memo_serializer import dump_memo_page
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+_PAGE_ADAPTER = TypeAdapter(MemoPageResponse)
+
+
+def _make_memos(n: int, content_size: int) -> list[Memo]:
+    base = datetime(2025, 2, 8, tzinfo=timezone.utc)
+    return [
+        Memo(
+            id=f"cm{i:023d}",
+            title=f"メモ {i}",
+            content=("本文テキスト " * (content_size // 7 + 1))[:content_size],
+            created_at=base + timedelta(seconds=i),
+            updated_at=base + timedelta(seconds=i),
+        )
+        for i in range(n)
+    ]
+
+
+def _old_path(memos: list[Memo]) -> bytes:
+    page = MemoPageResponse(
+        items=[
+            MemoResponse(
+                id=m.id,
+                title=m.title,
+                content=m.content,
+                created_at=m.created_at,
+                updated_at=m.updated_at,
+            )
+            for m in memos
+        ],
+        next_cursor=None,
+    )
+    validated = _PAGE_ADAPTER.validate_python(page, from_attributes=True)
+    content = _PAGE_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _new_path(memos: list[Memo]) -> bytes:
+    return dump_memo_page(memos, None)
+
+
+def _best_of(func, repeat: int, number: int) -> float:
+    """1回あたりの最短時間（秒）を返す。"""
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+
+def run(sizes: list[int], content_size: int, repeat: int) -> dict:
+    results = []
+    for n in sizes:
+        memos = _make_memos(n, content_size)
+        # 件数が多いほど1回が重いので、測定回数を減らして所要時間を揃える
+        number = max(1, 10_000 // n)
+        old_body = _old_path(memos)
+        new_body = _new_path(memos)
+        assert json.loads(old_body) == json.loads(new_body), "新旧の出力が一致しない"
+        result = {
+            "memos": n,
+            "body_bytes": len(new_body),
+            "old_seconds": _best_of(lambda: _old_path(memos), repeat, number),
+            "new_seconds": _best_of(lambda: _new_path(memos), repeat, number),
+            "gzip_bytes": len(gzip.compress(new_body, compresslevel=6)),
+            "gzip_seconds": _best_of(
+                lambda: gzip.compress(new_body, compresslevel=6), repeat, number
+            ),
+        }
+        result["speedup"] = result["old_seconds"] / result["new_seconds"]
+        if brotli is not None:
+            result["brotli_bytes"] = len(brotli.compress(new_body, quality=4))
+            result["brotli_seconds"] = _best_of(
+                lambda: brotli.compress(new_body, quality=4), repeat, number
+            )
+        results.append(result)
+    return {
+        "benchmark": "serialization",
+        "python": sys.version.split()[0],
+        "content_size": content_size,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--content-size", type=int, default=500, help="1メモの本文の文字数")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.content_size, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+-- CreateIndex
+CREATE INDEX "Memo_created_at_id_idx" ON "Memo"("created_at", "id");
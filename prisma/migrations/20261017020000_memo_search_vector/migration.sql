@@ -0,0 +1,9 @@
+-- AlterTable
+-- 生成列の追加はテーブルの書き換えを伴うため、件数が多い場合はメンテナンス時間に適用する
+ALTER TABLE "Memo" ADD COLUMN "search_vector" tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', "title"), 'A') ||
+    setweight(to_tsvector('simple', "content"), 'B')
+) STORED;
+
+-- CreateIndex
+CREATE INDEX "Memo_search_vector_idx" ON "Memo" USING GIN ("search_vector");
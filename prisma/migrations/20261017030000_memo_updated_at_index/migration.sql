@@ -0,0 +1,2 @@
+-- CreateIndex
+CREATE INDEX "Memo_updated_at_idx" ON "Memo"("updated_at");
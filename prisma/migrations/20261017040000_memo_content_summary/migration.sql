@@ -0,0 +1,7 @@
+-- AlterTable
+-- 一覧の要約用に、本文の文字数と先頭 120 文字（MEMO_PREVIEW_LENGTH）を生成列で持つ。
+-- 一覧はこの2列だけを読み、大きな本文（TOAST）を読まずに済ませる
+-- 生成列の追加はテーブルの書き換えを伴うため、件数が多い場合はメンテナンス時間に適用する
+ALTER TABLE "Memo"
+    ADD COLUMN "content_length" INTEGER GENERATED ALWAYS AS (char_length("content")) STORED,
+    ADD COLUMN "content_preview" TEXT GENERATED ALWAYS AS (left("content", 120)) STORED;
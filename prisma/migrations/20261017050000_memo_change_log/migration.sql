@@ -0,0 +1,56 @@
+-- 差分同期（GET /memos/changes）用の変更の記録。
+-- 作成・更新・削除のたびに、共通のシーケンスから変更の連番（change_seq）を振り、
+-- 変更したトランザクションの ID（change_xid）を残す。同期トークンはトランザクション ID で
+-- 区切るため、遅れてコミットされた変更も次の同期で拾える（updated_at はアプリ側の時刻で、
+-- コミット順とは限らない）。
+-- 列の追加は既存の行すべてに値を振るためテーブルの書き換えを伴う。件数が多い場合はメンテナンス時間に適用する
+CREATE SEQUENCE "memo_change_seq";
+
+-- AlterTable
+ALTER TABLE "Memo"
+    ADD COLUMN "change_seq" BIGINT NOT NULL DEFAULT nextval('memo_change_seq'),
+    ADD COLUMN "change_xid" xid8 NOT NULL DEFAULT pg_current_xact_id();
+
+-- CreateTable
+-- 削除の記録（tombstone）。メモの削除と同じトランザクションでトリガーが書く
+CREATE TABLE "MemoTombstone" (
+    "id" TEXT NOT NULL,
+    "deleted_at" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "change_seq" BIGINT NOT NULL DEFAULT nextval('memo_change_seq'),
+    "change_xid" xid8 NOT NULL DEFAULT pg_current_xact_id(),
+
+    CONSTRAINT "MemoTombstone_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+-- 差分はトランザクション ID の範囲で引くため、変更の数に比例する件数だけを読む。
+-- 初回の同期のように範囲が広い場合は、change_seq の索引を順に辿ってページを切る
+CREATE INDEX "Memo_change_xid_idx" ON "Memo"("change_xid");
+CREATE INDEX "Memo_change_seq_idx" ON "Memo"("change_seq");
+CREATE INDEX "MemoTombstone_change_xid_idx" ON "MemoTombstone"("change_xid");
+CREATE INDEX "MemoTombstone_change_seq_idx" ON "MemoTombstone"("change_seq");
+
+-- 更新のたびに変更の連番とトランザクション ID を振り直す
+CREATE FUNCTION "memo_touch_change"() RETURNS trigger AS $$
+BEGIN
+    NEW."change_seq" := nextval('memo_change_seq');
+    NEW."change_xid" := pg_current_xact_id();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "Memo_touch_change"
+    BEFORE UPDATE ON "Memo"
+    FOR EACH ROW EXECUTE FUNCTION "memo_touch_change"();
+
+-- 削除したメモの記録を残す（同じ ID はもう一度作られないため、既にあれば何もしない）
+CREATE FUNCTION "memo_record_tombstone"() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO "MemoTombstone" ("id") VALUES (OLD."id") ON CONFLICT ("id") DO NOTHING;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "Memo_record_tombstone"
+    AFTER DELETE ON "Memo"
+    FOR EACH ROW EXECUTE FUNCTION "memo_record_tombstone"();
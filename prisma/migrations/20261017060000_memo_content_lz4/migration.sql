@@ -0,0 +1,20 @@
+-- AlterTable
+-- 大きな本文は Postgres が TOAST で圧縮して保存する（行が約 2KB を超えると圧縮を試す）。
+-- 既定の pglz より圧縮・展開が速い lz4 に切り替える。content は text のまま持つので、
+-- 生成列（search_vector・content_length・content_preview）と全文検索はそのまま使える。
+-- 一覧の要約・版・差分の問い合わせは content を読まないため、展開は本文を返すときだけ起きる。
+-- 圧縮方式は新しく書く値から効く（既存の行は本文を書き換えたときに lz4 になる）。
+-- PostgreSQL 13（差分同期の xid8 のため 13 以上が前提。SET COMPRESSION は 14 から）や、
+-- lz4 を組み込んでいない Postgres では何もしない（pglz のまま）。
+-- 13 では文の解析で構文エラーになるため、版を確かめてから EXECUTE で実行する
+DO $$
+BEGIN
+    IF current_setting('server_version_num')::int < 140000 THEN
+        RAISE NOTICE 'SET COMPRESSION needs PostgreSQL 14+; keeping pglz for "Memo"."content"';
+        RETURN;
+    END IF;
+    EXECUTE 'ALTER TABLE "Memo" ALTER COLUMN "content" SET COMPRESSION lz4';
+EXCEPTION WHEN feature_not_supported THEN
+    RAISE NOTICE 'lz4 is not supported by this server; keeping pglz for "Memo"."content"';
+END
+$$;
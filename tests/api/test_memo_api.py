@@ -1,5 +1,6 @@
 """メモ API の E2E テスト。DATABASE_URL が設定され DB が利用可能な場合に実行する。"""
 
+import json
 import os
 
 import pytest
@@ -40,7 +41,76 @@ class TestメモAPI正常系:
         """メモ一覧を取得した場合、200 とリストが返ること。"""
         res = api_client.get("/memos")
         assert res.status_code == 200
-        assert isinstance(res.json(), list)
+        assert isinstance(res.json()["items"], list)
+        assert "next_cursor" in res.json()
+
+    def test_limitを指定して一覧を辿った場合_重複なく全件取得できること(
+        self, api_client: TestClient
+    ) -> None:
+        """limit を指定して next_cursor を辿った場合、重複なく全件取得できること。"""
+        for i in range(3):
+            api_client.post("/memos", json={"title": f"ページ{i}", "content": "内容"})
+        seen: list[str] = []
+        cursor = None
+        while True:
+            params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+            res = api_client.get("/memos", params=params)
+            assert res.status_code == 200
+            seen.extend(m["id"] for m in res.json()["items"])
+            cursor = res.json()["next_cursor"]
+            if cursor is None:
+                break
+        assert len(seen) == len(set(seen))
+        assert len(seen) >= 3
+
+    def test_view_summaryで一覧を取得した場合_本文の代わりに文字数と先頭部分が返ること(
+        self, api_client: TestClient
+    ) -> None:
+        """view=summary の場合、content の代わりに content_length と preview が返ること。"""
+        api_client.post("/memos", json={"title": "要約", "content": "あ" * 300})
+        res = api_client.get("/memos", params={"view": "summary", "limit": 200})
+        assert res.status_code == 200
+        item = next(i for i in res.json()["items"] if i["title"] == "要約")
+        assert "content" not in item
+        assert item["content_length"] == 300
+        assert item["preview"] == "あ" * 120
+
+    def test_idsを指定して一覧を取得した場合_指定したメモと存在しないIDが返ること(
+        self, api_client: TestClient
+    ) -> None:
+        """ids を指定した場合、指定順のメモと、存在しなかった ID の一覧が返ること。"""
+        created = [
+            api_client.post("/memos", json={"title": f"複数取得{i}", "content": "本文"}).json()
+            for i in range(2)
+        ]
+        ids = f"{created[1]['id']},not-exist-id,{created[0]['id']}"
+        res = api_client.get("/memos", params={"ids": ids})
+        assert res.status_code == 200
+        data = res.json()
+        assert [item["id"] for item in data["items"]] == [created[1]["id"], created[0]["id"]]
+        assert data["missing"] == ["not-exist-id"]
+
+    def test_検索語を含むメモを検索した場合_200とヒットしたメモが返ること(
+        self, api_client: TestClient
+    ) -> None:
+        """検索語を含むメモを検索した場合、200 とヒットしたメモが返ること。"""
+        create = api_client.post("/memos", json={"title": "searchable", "content": "full text"})
+        memo_id = create.json()["id"]
+        res = api_client.get("/memos/search", params={"q": "searchable"})
+        assert res.status_code == 200
+        assert memo_id in {m["id"] for m in res.json()["items"]}
+
+    def test_エクスポートした場合_NDJSONで作成済みのメモが含まれること(
+        self, api_client: TestClient
+    ) -> None:
+        """エクスポートした場合、NDJSON で作成済みのメモが含まれること。"""
+        create = api_client.post("/memos", json={"title": "エクスポート", "content": "内容"})
+        memo_id = create.json()["id"]
+        res = api_client.get("/memos/export")
+        assert res.status_code == 200
+        assert res.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in res.text.splitlines()]
+        assert memo_id in {m["id"] for m in lines}
 
     def test_存在するIDで取得した場合_200とメモが返ること(self, api_client: TestClient) -> None:
         """存在する ID で取得した場合、200 とメモが返ること。"""
@@ -55,6 +125,27 @@ class TestメモAPI正常系:
         assert res.json()["id"] == memo_id
         assert res.json()["title"] == "取得用"
 
+    def test_取得時のETagをIf_None_Matchに指定した場合_304が返ること(
+        self, api_client: TestClient
+    ) -> None:
+        """取得時の ETag を If-None-Match に指定した場合、304 が返ること。"""
+        create = api_client.post("/memos", json={"title": "条件付き", "content": "内容"})
+        memo_id = create.json()["id"]
+        first = api_client.get(f"/memos/{memo_id}")
+        res = api_client.get(f"/memos/{memo_id}", headers={"If-None-Match": first.headers["etag"]})
+        assert res.status_code == 304
+        assert res.headers["etag"] == first.headers["etag"]
+
+    def test_一覧のETagをIf_None_Matchに指定した場合_変更が無ければ304が返ること(
+        self, api_client: TestClient
+    ) -> None:
+        """一覧の ETag を指定した場合、変更が無ければ 304、作成後は 200 であること。"""
+        first = api_client.get("/memos")
+        etag = first.headers["etag"]
+        assert api_client.get("/memos", headers={"If-None-Match": etag}).status_code == 304
+        api_client.post("/memos", json={"title": "一覧の版", "content": "内容"})
+        assert api_client.get("/memos", headers={"If-None-Match": etag}).status_code == 200
+
     def test_存在するIDで更新した場合_200と更新後のメモが返ること(
         self, api_client: TestClient
     ) -> None:
@@ -72,6 +163,20 @@ class TestメモAPI正常系:
         assert res.status_code == 200
         assert res.json()["title"] == "更新後"
 
+    def test_取得時のETagをIf_Matchに指定して更新した場合_200と新しいETagが返ること(
+        self, api_client: TestClient
+    ) -> None:
+        """取得時の ETag を If-Match に指定して更新した場合、200 と新しい ETag が返ること。"""
+        create = api_client.post("/memos", json={"title": "更新前", "content": "内容"})
+        etag = create.headers["etag"]
+        res = api_client.patch(
+            f"/memos/{create.json()['id']}",
+            json={"title": "更新後"},
+            headers={"If-Match": etag},
+        )
+        assert res.status_code == 200
+        assert res.headers["etag"] != etag
+
     def test_存在するIDで削除した場合_204が返ること(self, api_client: TestClient) -> None:
         """存在する ID で削除した場合、204 が返ること。"""
         create = api_client.post(
@@ -85,10 +190,79 @@ class TestメモAPI正常系:
         get_res = api_client.get(f"/memos/{memo_id}")
         assert get_res.status_code == 404
 
+    def test_一括作成して一括削除した場合_入力順の結果が返ること(
+        self, api_client: TestClient
+    ) -> None:
+        """一括作成した場合は入力順のメモが、一括削除した場合は ID ごとの結果が返ること。"""
+        create = api_client.post(
+            "/memos/bulk",
+            json={"items": [{"title": f"一括{i}", "content": "内容"} for i in range(3)]},
+        )
+        assert create.status_code == 201
+        items = create.json()["items"]
+        assert [m["title"] for m in items] == ["一括0", "一括1", "一括2"]
+        ids = [m["id"] for m in items]
+        res = api_client.request("DELETE", "/memos/bulk", json={"ids": [*ids, "non-existent-id"]})
+        assert res.status_code == 200
+        assert res.json()["results"] == [
+            *({"id": memo_id, "deleted": True} for memo_id in ids),
+            {"id": "non-existent-id", "deleted": False},
+        ]
+
+    def test_差分同期した場合_前回のトークン以降の変更と削除が返ること(
+        self, api_client: TestClient
+    ) -> None:
+        """next_token を辿り切った後に作成・更新・削除した場合、次の同期でそれらが返ること。"""
+        token = None
+        while True:
+            params = {"limit": 200} if token is None else {"limit": 200, "since": token}
+            res = api_client.get("/memos/changes", params=params)
+            assert res.status_code == 200
+            token = res.json()["next_token"]
+            if not res.json()["has_more"]:
+                break
+        kept = api_client.post("/memos", json={"title": "同期", "content": "内容"}).json()
+        removed = api_client.post("/memos", json={"title": "同期削除", "content": "内容"}).json()
+        api_client.patch(f"/memos/{kept['id']}", json={"title": "同期更新"})
+        api_client.delete(f"/memos/{removed['id']}")
+        res = api_client.get("/memos/changes", params={"since": token})
+        assert res.status_code == 200
+        data = res.json()
+        assert {m["id"]: m["title"] for m in data["changed"]}[kept["id"]] == "同期更新"
+        assert removed["id"] in {t["id"] for t in data["deleted"]}
+
 
 class TestメモAPI異常系:
     """異常系: 存在しない ID の場合は 404 であること。"""
 
+    def test_不正なカーソルで一覧を取得した場合_400であること(self, api_client: TestClient) -> None:
+        """不正なカーソルで一覧を取得した場合、400 であること。"""
+        res = api_client.get("/memos", params={"cursor": "invalid"})
+        assert res.status_code == 400
+
+    def test_不正な同期トークンで差分を取得した場合_400であること(
+        self, api_client: TestClient
+    ) -> None:
+        """不正な since で差分を取得した場合、400 であること。"""
+        res = api_client.get("/memos/changes", params={"since": "invalid"})
+        assert res.status_code == 400
+
+    def test_idsに上限を超える件数を指定した場合_400であること(
+        self, api_client: TestClient
+    ) -> None:
+        """ids に上限を超える件数や空の値を指定した場合、400 であること。"""
+        too_many = ",".join(f"id-{i}" for i in range(101))
+        assert api_client.get("/memos", params={"ids": too_many}).status_code == 400
+        assert api_client.get("/memos", params={"ids": " , "}).status_code == 400
+
+    def test_一括作成に不正な項目が含まれる場合_422であること(self, api_client: TestClient) -> None:
+        """一括作成に不正な項目が含まれる場合、422 であること。"""
+        res = api_client.post(
+            "/memos/bulk",
+            json={"items": [{"title": "正常", "content": "内容"}, {"title": "", "content": ""}]},
+        )
+        assert res.status_code == 422
+
     def test_存在しないIDで取得した場合_404であること(self, api_client: TestClient) -> None:
         """存在しない ID で取得した場合、404 であること。"""
         res = api_client.get("/memos/non-existent-id")
@@ -102,6 +276,22 @@ class TestメモAPI異常系:
         )
         assert res.status_code == 404
 
+    def test_古いETagをIf_Matchに指定して更新した場合_412であること(
+        self, api_client: TestClient
+    ) -> None:
+        """他の更新後に古い ETag を If-Match に指定した場合、412 で更新されないこと。"""
+        create = api_client.post("/memos", json={"title": "更新前", "content": "内容"})
+        memo_id = create.json()["id"]
+        stale_etag = create.headers["etag"]
+        api_client.patch(f"/memos/{memo_id}", json={"title": "先に更新"})
+        res = api_client.patch(
+            f"/memos/{memo_id}",
+            json={"title": "後から更新"},
+            headers={"If-Match": stale_etag},
+        )
+        assert res.status_code == 412
+        assert api_client.get(f"/memos/{memo_id}").json()["title"] == "先に更新"
+
     def test_存在しないIDで削除した場合_404であること(self, api_client: TestClient) -> None:
         """存在しない ID で削除した場合、404 であること。"""
         res = api_client.delete("/memos/non-existent-id")
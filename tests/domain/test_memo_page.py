@@ -0,0 +1,62 @@
+"""メモ一覧カーソルと差分同期トークンのテスト。"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.domain.memo_page import InvalidMemoCursorError, MemoCursor
+from app.domain.memo_sync import InvalidSyncTokenError, MemoSyncToken
+
+
+class TestMemoCursor正常系:
+    """正常系: カーソルのエンコード・デコードが往復できること。"""
+
+    def test_encodeした文字列をdecodeした場合_元のカーソルに戻ること(self) -> None:
+        """encode した文字列を decode した場合、元の created_at と id に戻ること。"""
+        cursor = MemoCursor(
+            created_at=datetime(2025, 2, 8, 12, 0, 0, 123000, tzinfo=timezone.utc),
+            id="cm1abcdef",
+        )
+        assert MemoCursor.decode(cursor.encode()) == cursor
+
+
+class TestMemoCursor異常系:
+    """異常系: 不正なカーソル文字列の場合。"""
+
+    @pytest.mark.parametrize("value", ["", "!!!", "bm90LWEtY3Vyc29y"])
+    def test_不正な文字列をdecodeした場合_InvalidMemoCursorErrorになること(
+        self, value: str
+    ) -> None:
+        """不正な文字列を decode した場合、InvalidMemoCursorError が送出されること。"""
+        with pytest.raises(InvalidMemoCursorError):
+            MemoCursor.decode(value)
+
+    def test_タイムゾーンの無い日時の場合_InvalidMemoCursorErrorになること(self) -> None:
+        """created_at にタイムゾーンが無いカーソルの場合、InvalidMemoCursorError になること。"""
+        naive = MemoCursor(created_at=datetime(2026, 1, 1), id="x").encode()
+        with pytest.raises(InvalidMemoCursorError):
+            MemoCursor.decode(naive)
+
+
+class TestMemoSyncToken正常系:
+    """正常系: 同期トークンのエンコード・デコードが往復できること。"""
+
+    @pytest.mark.parametrize(
+        "token",
+        [MemoSyncToken(), MemoSyncToken(2**63 + 5), MemoSyncToken(10, after=42, next_watermark=12)],
+    )
+    def test_encodeした文字列をdecodeした場合_元のトークンに戻ること(
+        self, token: MemoSyncToken
+    ) -> None:
+        """encode した文字列を decode した場合、watermark・after・next_watermark が戻ること。"""
+        assert MemoSyncToken.decode(token.encode()) == token
+
+
+class TestMemoSyncToken異常系:
+    """異常系: 不正なトークン文字列の場合。"""
+
+    @pytest.mark.parametrize("value", ["", "!!!", "MXwy", "LTF8MHw"])
+    def test_不正な文字列をdecodeした場合_InvalidSyncTokenErrorになること(self, value: str) -> None:
+        """区切りの数が違う・負の値を含む文字列の場合、InvalidSyncTokenError になること。"""
+        with pytest.raises(InvalidSyncTokenError):
+            MemoSyncToken.decode(value)
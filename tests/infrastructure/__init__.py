@@ -0,0 +1 @@
+# infrastructure tests
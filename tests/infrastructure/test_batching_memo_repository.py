@@ -0,0 +1,88 @@
+"""1件取得をまとめるリポジトリのテスト。"""
+
+import asyncio
+from collections.abc import Sequence
+from typing import Optional
+
+import pytest
+
+from app.domain.memo import Memo
+from app.infrastructure.batching_memo_repository import BatchingMemoRepository
+from tests.usecases.test_memo_use_cases import _FakeRepo
+
+
+class _RecordingRepo(_FakeRepo):
+    """find_by_ids に渡された ID の一覧を記録する。"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[list[str]] = []
+        self.error: Optional[Exception] = None
+
+    async def find_by_ids(self, memo_ids: Sequence[str]) -> Sequence[Memo]:
+        self.batches.append(list(memo_ids))
+        if self.error is not None:
+            raise self.error
+        return await super().find_by_ids(memo_ids)
+
+
+class TestBatchingMemoRepository正常系:
+    """正常系: 並行した1件取得が1回の一括取得にまとまること。"""
+
+    async def test_別々のIDを並行して取得した場合_1回の一括取得にまとまること(self) -> None:
+        """別々の ID を並行して取得した場合、一括取得は1回で各自に結果が配られること。"""
+        inner = _RecordingRepo()
+        memos = [await inner.create(f"{i}", "本文") for i in range(3)]
+        repo = BatchingMemoRepository(inner)
+        ids = [memo.id for memo in memos] + ["missing", memos[0].id]
+        results = await asyncio.gather(*(repo.find_by_id(memo_id) for memo_id in ids))
+        assert results == [*memos, None, memos[0]]
+        assert inner.batches == [[memo.id for memo in memos] + ["missing"]]
+        assert repo.stats.loads == 5
+        assert repo.stats.batches == 1
+
+    async def test_上限件数に達した場合_待たずに分けて問い合わせること(self) -> None:
+        """1回にまとめる上限に達した場合、上限ごとに分けて問い合わせること。"""
+        inner = _RecordingRepo()
+        repo = BatchingMemoRepository(inner, max_batch_size=2)
+        await asyncio.gather(*(repo.find_by_id(f"id-{i}") for i in range(5)))
+        assert [len(batch) for batch in inner.batches] == [2, 2, 1]
+
+    async def test_窓を指定した場合_窓の間に来た取得もまとめること(self) -> None:
+        """window_seconds を指定した場合、少し遅れて来た取得も同じ一括取得にまとめること。"""
+        inner = _RecordingRepo()
+        repo = BatchingMemoRepository(inner, window_seconds=0.05)
+
+        async def later() -> Optional[Memo]:
+            await asyncio.sleep(0.01)
+            return await repo.find_by_id("b")
+
+        await asyncio.gather(repo.find_by_id("a"), later())
+        assert inner.batches == [["a", "b"]]
+
+
+class TestBatchingMemoRepository異常系:
+    """異常系: 例外とキャンセルが待ち手ごとに正しく扱われること。"""
+
+    async def test_一括取得が例外を送出した場合_同じバッチの全員に伝わること(self) -> None:
+        """find_by_ids が例外を送出した場合、同じバッチの待ち手全員に例外が伝わること。"""
+        inner = _RecordingRepo()
+        inner.error = ConnectionError("db is down")
+        repo = BatchingMemoRepository(inner)
+        results = await asyncio.gather(
+            repo.find_by_id("a"), repo.find_by_id("b"), return_exceptions=True
+        )
+        assert all(isinstance(result, ConnectionError) for result in results)
+
+    async def test_待ち手の1つがキャンセルされた場合_他の待ち手は結果を受け取ること(self) -> None:
+        """待ち手の1つがキャンセルされても、同じバッチの他の待ち手は結果を受け取ること。"""
+        inner = _RecordingRepo()
+        memo = await inner.create("タイトル", "本文")
+        repo = BatchingMemoRepository(inner, window_seconds=0.01)
+        cancelled = asyncio.ensure_future(repo.find_by_id("a"))
+        kept = asyncio.ensure_future(repo.find_by_id(memo.id))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        assert await kept == memo
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
@@ -0,0 +1,244 @@
+"""キャッシュ付きリポジトリのテスト。"""
+
+import asyncio
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Optional
+
+import pytest
+
+from app.domain.memo import Memo, MemoDraft
+from app.domain.memo_page import MemoCollectionVersion, MemoCursor
+from app.domain.memo_search import MemoSearchHit
+from app.domain.memo_sync import MemoChanges, MemoSyncToken
+from app.infrastructure.cached_memo_repository import CachedMemoRepository
+from app.infrastructure.memo_cache import InMemoryLRUCache
+from app.usecases.memo_repository import MemoRepository
+
+
+class _CountingRepo(MemoRepository):
+    """find_by_id の呼び出し回数を数えるリポジトリ。"""
+
+    def __init__(self) -> None:
+        self.memos: dict[str, Memo] = {}
+        self.find_by_id_calls = 0
+
+    async def create(self, title: str, content: str) -> Memo:
+        now = datetime(2025, 2, 8, 12, 0, 0)
+        memo = Memo(
+            id=f"memo-{len(self.memos) + 1}",
+            title=title,
+            content=content,
+            created_at=now,
+            updated_at=now,
+        )
+        self.memos[memo.id] = memo
+        return memo
+
+    async def create_many(self, drafts: Sequence[MemoDraft]) -> Sequence[Memo]:
+        return [await self.create(d.title, d.content) for d in drafts]
+
+    async def find_all(self) -> Sequence[Memo]:
+        return list(self.memos.values())
+
+    async def find_page(self, limit: int, after: Optional[MemoCursor] = None) -> Sequence[Memo]:
+        return list(self.memos.values())[:limit]
+
+    async def find_by_id(self, memo_id: str) -> Optional[Memo]:
+        self.find_by_id_calls += 1
+        return self.memos.get(memo_id)
+
+    async def find_version(self, memo_id: str) -> Optional[datetime]:
+        memo = self.memos.get(memo_id)
+        return memo.updated_at if memo is not None else None
+
+    async def collection_version(self) -> MemoCollectionVersion:
+        return MemoCollectionVersion(count=len(self.memos), last_updated_at=None)
+
+    async def search(self, query: str, limit: int, offset: int = 0) -> Sequence[MemoSearchHit]:
+        return []
+
+    async def find_changes(self, since: MemoSyncToken, limit: int) -> MemoChanges:
+        return MemoChanges(changed=[], deleted=[], next_token=since, has_more=False)
+
+    async def update(self, memo: Memo) -> Memo:
+        self.memos[memo.id] = memo
+        return memo
+
+    async def patch(
+        self,
+        memo_id: str,
+        *,
+        title: Optional[str] = None,
+        content: Optional[str] = None,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Memo]:
+        memo = self.memos.get(memo_id)
+        if memo is None:
+            return None
+        if title is not None:
+            memo = memo.with_title(title)
+        self.memos[memo_id] = memo
+        return memo
+
+    async def delete_by_id(self, memo_id: str) -> bool:
+        return self.memos.pop(memo_id, None) is not None
+
+    async def delete_many(self, memo_ids: Sequence[str]) -> set[str]:
+        return {memo_id for memo_id in memo_ids if self.memos.pop(memo_id, None) is not None}
+
+
+class _SlowRepo(_CountingRepo):
+    """find_by_id が release されるまで返らない（読み込み中に更新が割り込む状況を作る）。"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def find_by_id(self, memo_id: str) -> Optional[Memo]:
+        memo = await super().find_by_id(memo_id)
+        self.started.set()
+        await self.release.wait()
+        return memo
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cached(inner: MemoRepository, clock: _Clock, max_entries: int = 10) -> CachedMemoRepository:
+    return CachedMemoRepository(
+        inner,
+        InMemoryLRUCache(max_entries=max_entries, clock=clock),
+        ttl_seconds=30,
+        negative_ttl_seconds=5,
+    )
+
+
+class TestCachedMemoRepository正常系:
+    """正常系: キャッシュのヒット・無効化の場合。"""
+
+    @pytest.mark.asyncio
+    async def test_同じIDを2回取得した場合_2回目は内側のリポジトリを呼ばないこと(self) -> None:
+        """同じ ID を2回取得した場合、2回目はキャッシュから返り内側を呼ばないこと。"""
+        inner = _CountingRepo()
+        created = await inner.create("タイトル", "本文")
+        repo = _cached(inner, _Clock())
+        assert await repo.find_by_id(created.id) == created
+        assert await repo.find_by_id(created.id) == created
+        assert inner.find_by_id_calls == 1
+        assert repo.stats.hits == 1
+        assert repo.stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_更新した場合_次の取得で更新後のメモが返ること(self) -> None:
+        """更新した場合、キャッシュが破棄され次の取得で更新後のメモが返ること。"""
+        inner = _CountingRepo()
+        created = await inner.create("旧タイトル", "本文")
+        repo = _cached(inner, _Clock())
+        await repo.find_by_id(created.id)
+        await repo.update(created.with_title("新タイトル"))
+        found = await repo.find_by_id(created.id)
+        assert found is not None
+        assert found.title == "新タイトル"
+
+    @pytest.mark.asyncio
+    async def test_部分更新した場合_次の取得で更新後のメモが返ること(self) -> None:
+        """部分更新した場合、キャッシュが破棄され次の取得で更新後のメモが返ること。"""
+        inner = _CountingRepo()
+        created = await inner.create("旧タイトル", "本文")
+        repo = _cached(inner, _Clock())
+        await repo.find_by_id(created.id)
+        await repo.patch(created.id, title="新タイトル")
+        found = await repo.find_by_id(created.id)
+        assert found is not None
+        assert found.title == "新タイトル"
+
+    @pytest.mark.asyncio
+    async def test_削除した場合_次の取得でNoneが返ること(self) -> None:
+        """削除した場合、キャッシュが破棄され次の取得で None が返ること。"""
+        inner = _CountingRepo()
+        created = await inner.create("タイトル", "本文")
+        repo = _cached(inner, _Clock())
+        await repo.find_by_id(created.id)
+        assert await repo.delete_by_id(created.id) is True
+        assert await repo.find_by_id(created.id) is None
+
+    @pytest.mark.asyncio
+    async def test_存在しないIDを取得した場合_期限内はネガティブキャッシュが使われること(
+        self,
+    ) -> None:
+        """存在しない ID を取得した場合、negative_ttl の間は内側を呼ばないこと。"""
+        inner = _CountingRepo()
+        clock = _Clock()
+        repo = _cached(inner, clock)
+        assert await repo.find_by_id("not-exist") is None
+        assert await repo.find_by_id("not-exist") is None
+        assert inner.find_by_id_calls == 1
+        clock.now = 6
+        assert await repo.find_by_id("not-exist") is None
+        assert inner.find_by_id_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_件数上限を超えた場合_最も古く使われたものから追い出されること(self) -> None:
+        """件数上限を超えた場合、最も古く使われたものから追い出され evictions が増えること。"""
+        inner = _CountingRepo()
+        first = await inner.create("1本目", "本文")
+        second = await inner.create("2本目", "本文")
+        repo = _cached(inner, _Clock(), max_entries=1)
+        await repo.find_by_id(first.id)
+        await repo.find_by_id(second.id)
+        await repo.find_by_id(first.id)
+        assert inner.find_by_id_calls == 3
+        assert repo.stats.evictions == 2
+
+    @pytest.mark.asyncio
+    async def test_複数IDで取得した場合_キャッシュに無いIDだけを問い合わせること(self) -> None:
+        """複数 ID で取得した場合、キャッシュ済みの ID は問い合わせず結果をキャッシュすること。"""
+        inner = _CountingRepo()
+        first = await inner.create("1本目", "本文")
+        second = await inner.create("2本目", "本文")
+        repo = _cached(inner, _Clock())
+        await repo.find_by_id(first.id)
+        found = await repo.find_by_ids([first.id, second.id, "missing"])
+        assert sorted(memo.id for memo in found) == [first.id, second.id]
+        assert inner.find_by_id_calls == 3
+        assert await repo.find_by_id(second.id) == second
+        assert await repo.find_by_id("missing") is None
+        assert inner.find_by_id_calls == 3
+
+    @pytest.mark.asyncio
+    async def test_他で更新された場合_find_versionはキャッシュを使わず新しい版を返すこと(
+        self,
+    ) -> None:
+        """別のワーカーが内側を更新した場合でも、find_version は新しい updated_at を返すこと。"""
+        inner = _CountingRepo()
+        created = await inner.create("タイトル", "本文")
+        repo = _cached(inner, _Clock())
+        await repo.find_by_id(created.id)
+        newer = datetime(2025, 2, 9, 12, 0, 0)
+        await inner.update(Memo(created.id, "別ワーカー", "本文", created.created_at, newer))
+        assert await repo.find_version(created.id) == newer
+
+
+class TestCachedMemoRepository異常系:
+    """異常系: 読み込みと更新が並行した場合。"""
+
+    @pytest.mark.asyncio
+    async def test_読み込み中に更新された場合_古い内容をキャッシュに載せないこと(self) -> None:
+        """更新前に始まった読み込みが更新後に終わった場合、その結果はキャッシュされないこと。"""
+        inner = _SlowRepo()
+        created = await inner.create("旧タイトル", "本文")
+        repo = _cached(inner, _Clock())
+        reading = asyncio.ensure_future(repo.find_by_id(created.id))
+        await inner.started.wait()
+        await repo.patch(created.id, title="新タイトル")
+        inner.release.set()
+        assert (await reading).title == "旧タイトル"
+        assert (await repo.find_by_id(created.id)).title == "新タイトル"
+        assert inner.find_by_id_calls == 2
@@ -0,0 +1,148 @@
+"""読み取りを相乗りさせるリポジトリのテスト。"""
+
+import asyncio
+from typing import Optional
+
+import pytest
+
+from app.infrastructure.coalescing_memo_repository import CoalescingMemoRepository
+from app.infrastructure.metrics import MetricsRegistry
+from tests.usecases.test_memo_use_cases import _FakeRepo
+
+
+class _GatedRepo(_FakeRepo):
+    """find_by_id / find_page を gate が開くまで止め、呼ばれた回数を数える。"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = asyncio.Event()
+        self.find_by_id_calls = 0
+        self.find_page_calls = 0
+        self.error: Optional[Exception] = None
+
+    async def find_by_id(self, memo_id: str):
+        self.find_by_id_calls += 1
+        await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return await super().find_by_id(memo_id)
+
+    async def find_page(self, limit: int, after=None):
+        self.find_page_calls += 1
+        await self.gate.wait()
+        return await super().find_page(limit, after=after)
+
+
+async def _settle() -> None:
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class TestCoalescingMemoRepository正常系:
+    """正常系: 同時の同じ読み取りが1回の問い合わせにまとまること。"""
+
+    async def test_同じIDを同時に取得した場合_問い合わせは1回で結果を共有すること(self) -> None:
+        """同じ ID の取得が同時に来た場合、内側は1回だけ呼ばれ全員が同じ結果を受け取ること。"""
+        inner = _GatedRepo()
+        memo = await inner.create(title="t", content="c")
+        registry = MetricsRegistry()
+        repo = CoalescingMemoRepository(inner, registry)
+        tasks = [asyncio.ensure_future(repo.find_by_id(memo.id)) for _ in range(10)]
+        await _settle()
+        inner.gate.set()
+        results = await asyncio.gather(*tasks)
+        assert inner.find_by_id_calls == 1
+        assert all(result == memo for result in results)
+        assert repo.stats.calls == 10
+        assert repo.stats.coalesced == 9
+        assert 'memo_repository_coalesced_total{operation="find_by_id"} 9' in registry.render()
+
+    async def test_引数が異なる場合_別々に問い合わせること(self) -> None:
+        """異なる ID や異なるページサイズの読み取りは、まとめずに別々に問い合わせること。"""
+        inner = _GatedRepo()
+        repo = CoalescingMemoRepository(inner)
+        tasks = [
+            asyncio.ensure_future(repo.find_by_id("a")),
+            asyncio.ensure_future(repo.find_by_id("b")),
+            asyncio.ensure_future(repo.find_page(10)),
+            asyncio.ensure_future(repo.find_page(20)),
+        ]
+        await _settle()
+        inner.gate.set()
+        await asyncio.gather(*tasks)
+        assert inner.find_by_id_calls == 2
+        assert inner.find_page_calls == 2
+        assert repo.stats.coalesced == 0
+
+    async def test_完了後に再度取得した場合_改めて問い合わせること(self) -> None:
+        """前の問い合わせが終わった後の読み取りは、結果を使い回さず改めて問い合わせること。"""
+        inner = _GatedRepo()
+        inner.gate.set()
+        repo = CoalescingMemoRepository(inner)
+        await repo.find_by_id("a")
+        await repo.find_by_id("a")
+        assert inner.find_by_id_calls == 2
+
+    async def test_読み取り中に更新した場合_後から来た読み取りは相乗りしないこと(self) -> None:
+        """読み取りの実行中に同じメモを更新した場合、更新後に来た読み取りは新たに問い合わせること。"""
+        inner = _GatedRepo()
+        memo = await inner.create(title="t", content="c")
+        repo = CoalescingMemoRepository(inner)
+        before = asyncio.ensure_future(repo.find_by_id(memo.id))
+        await _settle()
+        await repo.patch(memo.id, title="new")
+        after = asyncio.ensure_future(repo.find_by_id(memo.id))
+        await _settle()
+        inner.gate.set()
+        await asyncio.gather(before, after)
+        assert inner.find_by_id_calls == 2
+        assert after.result().title == "new"
+
+
+class TestCoalescingMemoRepository異常系:
+    """異常系: 例外とキャンセルが待ち手ごとに正しく扱われること。"""
+
+    async def test_内側が例外を送出した場合_待ち手全員に伝わり次は再実行すること(self) -> None:
+        """内側が例外を送出した場合、相乗りした全員に例外が伝わり、次の呼び出しは改めて問い合わせること。"""
+        inner = _GatedRepo()
+        inner.error = ConnectionError("db is down")
+        repo = CoalescingMemoRepository(inner)
+        tasks = [asyncio.ensure_future(repo.find_by_id("a")) for _ in range(3)]
+        await _settle()
+        inner.gate.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(result, ConnectionError) for result in results)
+        inner.error = None
+        assert await repo.find_by_id("a") is None
+        assert inner.find_by_id_calls == 2
+
+    async def test_待ち手の1つがキャンセルされた場合_他の待ち手は結果を受け取ること(self) -> None:
+        """最初に呼んだ待ち手がキャンセルされても、問い合わせは続き他の待ち手は結果を受け取ること。"""
+        inner = _GatedRepo()
+        memo = await inner.create(title="t", content="c")
+        repo = CoalescingMemoRepository(inner)
+        leader = asyncio.ensure_future(repo.find_by_id(memo.id))
+        follower = asyncio.ensure_future(repo.find_by_id(memo.id))
+        await _settle()
+        leader.cancel()
+        await _settle()
+        inner.gate.set()
+        assert await follower == memo
+        assert leader.cancelled()
+        assert inner.find_by_id_calls == 1
+
+    async def test_待ち手が全員キャンセルされた場合_問い合わせもキャンセルされること(self) -> None:
+        """待ち手が全員キャンセルされた場合、内側の問い合わせもキャンセルされ次は再実行すること。"""
+        inner = _GatedRepo()
+        repo = CoalescingMemoRepository(inner)
+        tasks = [asyncio.ensure_future(repo.find_by_id("a")) for _ in range(2)]
+        await _settle()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        await _settle()
+        inner.gate.set()
+        await repo.find_by_id("a")
+        assert inner.find_by_id_calls == 2
@@ -0,0 +1,107 @@
+"""メモ作成をまとめるリポジトリのテスト。"""
+
+import asyncio
+from collections.abc import Sequence
+from typing import Optional
+
+import pytest
+
+from app.domain.memo import Memo, MemoDraft
+from app.infrastructure.create_batching_memo_repository import CreateBatchingMemoRepository
+from tests.usecases.test_memo_use_cases import _FakeRepo
+
+
+class _RecordingRepo(_FakeRepo):
+    """create_many に渡されたタイトルの一覧を記録する。release を設定すると書き込みを止める。"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[list[str]] = []
+        self.error: Optional[Exception] = None
+        self.release: Optional[asyncio.Event] = None
+
+    async def create_many(self, drafts: Sequence[MemoDraft]) -> list[Memo]:
+        self.batches.append([d.title for d in drafts])
+        if self.release is not None:
+            await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return await super().create_many(drafts)
+
+
+class TestCreateBatchingMemoRepository正常系:
+    """正常系: 並行した作成が1回の一括作成にまとまり、各自に自分のメモが返ること。"""
+
+    async def test_並行して作成した場合_1回の一括作成で各自のメモが返ること(self) -> None:
+        """並行して作成した場合、一括作成は1回で、来た順に各自のメモが返ること。"""
+        inner = _RecordingRepo()
+        repo = CreateBatchingMemoRepository(inner, window_seconds=0.0)
+        memos = await asyncio.gather(*(repo.create(f"t{i}", "本文") for i in range(3)))
+        assert [memo.title for memo in memos] == ["t0", "t1", "t2"]
+        assert inner.batches == [["t0", "t1", "t2"]]
+        assert all(inner.memos[memo.id] == memo for memo in memos)
+        assert repo.stats.creates == 3
+        assert repo.stats.batches == 1
+
+    async def test_上限件数に達した場合_期限を待たずに分けて書き込むこと(self) -> None:
+        """1回にまとめる上限に達した場合、期限を待たずに上限ごとに分けて書き込むこと。"""
+        inner = _RecordingRepo()
+        repo = CreateBatchingMemoRepository(inner, window_seconds=10.0, max_batch_size=2)
+        created = asyncio.ensure_future(
+            asyncio.gather(*(repo.create(f"t{i}", "本文") for i in range(4)))
+        )
+        await asyncio.wait_for(created, timeout=1.0)
+        assert inner.batches == [["t0", "t1"], ["t2", "t3"]]
+
+    async def test_閉じた場合_書き込み待ちをすぐに書き込むこと(self) -> None:
+        """close() した場合、期限を待たずに書き込み待ちを書き込んでから戻ること。"""
+        inner = _RecordingRepo()
+        repo = CreateBatchingMemoRepository(inner, window_seconds=10.0)
+        pending = asyncio.ensure_future(repo.create("t", "本文"))
+        await asyncio.sleep(0)
+        await repo.close()
+        assert inner.batches == [["t"]]
+        assert (await pending).title == "t"
+
+
+class TestCreateBatchingMemoRepository異常系:
+    """異常系: 例外・書き込み待ちの上限・キャンセルの扱い。"""
+
+    async def test_一括作成が例外を送出した場合_同じバッチの全員に伝わること(self) -> None:
+        """create_many が例外を送出した場合、同じバッチの呼び出し全員に例外が伝わること。"""
+        inner = _RecordingRepo()
+        inner.error = ConnectionError("db is down")
+        repo = CreateBatchingMemoRepository(inner, window_seconds=0.0)
+        results = await asyncio.gather(
+            repo.create("a", "本文"), repo.create("b", "本文"), return_exceptions=True
+        )
+        assert all(isinstance(result, ConnectionError) for result in results)
+
+    async def test_書き込み待ちが上限に達した場合_空くまで待たせること(self) -> None:
+        """書き込みが終わっていない作成が上限に達した場合、次の作成は空くまで待つこと。"""
+        inner = _RecordingRepo()
+        inner.release = asyncio.Event()
+        repo = CreateBatchingMemoRepository(inner, window_seconds=0.0, max_pending=2)
+        first = asyncio.ensure_future(asyncio.gather(repo.create("a", ""), repo.create("b", "")))
+        await asyncio.sleep(0.01)
+        third = asyncio.ensure_future(repo.create("c", ""))
+        await asyncio.sleep(0.01)
+        # a・b の書き込みが終わるまで c はキューに入らない
+        assert inner.batches == [["a", "b"]]
+        inner.release.set()
+        await first
+        assert (await third).title == "c"
+        assert inner.batches == [["a", "b"], ["c"]]
+
+    async def test_書き込み前にキャンセルされた場合_その作成は書き込まないこと(self) -> None:
+        """書き込み前に呼び出しがキャンセルされた場合、その作成は書き込まないこと。"""
+        inner = _RecordingRepo()
+        repo = CreateBatchingMemoRepository(inner, window_seconds=0.01)
+        cancelled = asyncio.ensure_future(repo.create("a", ""))
+        kept = asyncio.ensure_future(repo.create("b", ""))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        assert (await kept).title == "b"
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert inner.batches == [["b"]]
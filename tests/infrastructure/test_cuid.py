@@ -0,0 +1,44 @@
+"""cuid 採番のテスト。"""
+
+import os
+
+import pytest
+
+from app.infrastructure.cuid import new_cuid
+
+
+def _new_cuid_in_child() -> str:
+    """fork した子プロセスで1件採番して返す。"""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            os.write(write_fd, new_cuid().encode())
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as r:
+        value = r.read()
+    os.waitpid(pid, 0)
+    return value
+
+
+class TestNewCuid正常系:
+    """正常系: cuid 形式の ID が採番順に並ぶこと。"""
+
+    def test_連続して採番した場合_cuid形式で採番順に昇順になること(self) -> None:
+        """連続して採番した場合、c から始まる25文字で、採番順に文字列として昇順になること。"""
+        ids = [new_cuid() for _ in range(1000)]
+        assert all(i.startswith("c") and len(i) == 25 for i in ids)
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="fork が無い環境")
+    def test_forkした子プロセスの場合_指紋が親と異なりカウンタが0から始まること(self) -> None:
+        """fork した子プロセスの場合、pid の指紋を作り直し、カウンタも0から数えること。"""
+        parent = new_cuid()
+        child = _new_cuid_in_child()
+        # c・時刻8文字・カウンタ4文字・指紋4文字・乱数8文字
+        assert child[-12:-8] != parent[-12:-8]
+        assert child[-16:-12] == "0000"
@@ -0,0 +1,206 @@
+"""インメモリリポジトリ（索引によるページング・ログとスナップショットからの復元）のテスト。"""
+
+import json
+import os
+
+import pytest
+
+from app.domain.memo import MemoDraft, MemoVersionConflictError
+from app.domain.memo_page import MemoCursor
+from app.domain.memo_sync import MemoSyncToken
+from app.infrastructure.in_memory_memo_repository import (
+    LOG_FILE,
+    SNAPSHOT_FILE,
+    InMemoryMemoRepository,
+)
+
+
+class TestInMemoryMemoRepository正常系:
+    """正常系: MemoRepository として振る舞うこと。"""
+
+    async def test_カーソルで辿った場合_作成順に重複なく全件を返すこと(self) -> None:
+        """find_page をカーソルで辿った場合、(created_at, id) 順に重複・欠落なく返すこと。"""
+        repo = InMemoryMemoRepository()
+        created = await repo.create_many([MemoDraft(f"t{i}", "c") for i in range(25)])
+        seen = []
+        after = None
+        while True:
+            page = await repo.find_page(10, after=after)
+            if not page:
+                break
+            seen.extend(m.id for m in page)
+            after = MemoCursor.after(page[-1])
+        assert seen == [m.id for m in created]
+
+    async def test_要約を取得した場合_ページと同じ並びで本文の代わりに文字数を返すこと(
+        self,
+    ) -> None:
+        """find_summary_page の場合、find_page と同じ範囲を本文の文字数と先頭部分で返すこと。"""
+        repo = InMemoryMemoRepository()
+        created = await repo.create_many([MemoDraft(f"t{i}", "x" * 200) for i in range(3)])
+        summaries = await repo.find_summary_page(2, after=MemoCursor.after(created[0]))
+        assert [s.id for s in summaries] == [m.id for m in created[1:]]
+        assert {(s.content_length, len(s.preview)) for s in summaries} == {(200, 120)}
+
+    async def test_部分更新した場合_更新日時が進み索引も更新されること(self) -> None:
+        """patch した場合、updated_at が前より進み、検索結果も新しいタイトルになること。"""
+        repo = InMemoryMemoRepository()
+        memo = await repo.create("買い物", "牛乳")
+        patched = await repo.patch(memo.id, title="散歩", expected_updated_at=memo.updated_at)
+        assert patched is not None
+        assert patched.updated_at > memo.updated_at
+        assert patched.created_at == memo.created_at
+        assert [h.memo.id for h in await repo.search("散歩", 10)] == [memo.id]
+        assert await repo.search("買い物", 10) == []
+
+    async def test_削除した場合_取得も一覧も件数も消えること(self) -> None:
+        """delete_many した場合、削除できた ID だけを返し、一覧と件数から消えること。"""
+        repo = InMemoryMemoRepository()
+        a, b = await repo.create_many([MemoDraft("a", "1"), MemoDraft("b", "2")])
+        assert await repo.delete_many([a.id, "missing"]) == {a.id}
+        assert await repo.find_by_id(a.id) is None
+        assert [m.id for m in await repo.find_all()] == [b.id]
+        assert (await repo.collection_version()).count == 1
+
+    async def test_再起動した場合_スナップショットとログから復元されること(self, tmp_path) -> None:
+        """close せずに止まった場合でも、次に load するとログの変更まで復元されること。"""
+        repo = InMemoryMemoRepository(data_dir=str(tmp_path), snapshot_every=3)
+        await repo.load()
+        created = await repo.create_many([MemoDraft(f"t{i}", "c") for i in range(3)])
+        # ここまででスナップショットが作られ、以降の変更はログにだけ残る
+        await repo.patch(created[0].id, title="edited")
+        await repo.delete_by_id(created[1].id)
+
+        restored = InMemoryMemoRepository(data_dir=str(tmp_path))
+        await restored.load()
+        assert [m.title for m in await restored.find_all()] == ["edited", "t2"]
+        assert await restored.find_by_id(created[0].id) == await repo.find_by_id(created[0].id)
+
+    async def test_closeした場合_ログが空になりスナップショットだけで復元できること(
+        self, tmp_path
+    ) -> None:
+        """close した場合、ログが空になり、スナップショットだけで同じ内容を復元できること。"""
+        repo = InMemoryMemoRepository(data_dir=str(tmp_path))
+        await repo.load()
+        await repo.create("a", "1")
+        await repo.close()
+        assert os.path.getsize(tmp_path / LOG_FILE) == 0
+        restored = InMemoryMemoRepository(data_dir=str(tmp_path))
+        await restored.load()
+        assert [m.title for m in await restored.find_all()] == ["a"]
+
+    async def test_差分を辿った場合_前回以降の変更と削除だけを連番順に返すこと(self) -> None:
+        """初回は削除の記録を除いた全件、次回は前回以降の作成・更新・削除だけを返すこと。"""
+        repo = InMemoryMemoRepository()
+        a, b, c = await repo.create_many([MemoDraft(x, "1") for x in "abc"])
+        await repo.delete_by_id(c.id)
+        first = await repo.find_changes(MemoSyncToken(), 10)
+        assert [m.id for m in first.changed] == [a.id, b.id]
+        assert first.deleted == []
+        assert not first.has_more
+
+        await repo.patch(a.id, title="a2")
+        await repo.create("d", "1")
+        await repo.delete_by_id(b.id)
+        page = await repo.find_changes(first.next_token, 2)
+        assert [m.title for m in page.changed] == ["a2", "d"]
+        assert page.has_more
+        rest = await repo.find_changes(page.next_token, 2)
+        assert [m.id for m in rest.changed] == []
+        assert [t.id for t in rest.deleted] == [b.id]
+        assert not rest.has_more
+        assert (await repo.find_changes(rest.next_token, 10)).changed == []
+
+    async def test_初回の同期が複数ページの場合_最後まで削除の記録を返さないこと(self) -> None:
+        """初回の同期を複数ページで辿った場合、途中のページでも削除の記録を返さず、
+        途中で削除されたメモは次回の同期で返すこと。"""
+        repo = InMemoryMemoRepository()
+        a, b, c, d = await repo.create_many([MemoDraft(x, "1") for x in "abcd"])
+        await repo.delete_by_id(d.id)
+        first = await repo.find_changes(MemoSyncToken(), 2)
+        assert [m.id for m in first.changed] == [a.id, b.id]
+        assert first.has_more
+        assert first.next_token.is_initial
+
+        await repo.delete_by_id(a.id)
+        rest = await repo.find_changes(first.next_token, 2)
+        assert [m.id for m in rest.changed] == [c.id]
+        assert rest.deleted == []
+        assert not rest.has_more
+        assert not rest.next_token.is_initial
+        after = await repo.find_changes(rest.next_token, 10)
+        assert after.changed == []
+        assert [t.id for t in after.deleted] == [a.id]
+
+    async def test_再起動した場合_削除の記録と変更の連番も復元されること(self, tmp_path) -> None:
+        """スナップショット・ログから復元した場合、前回のトークンの続きから差分を返すこと。"""
+        repo = InMemoryMemoRepository(data_dir=str(tmp_path), snapshot_every=3)
+        await repo.load()
+        a, b = await repo.create_many([MemoDraft("a", "1"), MemoDraft("b", "2")])
+        token = (await repo.find_changes(MemoSyncToken(), 10)).next_token
+        await repo.delete_by_id(a.id)
+        # ここでスナップショットが作られ、以降の変更はログにだけ残る
+        await repo.patch(b.id, title="b2")
+
+        restored = InMemoryMemoRepository(data_dir=str(tmp_path))
+        await restored.load()
+        changes = await restored.find_changes(token, 10)
+        assert [m.title for m in changes.changed] == ["b2"]
+        assert [t.id for t in changes.deleted] == [a.id]
+        assert changes.next_token == (await repo.find_changes(token, 10)).next_token
+
+    async def test_閾値以上の本文の場合_圧縮して持ち要約と取得で元の本文を返すこと(
+        self, tmp_path
+    ) -> None:
+        """閾値以上の本文は圧縮して保存し、取得・要約・検索・再起動後も元の本文どおりであること。"""
+        repo = InMemoryMemoRepository(data_dir=str(tmp_path), compress_min_bytes=1024)
+        await repo.load()
+        content = "長い 本文 " * 500
+        memo = await repo.create("大きい", content)
+        small = await repo.create("小さい", "短い本文")
+        await repo.patch(memo.id, title="大きい2")
+        with open(tmp_path / LOG_FILE, encoding="utf-8") as f:
+            logged = [json.loads(line)["memo"] for line in f]
+        assert [m.get("content_encoding") for m in logged] == ["zlib", None, "zlib"]
+        assert len(logged[0]["content"]) < len(content.encode())
+
+        [summary, _] = await repo.find_summary_page(10)
+        assert (summary.content_length, summary.preview) == (len(content), content[:120])
+        assert (await repo.find_by_id(memo.id)).content == content
+        assert [h.memo.id for h in await repo.search("本文", 10)] == [memo.id]
+        await repo.close()
+        restored = InMemoryMemoRepository(data_dir=str(tmp_path), compress_min_bytes=0)
+        await restored.load()
+        assert [m.content for m in await restored.find_all()] == [content, small.content]
+        assert await restored.find_summary_page(10) == await repo.find_summary_page(10)
+
+
+class TestInMemoryMemoRepository異常系:
+    """異常系: 競合・壊れたログへの対応。"""
+
+    async def test_版が一致しない場合_MemoVersionConflictErrorになること(self) -> None:
+        """expected_updated_at が現在と違う場合、競合エラーになり変更されないこと。"""
+        repo = InMemoryMemoRepository()
+        memo = await repo.create("a", "1")
+        await repo.patch(memo.id, title="b")
+        with pytest.raises(MemoVersionConflictError):
+            await repo.patch(memo.id, title="c", expected_updated_at=memo.updated_at)
+        assert (await repo.find_by_id(memo.id)).title == "b"
+
+    async def test_ログの最後の行が途中で切れている場合_それより前まで復元すること(
+        self, tmp_path
+    ) -> None:
+        """壊れた末尾の行を捨ててそれより前まで復元し、以降の追記も次回に復元できること。"""
+        repo = InMemoryMemoRepository(data_dir=str(tmp_path))
+        await repo.load()
+        await repo.create("a", "1")
+        with open(tmp_path / LOG_FILE, "a", encoding="utf-8") as f:
+            f.write('{"op": "put", "memo": {"id": "x"')
+        restored = InMemoryMemoRepository(data_dir=str(tmp_path))
+        await restored.load()
+        assert [m.title for m in await restored.find_all()] == ["a"]
+        assert not (tmp_path / SNAPSHOT_FILE).exists()
+        await restored.create("b", "2")
+        again = InMemoryMemoRepository(data_dir=str(tmp_path))
+        await again.load()
+        assert [m.title for m in await again.find_all()] == ["a", "b"]
@@ -0,0 +1,56 @@
+"""計測付きリポジトリのテスト。"""
+
+import pytest
+
+from app.domain.memo import MemoDraft
+from app.infrastructure.instrumented_memo_repository import InstrumentedMemoRepository
+from app.infrastructure.metrics import MetricsRegistry
+from tests.usecases.test_memo_use_cases import _FakeRepo
+
+
+def _samples(registry: MetricsRegistry) -> dict[str, float]:
+    lines = registry.render().splitlines()
+    return {
+        name: float(value)
+        for name, value in (line.rsplit(" ", 1) for line in lines if not line.startswith("#"))
+    }
+
+
+class TestInstrumentedMemoRepository正常系:
+    """正常系: 呼び出しごとに所要時間と行数が記録されること。"""
+
+    async def test_一括作成と1件取得をした場合_回数と行数が記録されること(self) -> None:
+        """一括作成・1件取得をした場合、メソッドごとの回数と行数の合計が記録されること。"""
+        registry = MetricsRegistry()
+        repo = InstrumentedMemoRepository(_FakeRepo(), registry)
+        created = await repo.create_many([MemoDraft("a", "1"), MemoDraft("b", "2")])
+        await repo.find_by_id(created[0].id)
+        await repo.find_by_id("missing")
+        samples = _samples(registry)
+        assert samples['memo_repository_operation_seconds_count{operation="create_many"}'] == 1
+        assert samples['memo_repository_rows_sum{operation="create_many"}'] == 2
+        assert samples['memo_repository_operation_seconds_count{operation="find_by_id"}'] == 2
+        # 見つからなかった呼び出しは 0 行として数える
+        assert samples['memo_repository_rows_bucket{operation="find_by_id",le="0"}'] == 1
+        assert samples['memo_repository_rows_sum{operation="find_by_id"}'] == 1
+
+
+class TestInstrumentedMemoRepository異常系:
+    """異常系: 例外を送出した呼び出しはエラーとして数えること。"""
+
+    async def test_内側が例外を送出した場合_エラー数を数えて例外を伝えること(self) -> None:
+        """内側のリポジトリが例外を送出した場合、エラー数と所要時間を記録し、例外をそのまま送出すること。"""
+        registry = MetricsRegistry()
+        inner = _FakeRepo()
+
+        async def broken(memo_id: str):
+            raise ConnectionError("db is down")
+
+        inner.find_by_id = broken
+        repo = InstrumentedMemoRepository(inner, registry)
+        with pytest.raises(ConnectionError):
+            await repo.find_by_id("x")
+        samples = _samples(registry)
+        assert samples['memo_repository_errors_total{operation="find_by_id"}'] == 1
+        assert samples['memo_repository_operation_seconds_count{operation="find_by_id"}'] == 1
+        assert samples['memo_repository_rows_count{operation="find_by_id"}'] == 0
@@ -0,0 +1,347 @@
+"""メモ変更イベントの配送（bus）と、LISTEN / NOTIFY でのプロセス間の共有のテスト。"""
+
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+import pytest
+
+from app.domain.memo_event import MemoEvent
+from app.infrastructure import pg_notify_bridge
+from app.infrastructure.memo_event_bus import MemoEventBus, MemoEventReset, SequencedMemoEvent
+from app.infrastructure.pg_notify_bridge import (
+    PgNotifyBridge,
+    asyncpg_dsn,
+    decode_event,
+    encode_event,
+)
+
+
+def _event(memo_id: str, kind: str = "created") -> MemoEvent:
+    return MemoEvent(
+        kind=kind, memo_id=memo_id, occurred_at=datetime(2026, 1, 1, tzinfo=timezone.utc)
+    )
+
+
+async def _drain(subscription, count: int) -> list:
+    return [await subscription.next(timeout=0.1) for _ in range(count)]
+
+
+class _FakeServer:
+    """asyncpg の代わりに、同じプロセスの中で NOTIFY を LISTEN 中の接続に配る。"""
+
+    def __init__(self) -> None:
+        self.connections: list[_FakeConnection] = []
+        self.connect_errors: list[BaseException] = []
+        self.peer_fd: Optional[int] = None
+
+    def relay(self, read_fd: int, write_fd: int) -> None:
+        """別のプロセスの _FakeServer と、パイプ越しに NOTIFY をやり取りする。"""
+        self.peer_fd = write_fd
+        pending = bytearray()
+
+        def on_readable() -> None:
+            pending.extend(os.read(read_fd, 4096))
+            while b"\n" in pending:
+                line, _, rest = bytes(pending).partition(b"\n")
+                pending[:] = rest
+                channel, payload = json.loads(line)
+                self.deliver(channel, payload)
+
+        asyncio.get_running_loop().add_reader(read_fd, on_readable)
+
+    def deliver(self, channel: str, payload: str) -> None:
+        loop = asyncio.get_running_loop()
+        for conn in self.connections:
+            callback = conn._listeners.get(channel)
+            if callback is not None and not conn.is_closed():
+                loop.call_soon(callback, conn, 1, channel, payload)
+
+    async def connect(self, dsn: str) -> "_FakeConnection":
+        if self.connect_errors:
+            raise self.connect_errors.pop(0)
+        conn = _FakeConnection(self)
+        self.connections.append(conn)
+        return conn
+
+
+class _FakeConnection:
+    def __init__(self, server: _FakeServer) -> None:
+        self._server = server
+        self._listeners: dict[str, Callable] = {}
+        self._on_terminated: Optional[Callable] = None
+        self._closed = False
+        self.execute_errors: list[BaseException] = []
+        self.blocked: Optional[asyncio.Event] = None
+
+    async def add_listener(self, channel: str, callback: Callable) -> None:
+        self._listeners[channel] = callback
+
+    def add_termination_listener(self, callback: Callable) -> None:
+        self._on_terminated = callback
+
+    async def execute(self, query: str, channel: str, payload: str) -> None:
+        if self.blocked is not None:
+            await self.blocked.wait()
+        if self.execute_errors:
+            raise self.execute_errors.pop(0)
+        self._server.deliver(channel, payload)
+        if self._server.peer_fd is not None:
+            os.write(self._server.peer_fd, json.dumps([channel, payload]).encode() + b"\n")
+
+    def is_closed(self) -> bool:
+        return self._closed
+
+    async def close(self) -> None:
+        self._closed = True
+
+    def terminate(self) -> None:
+        """サーバー側から切られた場合。"""
+        self._closed = True
+        self._on_terminated(self)
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> _FakeServer:
+    fake = _FakeServer()
+    monkeypatch.setattr(pg_notify_bridge, "asyncpg", SimpleNamespace(connect=fake.connect))
+    return fake
+
+
+class TestMemoEventBus正常系:
+    """正常系: 購読者への配送と、再接続時の続きの再現。"""
+
+    async def test_発行した場合_購読者全員に連番付きで届くこと(self) -> None:
+        """発行した場合、購読者全員に発行順の連番付きで届くこと。"""
+        bus = MemoEventBus(epoch="e1")
+        first, second = bus.subscribe(), bus.subscribe()
+        bus.publish(_event("a"))
+        bus.publish(_event("b", "deleted"))
+        for subscription in (first, second):
+            messages = await _drain(subscription, 2)
+            assert [m.event_id for m in messages] == ["e1-1", "e1-2"]
+            assert [m.event.memo_id for m in messages] == ["a", "b"]
+        assert bus.last_event_id == "e1-2"
+
+    async def test_最後のIDを渡して購読した場合_その続きから届くこと(self) -> None:
+        """最後に受け取った ID を渡して購読した場合、その続きのイベントから届くこと。"""
+        bus = MemoEventBus(epoch="e1", queue_size=1)
+        for memo_id in ("a", "b", "c"):
+            bus.publish(_event(memo_id))
+        subscription = bus.subscribe("e1-1")
+        messages = await _drain(subscription, 2)
+        assert [m.event.memo_id for m in messages] == ["b", "c"]
+        assert await subscription.next(timeout=0.01) is None
+
+    async def test_転送先を登録した場合_自分の発行だけ転送されること(self) -> None:
+        """転送先を登録した場合、publish は転送され publish_remote は転送されないこと。"""
+        bus = MemoEventBus(epoch="e1")
+        forwarded: list[str] = []
+        bus.add_forwarder(lambda event: forwarded.append(event.memo_id))
+        subscription = bus.subscribe()
+        bus.publish(_event("local"))
+        bus.publish_remote(_event("remote"))
+        assert forwarded == ["local"]
+        messages = await _drain(subscription, 2)
+        assert [m.event.memo_id for m in messages] == ["local", "remote"]
+
+    async def test_閉じた場合_待っている購読者にリセットが届いて終わること(self) -> None:
+        """閉じた場合、イベントを待っている購読者にすぐリセットが届き、購読が終わること。"""
+        bus = MemoEventBus(epoch="e1")
+        subscription = bus.subscribe()
+        waiting = asyncio.ensure_future(subscription.next(timeout=10.0))
+        await asyncio.sleep(0)
+        bus.close()
+        assert await asyncio.wait_for(waiting, timeout=1.0) == MemoEventReset("e1-0")
+        assert subscription.closed
+        assert len(bus) == 0
+
+
+class TestMemoEventBus異常系:
+    """異常系: 続きを再現できない場合と、受け取りが追いつかない場合。"""
+
+    @pytest.mark.parametrize("last_event_id", ["other-1", "e1-9", "broken"])
+    async def test_別エポックや不正なIDの場合_リセットが届くこと(self, last_event_id: str) -> None:
+        """別のエポック・未来の連番・不正な ID の場合、最新 ID のリセットが届くこと。"""
+        bus = MemoEventBus(epoch="e1")
+        bus.publish(_event("a"))
+        subscription = bus.subscribe(last_event_id)
+        assert await subscription.next(timeout=0.1) == MemoEventReset("e1-1")
+
+    async def test_バッファから消えたIDの場合_リセットが届くこと(self) -> None:
+        """バッファから押し出された ID の場合、間が抜けるためリセットが届くこと。"""
+        bus = MemoEventBus(epoch="e1", buffer_size=2)
+        for memo_id in ("a", "b", "c"):
+            bus.publish(_event(memo_id))
+        assert await bus.subscribe("e1-0").next(timeout=0.1) == MemoEventReset("e1-3")
+        replayed = await bus.subscribe("e1-1").next(timeout=0.1)
+        assert isinstance(replayed, SequencedMemoEvent)
+        assert replayed.event.memo_id == "b"
+
+    async def test_キューがあふれた場合_溜まった分の後にリセットを返して閉じること(self) -> None:
+        """キューがあふれた場合、溜まった分を返した後にリセットを返し、購読を閉じること。"""
+        bus = MemoEventBus(epoch="e1", queue_size=1)
+        subscription = bus.subscribe()
+        for memo_id in ("a", "b", "c"):
+            bus.publish(_event(memo_id))
+        first = await subscription.next(timeout=0.1)
+        assert first.event.memo_id == "a"
+        assert await subscription.next(timeout=0.1) == MemoEventReset("e1-3")
+        assert subscription.closed
+        assert len(bus) == 0
+
+
+class TestPgNotifyPayload正常系:
+    """正常系: NOTIFY のペイロードと接続 URL の変換。"""
+
+    def test_エンコードしたペイロードの場合_同じ送り元とイベントに戻ること(self) -> None:
+        """encode_event の結果を decode_event した場合、同じ送り元とイベントに戻ること。"""
+        event = _event("a", "updated")
+        assert decode_event(encode_event("e1", event)) == ("e1", event)
+
+    def test_Prisma用のパラメータがある場合_取り除かれること(self) -> None:
+        """Prisma 専用のパラメータがある場合、取り除いてほかは残すこと。"""
+        url = "postgresql://u:p@db:5432/app?connection_limit=5&pgbouncer=true&sslmode=require"
+        assert asyncpg_dsn(url) == "postgresql://u:p@db:5432/app?sslmode=require"
+
+
+class TestPgNotifyPayload異常系:
+    """異常系: 不正なペイロードの場合。"""
+
+    @pytest.mark.parametrize("payload", ['{"origin": "e1"}', "[]", "not json"])
+    def test_不正なペイロードの場合_ValueErrorになること(self, payload: str) -> None:
+        """必要な項目が無い・JSON でないペイロードの場合、ValueError になること。"""
+        with pytest.raises(ValueError):
+            decode_event(payload)
+
+
+class TestPgNotifyBridge正常系:
+    """正常系: 2つのプロセス（bus）のイベントを LISTEN / NOTIFY で共有すること。"""
+
+    async def test_2つのbusをつないだ場合_互いのイベントが1回ずつ届くこと(
+        self, server: _FakeServer
+    ) -> None:
+        """2つの bus をつないだ場合、どちらの発行も両方の購読者に1回ずつ届くこと。"""
+        first, second = MemoEventBus(epoch="w1"), MemoEventBus(epoch="w2")
+        bridges = [PgNotifyBridge(first, "dsn"), PgNotifyBridge(second, "dsn")]
+        for bridge in bridges:
+            await bridge.start()
+        first_sub, second_sub = first.subscribe(), second.subscribe()
+        first.publish(_event("a"))
+        second.publish(_event("b", "deleted"))
+        for bridge in bridges:
+            await bridge.close()
+        for subscription, epoch in ((first_sub, "w1"), (second_sub, "w2")):
+            messages = await _drain(subscription, 2)
+            assert sorted(m.event.memo_id for m in messages) == ["a", "b"]
+            assert [m.event_id for m in messages] == [f"{epoch}-1", f"{epoch}-2"]
+            assert await subscription.next(timeout=0.01) is None
+        assert [(b.sent, b.received) for b in bridges] == [(1, 1), (1, 1)]
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="fork が無い環境")
+    def test_読み込み後にforkした2ワーカーの場合_別のエポックで互いのイベントが届くこと(
+        self, server: _FakeServer
+    ) -> None:
+        """app.server のように bus を作ってから2つに fork した場合、各ワーカーのエポックは
+        親とも互いとも異なり、相手の NOTIFY を自分のものとして捨てずに購読者へ配ること。"""
+        bus = MemoEventBus()  # app.main の読み込み時に作られる bus
+        to_second, to_first = os.pipe(), os.pipe()
+        workers = [
+            _fork_worker(bus, server, "a", read_fd=to_first[0], write_fd=to_second[1]),
+            _fork_worker(bus, server, "b", read_fd=to_second[0], write_fd=to_first[1]),
+        ]
+        results = [_wait_worker(*worker) for worker in workers]
+        for fd in (*to_second, *to_first):
+            os.close(fd)
+
+        epochs = {result["epoch"] for result in results}
+        assert len(epochs) == 2
+        assert bus.epoch not in epochs
+        assert [result["received"] for result in results] == [["a", "b"], ["a", "b"]]
+
+
+def _fork_worker(
+    bus: MemoEventBus, server: _FakeServer, memo_id: str, *, read_fd: int, write_fd: int
+) -> tuple[int, int]:
+    """fork した子プロセスで bus に bridge をつなぎ、memo_id のイベントを1件発行する。
+
+    子プロセスは自分と相手の2件を受け取るまで待ち、結果を JSON でパイプに書いて終わる。
+    """
+    result_read, result_write = os.pipe()
+    pid = os.fork()
+    if pid != 0:
+        os.close(result_write)
+        return pid, result_read
+
+    async def work() -> dict:
+        server.relay(read_fd, write_fd)
+        bridge = PgNotifyBridge(bus, "dsn")
+        await bridge.start()
+        subscription = bus.subscribe()
+        bus.publish(_event(memo_id))
+        received = [await subscription.next(timeout=5.0) for _ in range(2)]
+        await bridge.close()
+        return {
+            "epoch": bus.epoch,
+            "received": sorted(m.event.memo_id for m in received if m is not None),
+        }
+
+    try:
+        result = asyncio.run(work())
+        os.write(result_write, json.dumps(result).encode())
+    finally:
+        os._exit(0)
+
+
+def _wait_worker(pid: int, result_fd: int) -> dict:
+    with os.fdopen(result_fd) as r:
+        output = r.read()
+    os.waitpid(pid, 0)
+    return json.loads(output)
+
+
+class TestPgNotifyBridge異常系:
+    """異常系: 送信・再接続の失敗や、送信待ちがあふれた場合。"""
+
+    async def test_送信で想定外の例外が出た場合_次のイベントから送り続けること(
+        self, server: _FakeServer
+    ) -> None:
+        """NOTIFY が想定外の例外で失敗した場合、送信タスクが止まらず次のイベントを送ること。"""
+        bridge = PgNotifyBridge(MemoEventBus(epoch="w1"), "dsn")
+        await bridge.start()
+        server.connections[0].execute_errors.append(RuntimeError("boom"))
+        bridge._bus.publish(_event("a"))
+        bridge._bus.publish(_event("b"))
+        await bridge.close()
+        assert bridge.sent == 1
+
+    async def test_送信待ちがあふれた場合_あふれた分を捨てること(self, server: _FakeServer) -> None:
+        """送信が詰まって送信待ちがあふれた場合、発行は止まらずあふれた分を捨てること。"""
+        bus = MemoEventBus(epoch="w1")
+        bridge = PgNotifyBridge(bus, "dsn", outbox_size=1)
+        await bridge.start()
+        blocked = server.connections[0].blocked = asyncio.Event()
+        bus.publish(_event("a"))
+        await asyncio.sleep(0)  # 1件目は送信中で詰まる
+        for memo_id in ("b", "c", "d"):
+            bus.publish(_event(memo_id))
+        blocked.set()
+        await bridge.close()
+        assert (bridge.sent, bridge.dropped) == (2, 2)
+
+    async def test_再接続で想定外の例外が出た場合_張り直し続けること(
+        self, server: _FakeServer
+    ) -> None:
+        """接続が切れ、張り直しが想定外の例外で失敗した場合も、諦めずに張り直すこと。"""
+        bridge = PgNotifyBridge(MemoEventBus(epoch="w1"), "dsn")
+        await bridge.start()
+        server.connect_errors.append(RuntimeError("boom"))
+        server.connections[0].terminate()
+        reconnecting = bridge._reconnecting
+        await asyncio.wait_for(reconnecting, timeout=2.0)
+        assert len(server.connections) == 2
+        assert not server.connections[1].is_closed()
+        await bridge.close()
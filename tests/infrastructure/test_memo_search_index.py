@@ -0,0 +1,40 @@
+"""メモ全文検索インデックスのテスト。"""
+
+from datetime import datetime
+
+from app.domain.memo import Memo
+from app.infrastructure.memo_search_index import MemoSearchIndex
+
+
+def _memo(memo_id: str, title: str, content: str) -> Memo:
+    now = datetime(2025, 2, 8)
+    return Memo(id=memo_id, title=title, content=content, created_at=now, updated_at=now)
+
+
+class TestMemoSearchIndex正常系:
+    """正常系: 索引の登録・置き換え・検索の場合。"""
+
+    def test_複数語で検索した場合_すべての語を含むメモだけが返ること(self) -> None:
+        """複数語で検索した場合、すべての語を含むメモだけが返ること。"""
+        index = MemoSearchIndex()
+        index.add(_memo("a", "Milk tea", "buy"))
+        index.add(_memo("b", "Milk", "coffee"))
+        assert [memo_id for memo_id, _ in index.search("milk buy")] == ["a"]
+
+    def test_同じIDを登録し直した場合_古い内容ではヒットしないこと(self) -> None:
+        """同じ ID を登録し直した場合、古い内容の語ではヒットしないこと。"""
+        index = MemoSearchIndex()
+        index.add(_memo("a", "old", "content"))
+        index.add(_memo("a", "new", "content"))
+        assert index.search("old") == []
+        assert [memo_id for memo_id, _ in index.search("new")] == ["a"]
+
+
+class TestMemoSearchIndex異常系:
+    """異常系: ヒットしない場合。"""
+
+    def test_語を含まない検索語の場合_空のリストが返ること(self) -> None:
+        """記号だけなど語を含まない検索語の場合、空のリストが返ること。"""
+        index = MemoSearchIndex()
+        index.add(_memo("a", "title", "content"))
+        assert index.search("!!") == []
@@ -0,0 +1,72 @@
+"""メトリクス（Counter / Gauge / Histogram）と Prometheus テキスト出力のテスト。"""
+
+import pytest
+
+from app.infrastructure.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry正常系:
+    """正常系: 記録した値が Prometheus テキスト形式で出力されること。"""
+
+    def test_カウンタとゲージを記録した場合_ラベル付きで出力されること(self) -> None:
+        """カウンタとゲージを記録した場合、HELP・TYPE とラベル付きの値が出力されること。"""
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests.", ("route",))
+        counter.labels("/memos").inc()
+        counter.labels("/memos").inc(2)
+        registry.gauge("in_flight", "In flight.").labels().set(3)
+        assert registry.render() == (
+            "# HELP requests_total Requests.\n"
+            "# TYPE requests_total counter\n"
+            'requests_total{route="/memos"} 3\n'
+            "# HELP in_flight In flight.\n"
+            "# TYPE in_flight gauge\n"
+            "in_flight 3\n"
+        )
+
+    def test_ヒストグラムに記録した場合_バケットが累積で出力されること(self) -> None:
+        """ヒストグラムに記録した場合、le 以下の累積件数と合計・件数が出力されること。"""
+        registry = MetricsRegistry()
+        child = registry.histogram("latency", "Latency.", ("op",), buckets=(0.1, 1.0)).labels("x")
+        for value in (0.05, 0.1, 0.5, 3.0):
+            child.observe(value)
+        lines = registry.render().splitlines()
+        assert 'latency_bucket{op="x",le="0.1"} 2' in lines
+        assert 'latency_bucket{op="x",le="1"} 3' in lines
+        assert 'latency_bucket{op="x",le="+Inf"} 4' in lines
+        assert 'latency_sum{op="x"} 3.65' in lines
+        assert 'latency_count{op="x"} 4' in lines
+
+    def test_同じ名前とラベルで作り直した場合_登録済みのものを返すこと(self) -> None:
+        """同じ名前・種類・ラベルで作り直した場合、登録済みのメトリクスを返すこと。"""
+        registry = MetricsRegistry()
+        assert registry.counter("c", "C.", ("a",)) is registry.counter("c", "C.", ("a",))
+
+    def test_同じラベルを何度も指定した場合_同じ子を返すこと(self) -> None:
+        """同じラベル値を指定した場合、同じ子メトリクスを返すこと。"""
+        counter = MetricsRegistry().counter("c", "C.", ("a",))
+        assert counter.labels("1") is counter.labels("1")
+
+    def test_ラベル値に引用符や改行がある場合_エスケープされること(self) -> None:
+        """ラベル値に " や改行がある場合、エスケープして出力されること。"""
+        registry = MetricsRegistry()
+        registry.counter("c", "C.", ("a",)).labels('x"y\nz').inc()
+        assert 'c{a="x\\"y\\nz"} 1' in registry.render().splitlines()
+
+
+class TestMetricsRegistry異常系:
+    """異常系: 名前の重複・ラベル数の不一致はエラーになること。"""
+
+    def test_同じ名前で種類が違う場合_ValueErrorになること(self) -> None:
+        """同じ名前で種類かラベルが違うメトリクスを作ろうとした場合、ValueError になること。"""
+        registry = MetricsRegistry()
+        registry.counter("c", "C.")
+        with pytest.raises(ValueError):
+            registry.gauge("c", "C.")
+        with pytest.raises(ValueError):
+            registry.counter("c", "C.", ("a",))
+
+    def test_ラベル数が違う場合_ValueErrorになること(self) -> None:
+        """ラベル名の数と値の数が違う場合、ValueError になること。"""
+        with pytest.raises(ValueError):
+            MetricsRegistry().counter("c", "C.", ("a", "b")).labels("1")
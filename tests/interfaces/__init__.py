@@ -0,0 +1 @@
+# interfaces tests
@@ -0,0 +1,175 @@
+"""受け付け制御（レート制限・同時処理数の制限）のテスト。"""
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.infrastructure.metrics import MetricsRegistry
+from app.interfaces.admission import (
+    QUEUE_FULL,
+    QUEUE_TIMEOUT,
+    AdmissionMetrics,
+    AdmissionMiddleware,
+    ConcurrencyLimiter,
+    RateLimiter,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _app(**kwargs: object) -> tuple[FastAPI, asyncio.Event]:
+    app = FastAPI()
+    release = asyncio.Event()
+
+    @app.get("/work")
+    async def work() -> dict[str, str]:
+        return {"status": "done"}
+
+    @app.get("/slow")
+    async def slow() -> dict[str, str]:
+        await release.wait()
+        return {"status": "done"}
+
+    @app.get("/healthz")
+    async def healthz() -> dict[str, str]:
+        return {"status": "ok"}
+
+    app.add_middleware(AdmissionMiddleware, **kwargs)
+    return app, release
+
+
+class TestRateLimiter正常系:
+    """正常系: キーごとにトークンがたまり、使い切ったら待ち時間を返すこと。"""
+
+    def test_容量を使い切った場合_次のトークンまでの秒数を返すこと(self) -> None:
+        """容量を使い切った場合、次の1つがたまるまでの秒数を返し、たまれば使えること。"""
+        clock = _Clock()
+        limiter = RateLimiter(2.0, 2, clock=clock)
+        assert limiter.acquire("a") == 0.0
+        assert limiter.acquire("a") == 0.0
+        assert limiter.acquire("a") == 0.5
+        # 別のキーは別のバケット
+        assert limiter.acquire("b") == 0.0
+        clock.now = 0.5
+        assert limiter.acquire("a") == 0.0
+
+    def test_キーが上限を超えた場合_古いバケットから捨てること(self) -> None:
+        """キーの数が上限を超えた場合、最近使っていないキーのバケットから捨てること。"""
+        limiter = RateLimiter(1.0, 1, max_keys=2, clock=_Clock())
+        limiter.acquire("a")
+        limiter.acquire("b")
+        limiter.acquire("a")
+        limiter.acquire("c")
+        assert len(limiter) == 2
+        # a は使い切ったまま残り、b は捨てられたので満タンからやり直す
+        assert limiter.acquire("a") > 0
+        assert limiter.acquire("b") == 0.0
+
+
+class TestConcurrencyLimiter正常系:
+    """正常系: 上限まで受け付け、あふれた分は先着順に枠を引き継ぐこと。"""
+
+    async def test_空きを待っている場合_返された枠を先着順に引き継ぐこと(self) -> None:
+        """上限に達している場合、待っているものが返された枠を先着順に引き継ぐこと。"""
+        limiter = ConcurrencyLimiter(1, max_queue=2, queue_timeout_seconds=1.0)
+        assert await limiter.acquire() is None
+        first = asyncio.ensure_future(limiter.acquire())
+        second = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queued == 2
+        limiter.release()
+        assert await first is None
+        assert not second.done()
+        limiter.release()
+        assert await second is None
+        limiter.release()
+        assert (limiter.active, limiter.queued) == (0, 0)
+
+
+class TestConcurrencyLimiter異常系:
+    """異常系: キューが満杯・待ち時間切れ・取り消しの場合。"""
+
+    async def test_キューが満杯の場合_待たずに断ること(self) -> None:
+        """キューが満杯の場合、待たずに QUEUE_FULL で断ること。"""
+        limiter = ConcurrencyLimiter(1, max_queue=0, queue_timeout_seconds=1.0)
+        await limiter.acquire()
+        assert await limiter.acquire() == QUEUE_FULL
+
+    async def test_期限までに空かない場合_断ってキューから外すこと(self) -> None:
+        """期限までに空かない場合、QUEUE_TIMEOUT で断り、キューから外すこと。"""
+        limiter = ConcurrencyLimiter(1, max_queue=1, queue_timeout_seconds=0.01)
+        await limiter.acquire()
+        assert await limiter.acquire() == QUEUE_TIMEOUT
+        assert limiter.queued == 0
+        limiter.release()
+        assert limiter.active == 0
+
+    async def test_待っている最中に取り消した場合_枠を漏らさないこと(self) -> None:
+        """待っている最中に取り消した場合、キューから外れ、枠の数が狂わないこと。"""
+        limiter = ConcurrencyLimiter(1, max_queue=1, queue_timeout_seconds=1.0)
+        await limiter.acquire()
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert limiter.queued == 0
+        limiter.release()
+        assert limiter.active == 0
+
+
+class TestAdmissionMiddleware異常系:
+    """異常系: 制限を超えたリクエストを 429 / 503 ですぐに断ること。"""
+
+    def test_レート制限を超えた場合_429とRetry_Afterを返すこと(self) -> None:
+        """レート制限を超えた場合、429 と Retry-After を返し、断った数を数えること。"""
+        registry = MetricsRegistry()
+        metrics = AdmissionMetrics(registry)
+        app, _ = _app(rate_limiter=RateLimiter(0.5, 1), metrics=metrics)
+        client = TestClient(app)
+        assert client.get("/work").status_code == 200
+        res = client.get("/work")
+        assert res.status_code == 429
+        assert res.headers["Retry-After"] == "2"
+        assert metrics.rejected["rate_limited"].value == 1
+        # ヘルスチェックは対象外
+        assert client.get("/healthz").status_code == 200
+
+    def test_ヘッダーを指定した場合_その値ごとに制限すること(self) -> None:
+        """キーのヘッダーを指定した場合、接続元が同じでもヘッダーの値ごとに制限すること。"""
+        app, _ = _app(rate_limiter=RateLimiter(0.5, 1), key_header="X-Api-Key")
+        client = TestClient(app)
+        assert client.get("/work", headers={"X-Api-Key": "a"}).status_code == 200
+        assert client.get("/work", headers={"X-Api-Key": "b"}).status_code == 200
+        assert client.get("/work", headers={"X-Api-Key": "a"}).status_code == 429
+
+    async def test_同時処理数を超えて待てない場合_503を返すこと(self) -> None:
+        """同時処理数の上限に達しキューも満杯の場合、すぐに 503 と Retry-After を返すこと。"""
+        metrics = AdmissionMetrics(MetricsRegistry())
+        limiter = ConcurrencyLimiter(1, max_queue=1, queue_timeout_seconds=0.05)
+        app, release = _app(limiter=limiter, metrics=metrics)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            slow = asyncio.ensure_future(client.get("/slow"))
+            await asyncio.sleep(0.01)
+            queued = asyncio.ensure_future(client.get("/work"))
+            await asyncio.sleep(0.01)
+            full = await client.get("/work")
+            timed_out = await queued
+            release.set()
+            assert (await slow).status_code == 200
+        assert full.status_code == 503
+        assert full.headers["Retry-After"] == "1"
+        assert timed_out.status_code == 503
+        assert metrics.rejected["queue_full"].value == 1
+        assert metrics.rejected["queue_timeout"].value == 1
+        assert metrics.queued.value == 1
+        assert metrics.queue_length.value == 0
+        assert limiter.active == 0
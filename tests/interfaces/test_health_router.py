@@ -0,0 +1,99 @@
+"""ヘルスチェック（/healthz・/readyz）のテスト。DB は query_raw だけを持つ偽物を使う。"""
+
+import asyncio
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.interfaces.health_router import router
+from app.interfaces.readiness import ReadinessGate
+from app.settings import Settings
+from app.startup_profile import StartupProfile
+
+
+class _FakeDb:
+    """SELECT 1 に応答する（delay 秒待つ・fail なら例外を送出する）Prisma の代わり。"""
+
+    def __init__(self, *, delay: float = 0.0, fail: bool = False) -> None:
+        self._delay = delay
+        self._fail = fail
+
+    async def query_raw(self, query: str):
+        await asyncio.sleep(self._delay)
+        if self._fail:
+            raise ConnectionError("db is down")
+        return [{"?column?": 1}]
+
+
+class _FakeMonitor:
+    async def snapshot(self):
+        raise RuntimeError("metrics preview feature is disabled")
+
+
+def _client(gate: ReadinessGate, db: Optional[_FakeDb], timeout: float = 1.0) -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    app.state.settings = Settings(readiness_probe_timeout_seconds=timeout)
+    app.state.readiness = gate
+    app.state.db = db
+    app.state.pool_monitor = _FakeMonitor()
+    app.state.startup = StartupProfile()
+    return TestClient(app)
+
+
+def _ready_gate() -> ReadinessGate:
+    ticks = iter([10.0, 12.5])
+    gate = ReadinessGate(clock=lambda: next(ticks))
+    gate.mark_ready()
+    return gate
+
+
+class TestHealth正常系:
+    """正常系: 起動済みで DB に届けば 200 を返すこと。"""
+
+    def test_healthzを呼んだ場合_起動中でも200を返すこと(self) -> None:
+        """healthz を呼んだ場合、起動処理中でも 200 を返すこと。"""
+        res = _client(ReadinessGate(), _FakeDb()).get("/healthz")
+        assert res.status_code == 200
+        assert res.json() == {"status": "ok"}
+
+    def test_起動済みでDBに届く場合_起動時間と遅延を返すこと(self) -> None:
+        """起動済みで DB に届く場合、200 と起動時間・DB の往復時間を返すこと。"""
+        res = _client(_ready_gate(), _FakeDb()).get("/readyz")
+        assert res.status_code == 200
+        body = res.json()
+        assert body["status"] == "ok"
+        assert body["startup_seconds"] == 2.5
+        assert body["db_latency_ms"] >= 0
+        # メトリクスが取れない場合はプールの値を省いて返す
+        assert body["pool_open_connections"] is None
+
+    def test_DBを使わない構成の場合_起動済みなら200を返すこと(self) -> None:
+        """インメモリの保存先（db が None）の場合、起動済みなら DB を見ずに 200 を返すこと。"""
+        res = _client(_ready_gate(), None).get("/readyz")
+        assert res.status_code == 200
+        assert res.json()["db_latency_ms"] is None
+
+
+class TestHealth異常系:
+    """異常系: 起動中・DB 不達のときは 503 を返すこと。"""
+
+    def test_起動処理中の場合_503を返すこと(self) -> None:
+        """mark_ready 前の場合、503 と status=starting を返すこと。"""
+        res = _client(ReadinessGate(), _FakeDb()).get("/readyz")
+        assert res.status_code == 503
+        assert res.json()["status"] == "starting"
+
+    def test_終了処理中の場合_503を返すこと(self) -> None:
+        """mark_draining 後の場合、503 を返すこと。"""
+        gate = _ready_gate()
+        gate.mark_draining()
+        assert _client(gate, _FakeDb()).get("/readyz").status_code == 503
+
+    def test_DBが応答しない場合_503を返すこと(self) -> None:
+        """DB がエラーまたはタイムアウトの場合、503 と status=db_unavailable を返すこと。"""
+        for db in (_FakeDb(fail=True), _FakeDb(delay=0.2)):
+            res = _client(_ready_gate(), db, timeout=0.05).get("/readyz")
+            assert res.status_code == 503
+            assert res.json()["status"] == "db_unavailable"
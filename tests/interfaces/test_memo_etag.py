@@ -0,0 +1,91 @@
+"""メモ ETag のテスト。"""
+
+from datetime import datetime, timezone
+
+from app.domain.memo import Memo
+from app.domain.memo_page import MemoCollectionVersion
+from app.interfaces.memo_etag import (
+    http_date,
+    is_not_modified,
+    memo_etag,
+    memo_list_etag,
+    parse_memo_etag,
+)
+
+
+def _memo(updated_at: datetime) -> Memo:
+    return Memo(
+        id="cm1abc",
+        title="タイトル",
+        content="本文",
+        created_at=updated_at,
+        updated_at=updated_at,
+    )
+
+
+class TestMemoEtag正常系:
+    """正常系: ETag の生成と解釈が往復できること。"""
+
+    def test_ETagを解釈した場合_元のupdated_atが返ること(self) -> None:
+        """memo_etag の値を parse_memo_etag で解釈した場合、元の updated_at が返ること。"""
+        updated_at = datetime(2025, 2, 8, 12, 0, 0, 123000, tzinfo=timezone.utc)
+        memo = _memo(updated_at)
+        assert parse_memo_etag(memo_etag(memo), memo.id) == updated_at
+
+    def test_updated_atが変わった場合_ETagも変わること(self) -> None:
+        """updated_at が変わった場合、ETag も変わること。"""
+        a = _memo(datetime(2025, 2, 8, 12, 0, 0, tzinfo=timezone.utc))
+        b = _memo(datetime(2025, 2, 8, 12, 0, 1, tzinfo=timezone.utc))
+        assert memo_etag(a) != memo_etag(b)
+
+    def test_If_None_MatchにETagが含まれる場合_304と判定されること(self) -> None:
+        """If-None-Match に現在の ETag が含まれる場合、304 と判定されること。"""
+        memo = _memo(datetime(2025, 2, 8, tzinfo=timezone.utc))
+        etag = memo_etag(memo)
+        assert is_not_modified(etag, memo.updated_at, f'"other", {etag}', None)
+        assert is_not_modified(etag, memo.updated_at, "*", None)
+
+    def test_If_Modified_Since以降に更新が無い場合_304と判定されること(self) -> None:
+        """If-Modified-Since 以降に更新が無い場合は 304、あれば 304 ではないと判定されること。"""
+        updated_at = datetime(2025, 2, 8, 12, 0, 0, 500000, tzinfo=timezone.utc)
+        etag = memo_etag(_memo(updated_at))
+        assert is_not_modified(etag, updated_at, None, http_date(updated_at))
+        earlier = http_date(datetime(2025, 2, 8, 11, 59, 59, tzinfo=timezone.utc))
+        assert not is_not_modified(etag, updated_at, None, earlier)
+
+    def test_一覧の版が変わった場合_一覧のETagも変わること(self) -> None:
+        """件数または最終更新日時が変わった場合、一覧の ETag も変わること。"""
+        at = datetime(2025, 2, 8, tzinfo=timezone.utc)
+        base = memo_list_etag(MemoCollectionVersion(count=1, last_updated_at=at), None, 50)
+        assert base.startswith('W/"')
+        assert base == memo_list_etag(MemoCollectionVersion(count=1, last_updated_at=at), None, 50)
+        assert base != memo_list_etag(MemoCollectionVersion(count=2, last_updated_at=at), None, 50)
+        assert base != memo_list_etag(MemoCollectionVersion(count=1, last_updated_at=at), "c", 50)
+
+
+class TestMemoEtag異常系:
+    """異常系: 解釈できない ETag の場合。"""
+
+    def test_別のメモのETagを解釈した場合_Noneが返ること(self) -> None:
+        """別のメモの ETag を解釈した場合、None が返ること。"""
+        memo = _memo(datetime(2025, 2, 8, tzinfo=timezone.utc))
+        assert parse_memo_etag(memo_etag(memo), "other-id") is None
+
+    def test_弱いETagや不正な形式を解釈した場合_Noneが返ること(self) -> None:
+        """弱い ETag や不正な形式を解釈した場合、None が返ること。"""
+        memo = _memo(datetime(2025, 2, 8, tzinfo=timezone.utc))
+        assert parse_memo_etag("W/" + memo_etag(memo), memo.id) is None
+        assert parse_memo_etag('"cm1abc.abc"', memo.id) is None
+        assert parse_memo_etag("cm1abc.1", memo.id) is None
+
+    def test_If_None_MatchのETagが古い場合_304と判定されないこと(self) -> None:
+        """If-None-Match の ETag が現在と異なる場合、304 と判定されないこと。"""
+        old = memo_etag(_memo(datetime(2025, 2, 8, tzinfo=timezone.utc)))
+        new = memo_etag(_memo(datetime(2025, 2, 9, tzinfo=timezone.utc)))
+        assert not is_not_modified(new, None, old, None)
+
+    def test_If_Modified_Sinceが不正な場合_304と判定されないこと(self) -> None:
+        """If-Modified-Since が日付として解釈できない場合、304 と判定されないこと。"""
+        updated_at = datetime(2025, 2, 8, tzinfo=timezone.utc)
+        etag = memo_etag(_memo(updated_at))
+        assert not is_not_modified(etag, updated_at, None, "not a date")
@@ -0,0 +1,90 @@
+"""メモ変更イベントの Server-Sent Events のテスト。"""
+
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.domain.memo_event import MemoEvent
+from app.infrastructure.memo_event_bus import MemoEventBus, MemoEventReset, SequencedMemoEvent
+from app.interfaces.memo_event_stream import KEEPALIVE, format_message, stream_memo_events
+from app.interfaces.memo_router import router as memo_router
+from app.interfaces.memo_router import stream_memo_changes
+from app.settings import Settings
+
+_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class TestMemoEventStream正常系:
+    """正常系: イベントの書式と、ストリームの流れ。"""
+
+    def test_イベントの場合_idとeventとdataの形になること(self) -> None:
+        """イベントの場合、id・event・data（JSON）の SSE イベントになること。"""
+        message = SequencedMemoEvent(3, "e1-3", MemoEvent("updated", "m1", _AT))
+        assert format_message(message) == (
+            b"id: e1-3\nevent: updated\n"
+            b'data: {"id":"m1","kind":"updated","occurred_at":"2026-01-01T00:00:00Z"}\n\n'
+        )
+
+    def test_リセットの場合_resetイベントになること(self) -> None:
+        """リセットの場合、最新 ID を持つ reset イベントになること。"""
+        assert format_message(MemoEventReset("e1-7")) == b"id: e1-7\nevent: reset\ndata: {}\n\n"
+
+    async def test_購読した場合_retryの後にイベントとkeepaliveが流れること(self) -> None:
+        """購読した場合、retry の後に発行したイベントが、何も無い間は keepalive が流れること。"""
+        bus = MemoEventBus(epoch="e1")
+        response = await stream_memo_changes(
+            last_event_id=None,
+            last_event_id_header=None,
+            bus=bus,
+            settings=Settings(memo_events_keepalive_seconds=0.01),
+        )
+        assert response.media_type == "text/event-stream"
+        assert response.headers["cache-control"] == "no-cache"
+        chunks = response.body_iterator
+        assert (await chunks.__anext__()).startswith(b"retry: ")
+        bus.publish(MemoEvent("created", "m1", _AT))
+        assert (await chunks.__anext__()).startswith(b"id: e1-1\nevent: created\n")
+        assert await chunks.__anext__() == KEEPALIVE
+        await chunks.aclose()
+        # 切断したら購読をやめる
+        assert len(bus) == 0
+
+    async def test_Last_Event_IDヘッダーがある場合_クエリより優先して続きから流れること(
+        self,
+    ) -> None:
+        """Last-Event-ID ヘッダーとクエリの両方がある場合、ヘッダーの続きから流れること。"""
+        bus = MemoEventBus(epoch="e1")
+        for memo_id in ("m1", "m2"):
+            bus.publish(MemoEvent("created", memo_id, _AT))
+        response = await stream_memo_changes(
+            last_event_id="e1-0", last_event_id_header="e1-1", bus=bus, settings=Settings()
+        )
+        chunks = response.body_iterator
+        await chunks.__anext__()
+        assert (await chunks.__anext__()).startswith(b"id: e1-2\n")
+        await chunks.aclose()
+
+
+class TestMemoEventStream異常系:
+    """異常系: 受け取りが追いつかない場合と、変更通知が無効な場合。"""
+
+    async def test_キューがあふれた場合_リセットを送って終わること(self) -> None:
+        """購読のキューがあふれた場合、溜まった分とリセットを送ってストリームを終えること。"""
+        bus = MemoEventBus(epoch="e1", queue_size=1)
+        subscription = bus.subscribe()
+        for memo_id in ("m1", "m2"):
+            bus.publish(MemoEvent("created", memo_id, _AT))
+        chunks = [chunk async for chunk in stream_memo_events(subscription, 1.0)]
+        assert chunks[1].startswith(b"id: e1-1\n")
+        assert chunks[2] == b"id: e1-2\nevent: reset\ndata: {}\n\n"
+        assert len(chunks) == 3
+
+    def test_変更通知が無効な場合_404が返ること(self) -> None:
+        """変更通知を無効にしている場合、404 が返ること。"""
+        app = FastAPI()
+        app.include_router(memo_router)
+        app.state.memo_events = None
+        app.state.settings = Settings(memo_events_enabled=False)
+        res = TestClient(app).get("/memos/stream")
+        assert res.status_code == 404
@@ -0,0 +1,54 @@
+"""HTTP メトリクスのミドルウェアと /metrics のテスト。"""
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.infrastructure.metrics import MetricsRegistry
+from app.interfaces.metrics_middleware import HttpMetrics, MetricsMiddleware
+from app.interfaces.metrics_router import router
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str) -> dict[str, str]:
+        if item_id == "missing":
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    registry = MetricsRegistry()
+    app.state.metrics_registry = registry
+    app.include_router(router)
+    metrics = HttpMetrics(registry)
+    metrics.preallocate(app.routes)
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return TestClient(app)
+
+
+class TestMetricsMiddleware正常系:
+    """正常系: ルートのテンプレートとステータスごとに記録されること。"""
+
+    def test_リクエストした場合_ルートのテンプレートとステータスで数えること(self) -> None:
+        """パスパラメータ付きのルートにリクエストした場合、テンプレートとステータスごとに数えること。"""
+        client = _client()
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/items/missing")
+        client.get("/nowhere")
+        res = client.get("/metrics")
+        assert res.status_code == 200
+        assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+        lines = res.text.splitlines()
+        assert 'http_requests_total{method="GET",route="/items/{item_id}",status="200"} 2' in lines
+        assert 'http_requests_total{method="GET",route="/items/{item_id}",status="404"} 1' in lines
+        assert 'http_requests_total{method="GET",route="<unmatched>",status="404"} 1' in lines
+        assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}"} 3' in (
+            lines
+        )
+
+    def test_リクエストが終わった場合_処理中の数が戻ること(self) -> None:
+        """リクエストが終わった場合、処理中のリクエスト数が /metrics 自身の1件だけであること。"""
+        client = _client()
+        client.get("/items/1")
+        assert "http_requests_in_flight 1" in client.get("/metrics").text.splitlines()
@@ -0,0 +1,55 @@
+"""アプリ全体で1つの Container と、そこからユースケースを取り出す依存性のテスト。"""
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.container import Container
+from app.deps import get_create_memo_use_case, get_memo_repository
+from app.infrastructure.memo_event_bus import MemoEventBus
+from app.settings import Settings
+from app.usecases.memo_repository import MemoRepository
+from app.usecases.memo_use_cases import CreateMemoUseCase
+from tests.usecases.test_memo_use_cases import _FakeRepo
+
+
+class TestContainer正常系:
+    """正常系: 起動時に組み立てたものを、リクエストをまたいで使い回すこと。"""
+
+    def test_組み立てた場合_全ユースケースが同じリポジトリを使うこと(self) -> None:
+        """組み立てた場合、すべてのユースケースが渡したリポジトリを共有すること。"""
+        repo = _FakeRepo()
+        container = Container.build(repo)
+        assert container.memo_repository is repo
+        assert container.create_memo._repo is repo
+        assert container.bulk_delete_memos._repo is repo
+
+    async def test_イベントの配送先を渡した場合_書き込みが購読者に届くこと(self) -> None:
+        """イベントの配送先を渡して組み立てた場合、作成したメモのイベントが購読者に届くこと。"""
+        bus = MemoEventBus(epoch="e1")
+        container = Container.build(_FakeRepo(), bus)
+        subscription = bus.subscribe()
+        memo = await container.create_memo.execute(title="t", content="c")
+        message = await subscription.next(timeout=0.1)
+        assert (message.event.kind, message.event.memo_id) == ("created", memo.id)
+
+    def test_複数回リクエストした場合_同じユースケースとリポジトリを受け取ること(self) -> None:
+        """複数回リクエストした場合、依存性は毎回組み立てず同じインスタンスを返すこと。"""
+        app = FastAPI()
+        app.state.settings = Settings()
+        app.state.opening = None
+        app.state.container = Container.build(_FakeRepo())
+        seen: list[tuple[int, int]] = []
+
+        @app.get("/probe")
+        async def probe(
+            create: CreateMemoUseCase = Depends(get_create_memo_use_case),
+            repo: MemoRepository = Depends(get_memo_repository),
+        ) -> dict[str, str]:
+            seen.append((id(create), id(repo)))
+            return {}
+
+        client = TestClient(app)
+        client.get("/probe")
+        client.get("/probe")
+        container = app.state.container
+        assert seen == [(id(container.create_memo), id(container.memo_repository))] * 2
@@ -0,0 +1,66 @@
+"""本番用サーバーのワーカー数・接続数の決め方のテスト。"""
+
+from app.server import ServerPlan, plan_server
+from app.settings import Settings
+
+
+class TestPlanServer正常系:
+    """正常系: マシンの大きさと設定からワーカー数と接続数が決まること。"""
+
+    def test_メモリに余裕がある場合_CPU数のワーカーになること(self) -> None:
+        """メモリが十分ある場合、ワーカー数は CPU 数になり接続数は設定どおりであること。"""
+        plan = plan_server(Settings(db_connection_limit=5), cpus=4, memory_mb=4096)
+        assert (plan.workers, plan.db_connection_limit) == (4, 5)
+
+    def test_メモリが小さい場合_メモリに収まる数で頭打ちになること(self) -> None:
+        """メモリが小さい場合、ワーカー数はメモリに収まる数に抑えられ、最低1であること。"""
+        settings = Settings(worker_memory_mb=128)
+        assert plan_server(settings, cpus=4, memory_mb=512).workers == 3
+        assert plan_server(settings, cpus=4, memory_mb=128).workers == 1
+
+    def test_WEB_CONCURRENCYを指定した場合_それに従うこと(self) -> None:
+        """web_concurrency を指定した場合、CPU とメモリに関わらずその数になること。"""
+        plan = plan_server(Settings(web_concurrency=6), cpus=1, memory_mb=256)
+        assert plan.workers == 6
+
+    def test_接続数の合計を指定した場合_ワーカーごとに割り振ること(self) -> None:
+        """接続数の合計を指定した場合、合計を超えないようワーカーごとの上限が決まること。"""
+        settings = Settings(db_total_connection_limit=10, db_connection_limit=20)
+        assert plan_server(settings, cpus=4, memory_mb=None, pubsub_installed=False) == (
+            ServerPlan(4, 2)
+        )
+        # ワーカー数は接続数の合計で頭打ちにし、各ワーカーが1本は持てるようにする
+        settings = Settings(db_total_connection_limit=2, memo_events_enabled=False)
+        assert plan_server(settings, cpus=4, memory_mb=None) == ServerPlan(2, 1)
+
+    def test_NOTIFYで共有する場合_LISTENの1本も接続数の合計に数えること(self) -> None:
+        """LISTEN / NOTIFY で共有する場合、ワーカーごとの LISTEN を除いた分を割り振ること。"""
+        settings = Settings(db_total_connection_limit=10)
+        assert plan_server(settings, cpus=4, memory_mb=None) == ServerPlan(4, 1, True)
+        # LISTEN の分も持てるよう、ワーカー数は合計の半分で頭打ちにする（1ワーカーなら共有しない）
+        settings = Settings(db_total_connection_limit=6)
+        assert plan_server(settings, cpus=4, memory_mb=None) == ServerPlan(3, 1, True)
+        settings = Settings(db_total_connection_limit=3)
+        assert plan_server(settings, cpus=4, memory_mb=None) == ServerPlan(1, 3)
+
+    def test_memoryバックエンドの場合_1ワーカーになること(self) -> None:
+        """memory バックエンドの場合、データをプロセス間で共有できないため1ワーカーになること。"""
+        settings = Settings(memo_repository_backend="memory", web_concurrency=4)
+        assert plan_server(settings, cpus=8, memory_mb=None).workers == 1
+
+    def test_変更通知が有効で複数ワーカーの場合_NOTIFYでの共有が有効になること(self) -> None:
+        """変更通知が有効で2ワーカー以上の場合、設定に関わらず LISTEN / NOTIFY で共有すること。"""
+        assert plan_server(Settings(), cpus=2, memory_mb=None).memo_events_pg_notify
+
+    def test_asyncpgが無い場合_複数ワーカーでもNOTIFYでの共有を有効にしないこと(self) -> None:
+        """asyncpg が入っていない場合、起動を止めずにワーカーごとの bus で動かすこと。"""
+        plan = plan_server(Settings(), cpus=2, memory_mb=None, pubsub_installed=False)
+        assert plan == ServerPlan(2, None)
+
+    def test_1ワーカーや変更通知が無効の場合_NOTIFYの設定どおりであること(self) -> None:
+        """1ワーカー・変更通知が無効の場合、LISTEN / NOTIFY での共有は設定どおりであること。"""
+        assert not plan_server(Settings(), cpus=1, memory_mb=None).memo_events_pg_notify
+        settings = Settings(memo_events_enabled=False)
+        assert not plan_server(settings, cpus=4, memory_mb=None).memo_events_pg_notify
+        settings = Settings(memo_events_pg_notify=True)
+        assert plan_server(settings, cpus=1, memory_mb=None).memo_events_pg_notify
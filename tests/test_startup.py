@@ -0,0 +1,123 @@
+"""起動時間の計測と、保存先を裏で開く起動のテスト。"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable
+from contextlib import asynccontextmanager
+from typing import Callable
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.container import Container
+from app.interfaces.memo_router import router as memo_router
+from app.settings import Settings
+from app.startup_profile import StartupProfile
+from tests.usecases.test_memo_use_cases import _FakeRepo
+
+# 新しいプロセスでアプリを読み込み、インメモリの保存先で準備完了になるまでの予算（秒）
+STARTUP_BUDGET_SECONDS = 3.0
+
+_STARTUP_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import app
+with TestClient(app) as client:
+    ready = client.get("/readyz").json()
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "uvicorn_loaded": "uvicorn" in sys.modules,
+    "ready": ready,
+}))
+"""
+
+
+def _opening_app(open_backend: Callable[[FastAPI], Awaitable[None]], timeout: float) -> FastAPI:
+    """保存先を裏で開く（open_backend を lifespan でタスクにする）だけの小さなアプリ。"""
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.opening = asyncio.ensure_future(open_backend(app))
+        yield
+        app.state.opening.cancel()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(memo_router)
+    app.state.settings = Settings(startup_wait_timeout_seconds=timeout)
+    app.state.container = None
+    return app
+
+
+def _run_startup() -> dict:
+    env = {**os.environ, "MEMO_REPOSITORY_BACKEND": "memory", "MEMORY_DATA_DIR": ""}
+    out = subprocess.run(
+        [sys.executable, "-c", _STARTUP_SCRIPT],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+class TestStartupProfile正常系:
+    """正常系: フェーズごとの所要時間が記録されること。"""
+
+    def test_フェーズを計測した場合_記録順にミリ秒で返り同名は合算されること(self) -> None:
+        """フェーズを計測した場合、記録した順にミリ秒で返り、同じ名前は合算されること。"""
+        ticks = iter([0.0, 0.25, 1.0, 1.5, 2.0, 2.125])
+        profile = StartupProfile(clock=lambda: next(ticks))
+        with profile.phase("app"):
+            pass
+        with profile.phase("routers"):
+            pass
+        with profile.phase("app"):
+            pass
+        assert profile.as_milliseconds() == {"app": 375.0, "routers": 500.0}
+
+
+class TestStartup正常系:
+    """正常系: 起動が予算内に収まり、保存先を開くまでリクエストを待たせること。"""
+
+    def test_新しいプロセスで起動した場合_予算内に準備完了になること(self) -> None:
+        """新しいプロセスで起動した場合、予算内に準備完了になり、各フェーズが記録されること。"""
+        result = _run_startup()
+        assert result["seconds"] < STARTUP_BUDGET_SECONDS
+        assert result["ready"]["status"] == "ok"
+        assert {"app", "routers", "memory_load"} <= set(result["ready"]["startup_phases_ms"])
+        # uvicorn は開発用の __main__ でしか使わないので、アプリの読み込みでは読まない
+        assert result["uvicorn_loaded"] is False
+
+    def test_保存先を開いている最中の場合_開き終わるまで待って応答すること(self) -> None:
+        """保存先を裏で開いている最中のリクエストは、開き終わるのを待ってから応答すること。"""
+
+        async def open_later(app: FastAPI) -> None:
+            await asyncio.sleep(0.05)
+            app.state.container = Container.build(_FakeRepo())
+
+        with TestClient(_opening_app(open_later, timeout=5.0)) as client:
+            started = time.perf_counter()
+            res = client.post("/memos", json={"title": "t", "content": "c"})
+            assert res.status_code == 201
+            assert time.perf_counter() - started >= 0.04
+
+
+class TestStartup異常系:
+    """異常系: 保存先が開くのが間に合わない場合。"""
+
+    def test_待ち時間内に開けない場合_503とRetry_Afterを返すこと(self) -> None:
+        """保存先が待ち時間内に開けない場合、503 と Retry-After を返すこと。"""
+
+        async def never_open(app: FastAPI) -> None:
+            await asyncio.sleep(10)
+
+        with TestClient(_opening_app(never_open, timeout=0.01)) as client:
+            res = client.get("/memos/any")
+            assert res.status_code == 503
+            assert res.headers["Retry-After"] == "1"
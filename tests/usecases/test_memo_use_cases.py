@@ -1,17 +1,34 @@
 """メモユースケースのテスト（リポジトリをモック）。"""
 
-from datetime import datetime
+from collections.abc import Sequence
+from dataclasses import replace
+from datetime import datetime, timedelta
 from typing import Optional
 
 import pytest
 
-from app.domain.memo import Memo
+from app.domain.memo import MEMO_PREVIEW_LENGTH, Memo, MemoDraft, MemoVersionConflictError
+from app.domain.memo_event import MemoEvent
+from app.domain.memo_page import MemoCollectionVersion, MemoCursor
+from app.domain.memo_search import MemoSearchHit
+from app.domain.memo_sync import MemoChanges, MemoSyncToken, MemoTombstone
+from app.infrastructure.memo_search_index import MemoSearchIndex
+from app.usecases.memo_event_publisher import MemoEventPublisher
 from app.usecases.memo_repository import MemoRepository
 from app.usecases.memo_use_cases import (
+    BulkCreateMemosUseCase,
+    BulkDeleteMemosUseCase,
     CreateMemoUseCase,
     DeleteMemoUseCase,
+    ExportMemosUseCase,
+    GetMemoCollectionVersionUseCase,
+    GetMemosUseCase,
     GetMemoUseCase,
+    GetMemoVersionUseCase,
+    ListMemoChangesUseCase,
+    ListMemoSummariesUseCase,
     ListMemosUseCase,
+    SearchMemosUseCase,
     UpdateMemoUseCase,
 )
 
@@ -22,6 +39,14 @@ class _FakeRepo(MemoRepository):
     def __init__(self) -> None:
         self.memos: dict[str, Memo] = {}
         self._next_id = 1
+        self._clock = datetime(2025, 2, 8, 12, 0, 0)
+        self._index = MemoSearchIndex()
+        # 差分同期用。ID ごとの最後の変更の連番と、削除したメモの ID
+        self._change_seqs: dict[str, int] = {}
+        self._deleted: set[str] = set()
+
+    def _touch(self, memo_id: str) -> None:
+        self._change_seqs[memo_id] = max(self._change_seqs.values(), default=0) + 1
 
     async def create(self, title: str, content: str) -> Memo:
         now = datetime(2025, 2, 8, 12, 0, 0)
@@ -35,26 +60,114 @@ class _FakeRepo(MemoRepository):
             updated_at=now,
         )
         self.memos[memo_id] = memo
+        self._index.add(memo)
+        self._touch(memo_id)
         return memo
 
+    async def create_many(self, drafts: Sequence[MemoDraft]) -> list[Memo]:
+        return [await self.create(d.title, d.content) for d in drafts]
+
     async def find_all(self) -> list[Memo]:
         return sorted(self.memos.values(), key=lambda m: m.created_at)
 
+    async def find_page(self, limit: int, after: Optional[MemoCursor] = None) -> list[Memo]:
+        memos = sorted(self.memos.values(), key=lambda m: (m.created_at, m.id))
+        if after is not None:
+            memos = [m for m in memos if (m.created_at, m.id) > (after.created_at, after.id)]
+        return memos[:limit]
+
     async def find_by_id(self, memo_id: str) -> Optional[Memo]:
         return self.memos.get(memo_id)
 
+    async def find_version(self, memo_id: str) -> Optional[datetime]:
+        memo = self.memos.get(memo_id)
+        return memo.updated_at if memo is not None else None
+
+    async def collection_version(self) -> MemoCollectionVersion:
+        return MemoCollectionVersion(
+            count=len(self.memos),
+            last_updated_at=max((m.updated_at for m in self.memos.values()), default=None),
+        )
+
+    async def search(self, query: str, limit: int, offset: int = 0) -> list[MemoSearchHit]:
+        scored = self._index.search(query)[offset : offset + limit]
+        return [MemoSearchHit(memo=self.memos[memo_id], rank=rank) for memo_id, rank in scored]
+
+    async def find_changes(self, since: MemoSyncToken, limit: int) -> MemoChanges:
+        ids = sorted(
+            (memo_id for memo_id, seq in self._change_seqs.items() if seq > since.watermark),
+            key=self._change_seqs.__getitem__,
+        )
+        if since.is_initial:
+            ids = [memo_id for memo_id in ids if memo_id not in self._deleted]
+        page = ids[:limit]
+        has_more = len(ids) > limit
+        watermark = self._change_seqs[page[-1]] if page else since.watermark
+        return MemoChanges(
+            changed=[self.memos[memo_id] for memo_id in page if memo_id in self.memos],
+            deleted=[
+                MemoTombstone(id=memo_id, deleted_at=self._clock)
+                for memo_id in page
+                if memo_id in self._deleted
+            ],
+            next_token=MemoSyncToken(watermark),
+            has_more=has_more,
+        )
+
     async def update(self, memo: Memo) -> Memo:
         if memo.id not in self.memos:
             raise KeyError(memo.id)
         self.memos[memo.id] = memo
+        self._index.add(memo)
+        self._touch(memo.id)
+        return memo
+
+    async def patch(
+        self,
+        memo_id: str,
+        *,
+        title: Optional[str] = None,
+        content: Optional[str] = None,
+        expected_updated_at: Optional[datetime] = None,
+    ) -> Optional[Memo]:
+        memo = self.memos.get(memo_id)
+        if memo is None:
+            return None
+        if expected_updated_at is not None and memo.updated_at != expected_updated_at:
+            raise MemoVersionConflictError(memo_id)
+        if title is not None:
+            memo = memo.with_title(title)
+        if content is not None:
+            memo = memo.with_content(content)
+        self._clock += timedelta(seconds=1)
+        memo = replace(memo, updated_at=self._clock)
+        self.memos[memo_id] = memo
+        self._index.add(memo)
+        self._touch(memo_id)
         return memo
 
     async def delete_by_id(self, memo_id: str) -> bool:
         if memo_id in self.memos:
             del self.memos[memo_id]
+            self._index.remove(memo_id)
+            self._deleted.add(memo_id)
+            self._touch(memo_id)
             return True
         return False
 
+    async def delete_many(self, memo_ids: Sequence[str]) -> set[str]:
+        return {memo_id for memo_id in memo_ids if await self.delete_by_id(memo_id)}
+
+
+class _RecordingPublisher(MemoEventPublisher):
+    """発行されたイベントを (種類, メモ ID) で記録する。"""
+
+    def __init__(self) -> None:
+        self.events: list[tuple[str, str]] = []
+
+    def publish(self, event: MemoEvent) -> None:
+        self.events.append((event.kind, event.memo_id))
+
 
 class TestCreateMemoUseCase正常系:
     """正常系: メモ作成の場合。"""
@@ -71,6 +184,21 @@ class TestCreateMemoUseCase正常系:
         assert len(repo.memos) == 1
 
 
+class TestBulkCreateMemosUseCase正常系:
+    """正常系: 一括作成の場合。"""
+
+    @pytest.mark.asyncio
+    async def test_複数件を渡した場合_入力順で全件作成されること(self) -> None:
+        """複数件を渡した場合、入力と同じ順で全件作成されること。"""
+        repo = _FakeRepo()
+        use_case = BulkCreateMemosUseCase(repo)
+        memos = await use_case.execute(
+            [MemoDraft(title="1本目", content="内容1"), MemoDraft(title="2本目", content="内容2")]
+        )
+        assert [m.title for m in memos] == ["1本目", "2本目"]
+        assert len(repo.memos) == 2
+
+
 class TestListMemosUseCase正常系:
     """正常系: 一覧取得の場合。"""
 
@@ -81,10 +209,145 @@ class TestListMemosUseCase正常系:
         await repo.create("1本目", "内容1")
         await repo.create("2本目", "内容2")
         use_case = ListMemosUseCase(repo)
-        memos = await use_case.execute()
-        assert len(memos) == 2
-        assert memos[0].title == "1本目"
-        assert memos[1].title == "2本目"
+        page = await use_case.execute(limit=10)
+        assert len(page.items) == 2
+        assert page.items[0].title == "1本目"
+        assert page.items[1].title == "2本目"
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_件数がlimitを超える場合_次ページのカーソルで続きが取得できること(self) -> None:
+        """件数が limit を超える場合、next_cursor で続きのページが取得できること。"""
+        repo = _FakeRepo()
+        for i in range(5):
+            await repo.create(f"{i}本目", "内容")
+        use_case = ListMemosUseCase(repo)
+        first = await use_case.execute(limit=3)
+        assert [m.title for m in first.items] == ["0本目", "1本目", "2本目"]
+        assert first.next_cursor is not None
+        second = await use_case.execute(limit=3, cursor=first.next_cursor)
+        assert [m.title for m in second.items] == ["3本目", "4本目"]
+        assert second.next_cursor is None
+
+
+class TestListMemoSummariesUseCase正常系:
+    """正常系: 要約一覧取得の場合。"""
+
+    @pytest.mark.asyncio
+    async def test_本文が長い場合_文字数と先頭部分だけを返すこと(self) -> None:
+        """本文が MEMO_PREVIEW_LENGTH より長い場合、文字数と先頭部分だけを返すこと。"""
+        repo = _FakeRepo()
+        await repo.create("長文", "あ" * (MEMO_PREVIEW_LENGTH + 30))
+        page = await ListMemoSummariesUseCase(repo).execute(limit=10)
+        [summary] = page.items
+        assert summary.title == "長文"
+        assert summary.content_length == MEMO_PREVIEW_LENGTH + 30
+        assert summary.preview == "あ" * MEMO_PREVIEW_LENGTH
+
+    @pytest.mark.asyncio
+    async def test_件数がlimitを超える場合_次ページのカーソルで続きが取得できること(self) -> None:
+        """件数が limit を超える場合、next_cursor で続きの要約が取得できること。"""
+        repo = _FakeRepo()
+        for i in range(3):
+            await repo.create(f"{i}本目", "内容")
+        use_case = ListMemoSummariesUseCase(repo)
+        first = await use_case.execute(limit=2)
+        assert first.next_cursor is not None
+        second = await use_case.execute(limit=2, cursor=first.next_cursor)
+        assert [m.title for m in second.items] == ["2本目"]
+        assert second.next_cursor is None
+
+
+class TestListMemoChangesUseCase正常系:
+    """正常系: 差分同期の場合。"""
+
+    @pytest.mark.asyncio
+    async def test_前回のトークンを渡した場合_それ以降の変更と削除だけが返ること(self) -> None:
+        """since 省略時は全件、前回の next_token を渡した場合はその後の変更だけが返ること。"""
+        repo = _FakeRepo()
+        first_memo = await repo.create("1本目", "内容")
+        second_memo = await repo.create("2本目", "内容")
+        use_case = ListMemoChangesUseCase(repo)
+        initial = await use_case.execute(limit=10)
+        assert [m.title for m in initial.changed] == ["1本目", "2本目"]
+        await UpdateMemoUseCase(repo).execute(first_memo.id, title="更新")
+        await DeleteMemoUseCase(repo).execute(second_memo.id)
+        changes = await use_case.execute(limit=10, since=initial.next_token)
+        assert [m.title for m in changes.changed] == ["更新"]
+        assert [t.id for t in changes.deleted] == [second_memo.id]
+        assert not changes.has_more
+
+
+class TestSearchMemosUseCase正常系:
+    """正常系: 全文検索の場合。"""
+
+    @pytest.mark.asyncio
+    async def test_検索語を含むメモがある場合_タイトル一致が上位で返ること(self) -> None:
+        """検索語を含むメモがある場合、タイトルに含むメモが本文だけに含むメモより上位で返ること。"""
+        repo = _FakeRepo()
+        await repo.create("買い物リスト", "milk と bread")
+        await repo.create("milk", "牛乳")
+        await repo.create("無関係", "内容")
+        use_case = SearchMemosUseCase(repo)
+        page = await use_case.execute("milk", limit=10)
+        assert [h.memo.title for h in page.hits] == ["milk", "買い物リスト"]
+        assert page.next_offset is None
+
+    @pytest.mark.asyncio
+    async def test_ヒット件数がlimitを超える場合_next_offsetで続きが取得できること(self) -> None:
+        """ヒット件数が limit を超える場合、next_offset で続きのページが取得できること。"""
+        repo = _FakeRepo()
+        for i in range(3):
+            await repo.create(f"memo {i}", "共通 keyword")
+        use_case = SearchMemosUseCase(repo)
+        first = await use_case.execute("keyword", limit=2)
+        assert len(first.hits) == 2
+        assert first.next_offset == 2
+        second = await use_case.execute("keyword", limit=2, offset=first.next_offset)
+        assert len(second.hits) == 1
+        assert second.next_offset is None
+
+    @pytest.mark.asyncio
+    async def test_削除したメモの場合_検索にヒットしないこと(self) -> None:
+        """削除したメモの場合、検索にヒットしないこと。"""
+        repo = _FakeRepo()
+        created = await repo.create("keyword", "内容")
+        await repo.delete_by_id(created.id)
+        page = await SearchMemosUseCase(repo).execute("keyword", limit=10)
+        assert page.hits == []
+
+
+class TestSearchMemosUseCase異常系:
+    """異常系: 検索語が空の場合。"""
+
+    @pytest.mark.asyncio
+    async def test_空白だけの検索語の場合_空の結果が返ること(self) -> None:
+        """空白だけの検索語の場合、リポジトリを検索せず空の結果が返ること。"""
+        page = await SearchMemosUseCase(_FakeRepo()).execute("   ", limit=10)
+        assert page.hits == []
+        assert page.next_offset is None
+
+
+class TestExportMemosUseCase正常系:
+    """正常系: エクスポートの場合。"""
+
+    @pytest.mark.asyncio
+    async def test_メモが複数ある場合_batch_sizeずつ作成順で全件返ること(self) -> None:
+        """メモが複数ある場合、batch_size 件ずつ作成順で全件返ること。"""
+        repo = _FakeRepo()
+        for i in range(5):
+            await repo.create(f"{i}本目", "内容")
+        use_case = ExportMemosUseCase(repo)
+        batches = [list(b) async for b in use_case.execute(batch_size=2)]
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert [m.title for b in batches for m in b] == [f"{i}本目" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_メモが無い場合_何も返らないこと(self) -> None:
+        """メモが無い場合、バッチが1つも返らないこと。"""
+        use_case = ExportMemosUseCase(_FakeRepo())
+        batches = [b async for b in use_case.execute(batch_size=2)]
+        assert batches == []
 
 
 class TestGetMemoUseCase正常系:
@@ -114,6 +377,51 @@ class TestGetMemoUseCase異常系:
         assert found is None
 
 
+class TestGetMemosUseCase正常系:
+    """正常系: 複数 ID での取得の場合。"""
+
+    async def test_存在するIDと存在しないIDを渡した場合_入力順で結果が返ること(self) -> None:
+        """有無の混ざった ID を重複ありで渡した場合、重複を除いた入力順で結果が返ること。"""
+        repo = _FakeRepo()
+        first = await repo.create("1", "本文")
+        second = await repo.create("2", "本文")
+        use_case = GetMemosUseCase(repo)
+        results = await use_case.execute([second.id, "not-exist", first.id, second.id])
+        assert results == [(second.id, second), ("not-exist", None), (first.id, first)]
+
+
+class TestGetMemoVersionUseCase正常系:
+    """正常系: 版の取得の場合。"""
+
+    @pytest.mark.asyncio
+    async def test_更新した場合_新しいupdated_atが返ること(self) -> None:
+        """更新した場合、更新後の updated_at が返り、存在しない ID では None が返ること。"""
+        repo = _FakeRepo()
+        created = await repo.create("タイトル", "本文")
+        updated = await repo.patch(created.id, title="新タイトル")
+        use_case = GetMemoVersionUseCase(repo)
+        assert updated is not None
+        assert await use_case.execute(created.id) == updated.updated_at
+        assert await use_case.execute("not-exist") is None
+
+
+class TestGetMemoCollectionVersionUseCase正常系:
+    """正常系: 全体の版の取得の場合。"""
+
+    @pytest.mark.asyncio
+    async def test_作成と削除をした場合_版が変わること(self) -> None:
+        """作成・削除をした場合、そのたびに全体の版が変わること。"""
+        repo = _FakeRepo()
+        use_case = GetMemoCollectionVersionUseCase(repo)
+        empty = await use_case.execute()
+        created = await repo.create("タイトル", "本文")
+        after_create = await use_case.execute()
+        await repo.delete_by_id(created.id)
+        after_delete = await use_case.execute()
+        assert empty != after_create
+        assert after_create != after_delete
+
+
 class TestUpdateMemoUseCase正常系:
     """正常系: 更新の場合。"""
 
@@ -139,9 +447,22 @@ class TestUpdateMemoUseCase正常系:
         assert updated.title == "タイトル"
         assert updated.content == "新本文"
 
+    @pytest.mark.asyncio
+    async def test_現在のバージョンを指定して更新した場合_更新されること(self) -> None:
+        """現在の updated_at を指定して更新した場合、更新されること。"""
+        repo = _FakeRepo()
+        created = await repo.create("旧タイトル", "本文")
+        use_case = UpdateMemoUseCase(repo)
+        updated = await use_case.execute(
+            created.id, title="新タイトル", expected_updated_at=created.updated_at
+        )
+        assert updated is not None
+        assert updated.title == "新タイトル"
+        assert updated.updated_at > created.updated_at
+
 
 class TestUpdateMemoUseCase異常系:
-    """異常系: 更新で見つからない場合。"""
+    """異常系: 更新で見つからない・競合する場合。"""
 
     @pytest.mark.asyncio
     async def test_存在しないIDを指定した場合_Noneが返ること(self) -> None:
@@ -151,6 +472,21 @@ class TestUpdateMemoUseCase異常系:
         updated = await use_case.execute("not-exist", title="無効")
         assert updated is None
 
+    @pytest.mark.asyncio
+    async def test_古いバージョンを指定して更新した場合_MemoVersionConflictErrorになること(
+        self,
+    ) -> None:
+        """古い updated_at を指定した場合、MemoVersionConflictError になり更新されないこと。"""
+        repo = _FakeRepo()
+        created = await repo.create("タイトル", "本文")
+        use_case = UpdateMemoUseCase(repo)
+        await use_case.execute(created.id, title="先に更新")
+        with pytest.raises(MemoVersionConflictError):
+            await use_case.execute(
+                created.id, title="後から更新", expected_updated_at=created.updated_at
+            )
+        assert repo.memos[created.id].title == "先に更新"
+
 
 class TestDeleteMemoUseCase正常系:
     """正常系: 削除の場合。"""
@@ -176,3 +512,64 @@ class TestDeleteMemoUseCase異常系:
         use_case = DeleteMemoUseCase(repo)
         result = await use_case.execute("not-exist")
         assert result is False
+
+
+class TestBulkDeleteMemosUseCase正常系:
+    """正常系: 一括削除の場合。"""
+
+    @pytest.mark.asyncio
+    async def test_存在するIDと存在しないIDを渡した場合_IDごとの結果が入力順で返ること(
+        self,
+    ) -> None:
+        """存在する ID と存在しない ID を渡した場合、ID ごとの削除結果が入力順で返ること。"""
+        repo = _FakeRepo()
+        created = await repo.create("削除する", "内容")
+        use_case = BulkDeleteMemosUseCase(repo)
+        results = await use_case.execute(["not-exist", created.id, created.id])
+        assert results == [("not-exist", False), (created.id, True)]
+        assert created.id not in repo.memos
+
+
+class TestMemoEventPublishing正常系:
+    """正常系: 書き込みに成功した場合に変更イベントが発行されること。"""
+
+    @pytest.mark.asyncio
+    async def test_作成と一括作成をした場合_作成イベントが1件ずつ発行されること(self) -> None:
+        """作成と一括作成をした場合、作ったメモごとに created が発行されること。"""
+        repo = _FakeRepo()
+        events = _RecordingPublisher()
+        memo = await CreateMemoUseCase(repo, events).execute(title="1本目", content="内容")
+        memos = await BulkCreateMemosUseCase(repo, events).execute(
+            [MemoDraft(title="2本目", content="内容"), MemoDraft(title="3本目", content="内容")]
+        )
+        assert events.events == [("created", m.id) for m in [memo, *memos]]
+
+    @pytest.mark.asyncio
+    async def test_更新と削除をした場合_更新と削除のイベントが発行されること(self) -> None:
+        """更新と一括削除をした場合、updated と削除できた分の deleted が発行されること。"""
+        repo = _FakeRepo()
+        created = await repo.create("元", "内容")
+        other = await repo.create("別", "内容")
+        events = _RecordingPublisher()
+        await UpdateMemoUseCase(repo, events).execute(created.id, title="新")
+        await DeleteMemoUseCase(repo, events).execute(other.id)
+        await BulkDeleteMemosUseCase(repo, events).execute([created.id, "not-exist"])
+        assert events.events == [
+            ("updated", created.id),
+            ("deleted", other.id),
+            ("deleted", created.id),
+        ]
+
+
+class TestMemoEventPublishing異常系:
+    """異常系: 書き込みが起きなかった場合はイベントを発行しないこと。"""
+
+    @pytest.mark.asyncio
+    async def test_存在しないIDを更新削除した場合_イベントが発行されないこと(self) -> None:
+        """存在しない ID を更新・削除した場合、イベントが発行されないこと。"""
+        repo = _FakeRepo()
+        events = _RecordingPublisher()
+        await UpdateMemoUseCase(repo, events).execute("not-exist", title="新")
+        await DeleteMemoUseCase(repo, events).execute("not-exist")
+        await BulkDeleteMemosUseCase(repo, events).execute(["not-exist"])
+        assert events.events == []